@@ -32,6 +32,10 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from src.config import config
+from src.automation.browser_supervisor import browser_supervisor
+from src.utils.config_watcher import config_watcher
+from src.utils.metrics import metrics, metrics_server
+from src.utils.log_pipeline import log_pipeline
 from src.ui.main_window import MainWindow
 from src.ui.login_window import LoginWindow
 from src.utils.font_loader import font_loader
@@ -44,21 +48,16 @@ def setup_logging():
     """로깅 설정"""
     try:
         # 로그 디렉터리 생성
-        log_dir = Path.home() / "AppData" / "Local" / "WebCephAuto" / "logs"
+        log_dir = Path(config.app_dir) / "logs"
         log_dir.mkdir(parents=True, exist_ok=True)
         
-        # 로그 파일 경로 (날짜별로 분리)
-        today = datetime.now().strftime("%Y%m%d")
-        log_file = log_dir / f"app_{today}.log"
-        
-        # 로깅 설정
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
+        # 로깅 설정 (파일/콘솔 기록은 별도 스레드에서 처리, 일별/크기 제한 교체 후 압축)
+        level_name = config.get('logging', 'level', 'INFO').upper()
+        log_pipeline.start(
+            log_dir,
+            level=getattr(logging, level_name, logging.INFO),
+            max_bytes=config.get_int('logging', 'max_file_mb', 10) * 1024 * 1024,
+            backup_count=config.get_int('logging', 'backup_count', 30)
         )
         
         # Windows에서 콘솔 인코딩 설정
@@ -102,8 +101,8 @@ def check_system_requirements():
             Path.home() / "Documents" / "WebCephAuto" / "Images",
             Path.home() / "Documents" / "WebCephAuto" / "Results", 
             Path.home() / "Documents" / "WebCephAuto" / "Backup",
-            Path.home() / "AppData" / "Local" / "WebCephAuto" / "screenshots",
-            Path.home() / "AppData" / "Local" / "WebCephAuto" / "logs",
+            Path(config.app_dir) / "screenshots",
+            Path(config.app_dir) / "logs",
         ]
         
         for dir_path in required_dirs:
@@ -111,7 +110,24 @@ def check_system_requirements():
             
         # 설정 파일 초기화
         config._load_config()
-        
+
+        # 설정 파일 변경 감시 (외부 편집 시 재시작 없이 반영)
+        try:
+            config_watcher.start()
+        except Exception as e:
+            logging.warning(f"설정 파일 감시 시작 실패: {e}")
+
+        # 이전 실행에서 비정상 종료로 남은 Chrome/ChromeDriver 프로세스 정리
+        browser_supervisor.reap_orphans()
+
+        # 로컬 메트릭 엔드포인트 (metrics.enabled 설정 시에만)
+        metrics.register_gauge('autoceph_browser_sessions', "실행 중인 브라우저 세션 수",
+                               lambda: len(browser_supervisor.sessions))
+        try:
+            metrics_server.start()
+        except Exception as e:
+            logging.warning(f"메트릭 엔드포인트 시작 실패: {e}")
+
         return True
         
     except Exception as e:
@@ -342,7 +358,7 @@ def main():
                 f"예상치 못한 오류가 발생했습니다:\n\n"
                 f"{error_detail}\n\n"
                 f"로그 파일을 확인해주세요:\n"
-                f"{Path.home() / 'AppData' / 'Local' / 'WebCephAuto' / 'logs'}"
+                f"{Path(config.app_dir) / 'logs'}"
             )
         
         sys.excepthook = handle_exception
@@ -351,8 +367,12 @@ def main():
         exit_code = app.exec_()
         
         # 정리 작업
+        config_watcher.stop()
+        metrics_server.stop()
+        browser_supervisor.terminate_all()
         logging.info("애플리케이션 종료")
         logging.info("=" * 50)
+        log_pipeline.stop()
         
         return exit_code
         
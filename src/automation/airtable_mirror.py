@@ -0,0 +1,145 @@
+"""
+Airtable 로컬 미러 모듈
+환자 테이블을 SQLite(WAL 모드)에 복제하여 조회/통계를 네트워크 없이 처리
+"""
+
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable
+
+class AirtableMirror:
+    """Airtable 환자 테이블 SQLite 미러 클래스
+
+    레코드는 Airtable API 형식({'id', 'createdTime', 'fields'})으로 저장/반환하며,
+    자주 조회하는 필드(session_date, status, registration_number)는 별도 컬럼과 인덱스로 관리합니다.
+    """
+
+    INDEXED_FIELDS = ('session_id', 'patient_id', 'name', 'registration_number', 'session_date', 'status')
+
+    def __init__(self, db_path: Path):
+        self.logger = logging.getLogger('AirtableSync')
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                id TEXT PRIMARY KEY,
+                session_id TEXT,
+                patient_id TEXT,
+                name TEXT,
+                registration_number TEXT,
+                session_date TEXT,
+                status TEXT,
+                created_time TEXT,
+                fields TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_records_session_date ON records (session_date)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_records_status ON records (status)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_records_registration_number ON records (registration_number)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def apply_records(self, records: Iterable[Dict[str, Any]], replace_fields: bool = True,
+                      insert_missing: bool = True) -> int:
+        """Airtable 레코드 반영 (replace_fields=False면 기존 필드에 병합)
+
+        insert_missing=False면 미러에 이미 있는 레코드만 갱신합니다 (일부 필드만 받은 레코드용).
+        """
+        count = 0
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                for record in records:
+                    fields = dict(record.get('fields', {}))
+                    created_time = record.get('createdTime')
+
+                    if not replace_fields:
+                        row = self.conn.execute("SELECT fields, created_time FROM records WHERE id = ?",
+                                                (record['id'],)).fetchone()
+                        if row:
+                            fields = {**json.loads(row['fields']), **fields}
+                            created_time = created_time or row['created_time']
+                        elif not insert_missing:
+                            continue
+
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO records (id, session_id, patient_id, name, registration_number, "
+                        "session_date, status, created_time, fields) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (record['id'], *[fields.get(name) for name in self.INDEXED_FIELDS], created_time,
+                         json.dumps(fields, ensure_ascii=False))
+                    )
+                    count += 1
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return count
+
+    def delete_missing(self, seen_ids: set) -> int:
+        """전체 동기화에서 보이지 않은(Airtable에서 삭제된) 레코드 제거"""
+        with self.lock:
+            existing = {row['id'] for row in self.conn.execute("SELECT id FROM records")}
+            missing = existing - seen_ids
+            self.conn.executemany("DELETE FROM records WHERE id = ?", [(record_id,) for record_id in missing])
+        return len(missing)
+
+    def query(self, session_date: str = None, status: str = None,
+              registration_number: str = None, limit: int = None) -> List[Dict[str, Any]]:
+        """조건에 맞는 레코드 조회 (Airtable API 형식)"""
+        conditions, params = [], []
+        for column, value in (('session_date', session_date), ('status', status),
+                              ('registration_number', registration_number)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+
+        sql = "SELECT id, created_time, fields FROM records"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY created_time DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [{'id': row['id'], 'createdTime': row['created_time'], 'fields': json.loads(row['fields'])}
+                for row in rows]
+
+    def status_counts(self, session_date: str) -> Dict[str, int]:
+        """날짜별 상태 건수"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) AS count FROM records WHERE session_date = ? GROUP BY status",
+                (session_date,)
+            ).fetchall()
+        return {row['status']: row['count'] for row in rows}
+
+    def record_count(self) -> int:
+        """미러에 저장된 레코드 수"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """메타 정보 조회 (마지막 동기화 시각 등)"""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else default
+
+    def set_meta(self, key: str, value: str):
+        """메타 정보 저장"""
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        """DB 연결 종료"""
+        with self.lock:
+            self.conn.close()
@@ -3,10 +3,16 @@ Airtable 연동 모듈
 ERD 문서의 데이터 구조를 기반으로 환자 정보와 분석 결과를 Airtable에 저장
 """
 
+import os
 import json
+import gzip
+import time
+import uuid
+import hashlib
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, List, Iterator
 from pathlib import Path
 
 import requests
@@ -14,65 +20,236 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from ..config import config
+from ..utils.tracing import tracer, traced
+from .offline_queue import OfflineQueue
+from .airtable_mirror import AirtableMirror
 
 class AirtableSync:
     """Airtable 동기화 클래스"""
-    
+
+    # Airtable API 제한: 요청당 최대 10개 레코드, 베이스당 초당 5회 요청
+    BATCH_SIZE = 10
+    MAX_REQUESTS_PER_SECOND = 5
+
+    # 업서트 병합 키 (세션마다 고유, 재전송해도 같은 레코드를 갱신)
+    UPSERT_MERGE_FIELDS = ['session_id']
+
+    # 요청 속도 제한 상태 (한도는 베이스 단위이므로 모든 인스턴스/스레드가 공유)
+    _rate_lock = threading.Lock()
+    _last_request_at = 0.0
+    _blocked_until = 0.0
+
     def __init__(self):
         self.logger = self._setup_logger()
         self.config = config
         
-        # Airtable 설정
-        self.api_key = self.config.get_airtable_api_key()
-        self.base_id = self.config.get('airtable', 'base_id', '')
-        self.table_name = self.config.get('airtable', 'table_name', 'Patients')
-        
-        # API 기본 설정
-        self.base_url = f"https://api.airtable.com/v0/{self.base_id}"
-        self.headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json'
-        }
+        # Airtable 설정(API 키, Base ID, 테이블명)은 속성으로 매번 설정 스냅샷에서 읽음
         
         # HTTP 세션 설정 (재시도 로직 포함)
         self.session = requests.Session()
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            # 429는 _send에서 Retry-After에 맞춰 베이스 전체 요청을 멈추고 재시도
+            status_forcelist=[500, 502, 503, 504],
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
-        
+
         # 로컬 캐시 설정
-        self.cache_dir = Path.home() / "AppData" / "Local" / "WebCephAuto" / "cache"
+        self.cache_dir = Path(self.config.app_dir) / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.offline_queue_file = self.cache_dir / "offline_queue.json"
+
+        # 오프라인 큐 (SQLite WAL, 기존 JSON 큐는 최초 1회 이전)
+        self.offline_queue = OfflineQueue(self.cache_dir / "offline_queue.db", self.offline_queue_file)
+
+        # 환자 테이블 로컬 미러 (조회/통계용, 주기적 증분 동기화 + 쓰기 결과 즉시 반영)
+        self.mirror = AirtableMirror(self.cache_dir / "airtable_mirror.db")
+        self._mirror_lock = threading.Lock()
+    
+    @property
+    def api_key(self) -> str:
+        """Airtable API 키 (복호화 결과는 Config가 캐시)"""
+        return self.config.get_airtable_api_key()
+
+    @property
+    def base_id(self) -> str:
+        """Airtable Base ID"""
+        return self.config.snapshot.airtable_base_id
+
+    @property
+    def table_name(self) -> str:
+        """Airtable 테이블명"""
+        return self.config.snapshot.airtable_table_name
+
+    @property
+    def base_url(self) -> str:
+        """API 기본 URL"""
+        return f"https://api.airtable.com/v0/{self.base_id}"
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """요청 헤더"""
+        return {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
     
     def _setup_logger(self):
-        """로거 설정"""
+        """로거 설정 (파일 기록은 로그 파이프라인이 airtable.log로 분리)"""
         logger = logging.getLogger('AirtableSync')
         logger.setLevel(logging.INFO)
-        
-        if not logger.handlers:
-            # 파일 핸들러
-            log_dir = Path.home() / "AppData" / "Local" / "WebCephAuto" / "logs"
-            log_dir.mkdir(parents=True, exist_ok=True)
-            
-            log_file = log_dir / f"airtable_{datetime.now().strftime('%Y%m%d')}.log"
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
-            
-            # 포맷터
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
-        
         return logger
     
+    def _send(self, method: str, url: str, max_rate_limit_retries: int = 3, **kwargs) -> requests.Response:
+        """속도 제한을 지키며 HTTP 요청 전송 (429 응답 시 대기 후 재시도)"""
+        for attempt in range(max_rate_limit_retries + 1):
+            with AirtableSync._rate_lock:
+                # 429 이후 대기 구간 + 초당 요청 수 제한
+                wait = max(AirtableSync._blocked_until,
+                           AirtableSync._last_request_at + 1.0 / self.MAX_REQUESTS_PER_SECOND) - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                AirtableSync._last_request_at = time.monotonic()
+
+            response = self.session.request(method, url, headers=self.headers, **kwargs)
+            if response.status_code != 429 or attempt == max_rate_limit_retries:
+                return response
+
+            # Airtable은 한도 초과 시 30초 대기를 요구 (Retry-After가 있으면 우선)
+            try:
+                retry_after = float(response.headers.get('Retry-After', 30))
+            except ValueError:
+                retry_after = 30.0
+            with AirtableSync._rate_lock:
+                AirtableSync._blocked_until = max(AirtableSync._blocked_until, time.monotonic() + retry_after)
+            tracer.event('airtable.rate_limited', retry_after=retry_after)
+            self.logger.warning(f"Airtable 요청 한도 초과 (429), {retry_after:.0f}초 후 재시도 ({attempt + 1}/{max_rate_limit_retries})")
+
+        return response
+
+    def get_rate_limit_remaining(self) -> float:
+        """429 응답으로 인한 남은 대기 시간 (초)"""
+        return max(0.0, AirtableSync._blocked_until - time.monotonic())
+
+    def _error_message(self, response: requests.Response) -> str:
+        """HTTP 오류 응답 메시지"""
+        error_msg = f"HTTP {response.status_code}"
+        if response.content:
+            try:
+                error_msg += f" - {response.json().get('error', {}).get('message', '')}"
+            except Exception:
+                pass
+        return error_msg
+
+    def _upsert_chunk(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """레코드 최대 10개 업서트 (session_id 기준, 실패 시 예외)"""
+        url = f"{self.base_url}/{self.table_name}"
+        payload = {
+            "performUpsert": {"fieldsToMergeOn": self.UPSERT_MERGE_FIELDS},
+            "records": [{"fields": fields} for fields in records]
+        }
+
+        response = self._send('patch', url, json=payload, timeout=30)
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(self._error_message(response), response=response)
+
+        result = response.json()
+        self._write_through(result.get('records', []))
+        created_ids = set(result.get('createdRecords', []))
+        return [{
+            'success': True,
+            'record_id': record['id'],
+            'created': record['id'] in created_ids,
+            'message': '환자 정보가 성공적으로 저장되었습니다'
+        } for record in result.get('records', [])]
+
+    def _create_chunk(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """레코드 최대 10개 일반 생성 (병합 없이 POST, 실패 시 예외)"""
+        url = f"{self.base_url}/{self.table_name}"
+        payload = {"records": [{"fields": fields} for fields in records]}
+
+        response = self._send('post', url, json=payload, timeout=30)
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(self._error_message(response), response=response)
+
+        created = response.json().get('records', [])
+        self._write_through(created)
+        return [{
+            'success': True,
+            'record_id': record['id'],
+            'created': True,
+            'message': '환자 정보가 성공적으로 저장되었습니다'
+        } for record in created]
+
+    def _update_chunk(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """레코드 최대 10개 업데이트 ([{'id', 'fields'}], 실패 시 예외)"""
+        url = f"{self.base_url}/{self.table_name}"
+        payload = {"records": [{"id": update['id'], "fields": update['fields']} for update in updates]}
+
+        response = self._send('patch', url, json=payload, timeout=30)
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(self._error_message(response), response=response)
+
+        self._write_through(response.json().get('records', []), merge=True)
+        return [{
+            'success': True,
+            'record_id': update['id'],
+            'message': '분석 결과가 성공적으로 업데이트되었습니다'
+        } for update in updates]
+
+    def upsert_records_batch(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """여러 레코드 업서트 (10개씩 묶어 전송, 입력 순서대로 결과 반환)"""
+        results = []
+
+        for start in range(0, len(records), self.BATCH_SIZE):
+            chunk = records[start:start + self.BATCH_SIZE]
+            try:
+                chunk_results = self._upsert_chunk(chunk)
+                created = sum(1 for result in chunk_results if result['created'])
+                self.logger.info(f"레코드 {len(chunk_results)}개 업서트 완료 (신규 {created}개)")
+                results.extend(chunk_results)
+
+            except Exception as e:
+                # 업서트는 재전송해도 중복이 생기지 않으므로 시간 초과 시에도 안전하게 큐에 저장
+                self.logger.error(f"레코드 일괄 업서트 실패 ({len(chunk)}개): {str(e)}")
+                for fields in chunk:
+                    # 같은 세션의 이후 쓰기(분석 결과 등)가 이 항목에 병합되도록 session_id를 병합 키로 사용
+                    self._add_to_offline_queue('upsert_patient', {"fields": fields}, merge_key=fields.get('session_id'))
+                    results.append({
+                        'success': False,
+                        'message': f'레코드 생성 실패: {str(e)} (오프라인 큐에 저장됨)'
+                    })
+
+        return results
+
+    def update_records_batch(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """여러 레코드 업데이트 ([{'id', 'fields'}], 10개씩 묶어 전송, 입력 순서대로 결과 반환)"""
+        results = []
+
+        for start in range(0, len(updates), self.BATCH_SIZE):
+            chunk = updates[start:start + self.BATCH_SIZE]
+            try:
+                results.extend(self._update_chunk(chunk))
+                self.logger.info(f"레코드 {len(chunk)}개를 일괄 업데이트했습니다")
+
+            except Exception as e:
+                self.logger.error(f"레코드 일괄 업데이트 실패 ({len(chunk)}개): {str(e)}")
+                for update in chunk:
+                    self._add_to_offline_queue('update_result', {
+                        'record_id': update['id'],
+                        'data': {"fields": update['fields']}
+                    })
+                    results.append({
+                        'success': False,
+                        'record_id': update['id'],
+                        'message': f'업데이트 실패: {str(e)} (오프라인 큐에 저장됨)'
+                    })
+
+        return results
+
     def test_connection(self) -> Dict[str, Any]:
         """Airtable 연결 테스트"""
         try:
@@ -88,7 +265,7 @@ class AirtableSync:
             url = f"{self.base_url}/{self.table_name}"
             params = {'maxRecords': 1}
             
-            response = self.session.get(url, headers=self.headers, params=params, timeout=10)
+            response = self._send('get', url, params=params, timeout=10)
             
             if response.status_code == 200:
                 self.logger.info("Airtable 연결 테스트 성공")
@@ -129,73 +306,29 @@ class AirtableSync:
                 'message': f'연결 테스트 실패: {str(e)}'
             }
     
+    @traced("airtable.create_record")
     def create_patient_record(self, patient_data: Dict[str, Any], 
                             session_data: Dict[str, Any] = None) -> Dict[str, Any]:
-        """환자 레코드 생성"""
+        """환자 레코드 생성 (session_id 기준 업서트이므로 재시도해도 중복 생성되지 않음)"""
         try:
             self.logger.info(f"환자 '{patient_data['name']}' 레코드를 생성합니다...")
             
-            # ERD 구조에 따른 데이터 매핑
+            # ERD 구조에 따른 데이터 매핑 (실패 시 같은 데이터로 재전송되도록 한 번만 매핑)
             record_data = self._map_patient_data(patient_data, session_data)
             
-            # Airtable API 호출
-            url = f"{self.base_url}/{self.table_name}"
-            payload = {
-                "fields": record_data
-            }
-            
-            response = self.session.post(
-                url, 
-                headers=self.headers, 
-                json=payload, 
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                record_id = result['id']
-                
-                self.logger.info(f"환자 레코드가 성공적으로 생성되었습니다: {record_id}")
-                return {
-                    'success': True,
-                    'record_id': record_id,
-                    'message': '환자 정보가 성공적으로 저장되었습니다'
-                }
-            else:
-                error_msg = f"레코드 생성 실패: HTTP {response.status_code}"
-                if response.content:
-                    try:
-                        error_detail = response.json()
-                        error_msg += f" - {error_detail.get('error', {}).get('message', '')}"
-                    except:
-                        pass
-                
-                self.logger.error(error_msg)
-                
-                # 오프라인 큐에 저장
-                self._add_to_offline_queue('create_patient', payload)
-                
-                return {
-                    'success': False,
-                    'message': error_msg + " (오프라인 큐에 저장됨)"
-                }
-                
         except Exception as e:
             self.logger.error(f"환자 레코드 생성 실패: {str(e)}")
-            
-            # 오프라인 큐에 저장
-            try:
-                record_data = self._map_patient_data(patient_data, session_data)
-                payload = {"fields": record_data}
-                self._add_to_offline_queue('create_patient', payload)
-            except:
-                pass
-            
             return {
                 'success': False,
-                'message': f'레코드 생성 실패: {str(e)} (오프라인 큐에 저장됨)'
+                'message': f'레코드 생성 실패: {str(e)}'
             }
+
+        result = self.upsert_records_batch([record_data])[0]
+        if result['success']:
+            self.logger.info(f"환자 레코드가 성공적으로 저장되었습니다: {result['record_id']}")
+        return result
     
+    @traced("airtable.update_result")
     def update_analysis_result(self, record_id: str, 
                              analysis_result: Dict[str, Any]) -> Dict[str, Any]:
         """분석 결과 업데이트"""
@@ -211,14 +344,10 @@ class AirtableSync:
                 "fields": update_data
             }
             
-            response = self.session.patch(
-                url, 
-                headers=self.headers, 
-                json=payload, 
-                timeout=30
-            )
+            response = self._send('patch', url, json=payload, timeout=30)
             
             if response.status_code == 200:
+                self._write_through([response.json()], merge=True)
                 self.logger.info("분석 결과가 성공적으로 업데이트되었습니다")
                 return {
                     'success': True,
@@ -258,21 +387,52 @@ class AirtableSync:
                 'message': f'업데이트 실패: {str(e)} (오프라인 큐에 저장됨)'
             }
     
+    @traced("airtable.upsert_result")
+    def upsert_analysis_result(self, session_id: str, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+        """세션 레코드에 분석 결과 저장 (record_id 없이 session_id 기준 업서트)
+
+        레코드 생성이 아직 오프라인 큐에 있으면 그 항목에 병합하여, 재전송 시 환자 정보와 분석 결과가
+        함께 저장되도록 합니다 (순서가 뒤바뀌어 분석 결과가 덮어써지지 않음).
+        """
+        try:
+            fields = {'session_id': session_id, **self._map_analysis_result(analysis_result)}
+        except Exception as e:
+            self.logger.error(f"분석 결과 매핑 실패: {str(e)}")
+            return {'success': False, 'message': f'업데이트 실패: {str(e)}'}
+
+        if self.offline_queue.merge_pending('upsert_patient', session_id, {"fields": fields}):
+            self.logger.info(f"분석 결과를 대기 중인 세션 레코드 전송에 병합했습니다: {session_id}")
+            return {
+                'success': False,
+                'queued': True,
+                'message': '레코드 생성이 아직 전송되지 않아 분석 결과를 함께 전송하도록 오프라인 큐에 병합했습니다'
+            }
+
+        result = self.upsert_records_batch([fields])[0]
+        if result['success']:
+            self.logger.info(f"분석 결과가 성공적으로 저장되었습니다: {result['record_id']}")
+        return result
+
     def _map_patient_data(self, patient_data: Dict[str, Any], 
                          session_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """환자 데이터를 Airtable 필드에 매핑"""
-        # 환자 ID 생성 (PAT_YYYYNNNN 형식)
         today = datetime.now()
-        patient_id = f"PAT_{today.strftime('%Y')}{today.strftime('%m%d')}{today.strftime('%H%M')}"
+        birth_date = patient_data['birth_date']
+        birth_date = birth_date.strftime('%Y-%m-%d') if hasattr(birth_date, 'strftime') else str(birth_date)
+
+        # 환자 ID: 같은 환자는 항상 같은 ID (PAT_ + 등록번호/생년월일/이름 해시)
+        patient_id = self._make_patient_id(patient_data.get('registration_number'), birth_date,
+                                           patient_data.get('name'))
         
-        # 세션 ID 생성
-        session_id = f"SES_{patient_id.split('_')[1]}_{today.strftime('%H%M')}"
+        # 세션 ID: 세션마다 고유 (업서트 병합 키, 재시도 시 같은 세션은 session_data로 전달)
+        session_id = (session_data or {}).get('session_id') or \
+            f"SES_{today.strftime('%Y%m%d')}_{uuid.uuid4().hex[:12].upper()}"
         
         mapped_data = {
             # PATIENT 테이블 필드들
             'patient_id': patient_id,
             'name': patient_data['name'],
-            'birth_date': patient_data['birth_date'].strftime('%Y-%m-%d'),
+            'birth_date': birth_date,
             'registration_number': patient_data['registration_number'],
             'gender': patient_data['gender'],
             'created_at': datetime.now().isoformat(),
@@ -304,6 +464,15 @@ class AirtableSync:
         
         return mapped_data
     
+    def _make_patient_id(self, registration_number, birth_date, name) -> str:
+        """환자 고유 ID 생성 (식별 정보가 없으면 무작위 ID)"""
+        parts = [str(value or '').strip() for value in (registration_number, birth_date, name)]
+        if not any(parts):
+            return f"PAT_{uuid.uuid4().hex[:12].upper()}"
+
+        digest = hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+        return f"PAT_{digest[:12].upper()}"
+
     def _map_analysis_result(self, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
         """분석 결과를 Airtable 필드에 매핑"""
         result_id = f"RES_{datetime.now().strftime('%Y%m%d%H%M%S')}"
@@ -340,50 +509,58 @@ class AirtableSync:
         
         return mapped_data
     
-    def _add_to_offline_queue(self, action_type: str, data: Dict[str, Any]):
+    def _add_to_offline_queue(self, action_type: str, data: Dict[str, Any], merge_key: str = None):
         """오프라인 큐에 작업 추가"""
         try:
-            queue_item = {
-                'id': f"{action_type}_{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                'action_type': action_type,
-                'data': data,
-                'timestamp': datetime.now().isoformat(),
-                'retry_count': 0
-            }
-            
-            # 기존 큐 로드
-            offline_queue = []
-            if self.offline_queue_file.exists():
-                with open(self.offline_queue_file, 'r', encoding='utf-8') as f:
-                    offline_queue = json.load(f)
-            
-            # 새 항목 추가
-            offline_queue.append(queue_item)
-            
-            # 큐 저장
-            with open(self.offline_queue_file, 'w', encoding='utf-8') as f:
-                json.dump(offline_queue, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"오프라인 큐에 작업이 추가되었습니다: {action_type}")
+            item_id = self.offline_queue.enqueue(action_type, data, merge_key=merge_key)
+            self.logger.info(f"오프라인 큐에 작업이 추가되었습니다: {item_id}")
             
         except Exception as e:
             self.logger.error(f"오프라인 큐 저장 실패: {str(e)}")
+
+    def _group_offline_items(self, items: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """오프라인 작업을 같은 유형끼리 10개 단위로 묶기 (순서 유지)"""
+        groups = {}
+        for item in items:
+            groups.setdefault(item['action_type'], []).append(item)
+
+        batches = []
+        for grouped_items in groups.values():
+            for start in range(0, len(grouped_items), self.BATCH_SIZE):
+                batches.append(grouped_items[start:start + self.BATCH_SIZE])
+        return batches
+
+    def _replay_offline_batch(self, items: List[Dict[str, Any]]):
+        """같은 유형의 오프라인 작업 최대 10개 재전송 (실패 시 예외)"""
+        action_type = items[0]['action_type']
+
+        if action_type == 'upsert_patient':
+            # 환자 레코드 업서트 재시도 (이미 저장된 경우 갱신만 되므로 중복 없음)
+            self._upsert_chunk([item['data']['fields'] for item in items])
+
+        elif action_type == 'create_patient':
+            # 이전 버전 큐 항목: 세션 ID가 분 단위라 서로 다른 환자가 같은 값을 가질 수 있으므로
+            # session_id로 병합하지 않고 일반 생성으로 재전송
+            self._create_chunk([item['data']['fields'] for item in items])
+
+        elif action_type == 'update_result':
+            # 분석 결과 업데이트 재시도
+            self._update_chunk([{'id': item['data']['record_id'], 'fields': item['data']['data']['fields']}
+                                for item in items])
+
+        else:
+            raise Exception(f"알 수 없는 작업 유형: {action_type}")
+
+    def _replay_offline_item(self, item: Dict[str, Any]):
+        """오프라인 큐 작업 1건 재전송 (실패 시 예외)"""
+        self._replay_offline_batch([item])
     
+    @traced("airtable.offline_queue")
     def process_offline_queue(self) -> Dict[str, Any]:
         """오프라인 큐 처리"""
         try:
-            if not self.offline_queue_file.exists():
-                return {
-                    'success': True,
-                    'processed': 0,
-                    'failed': 0,
-                    'message': '처리할 오프라인 작업이 없습니다'
-                }
-            
-            with open(self.offline_queue_file, 'r', encoding='utf-8') as f:
-                offline_queue = json.load(f)
-            
-            if not offline_queue:
+            pending = self.offline_queue.size()
+            if not pending:
                 return {
                     'success': True,
                     'processed': 0,
@@ -391,75 +568,46 @@ class AirtableSync:
                     'message': '처리할 오프라인 작업이 없습니다'
                 }
             
-            self.logger.info(f"오프라인 큐 처리를 시작합니다: {len(offline_queue)}개 작업")
+            self.logger.info(f"오프라인 큐 처리를 시작합니다: {pending}개 작업")
             
             processed = 0
             failed = 0
-            remaining_queue = []
-            
-            for item in offline_queue:
-                try:
-                    action_type = item['action_type']
-                    data = item['data']
-                    
-                    if action_type == 'create_patient':
-                        # 환자 레코드 생성 재시도
-                        url = f"{self.base_url}/{self.table_name}"
-                        response = self.session.post(
-                            url, 
-                            headers=self.headers, 
-                            json=data, 
-                            timeout=30
-                        )
-                        
-                        if response.status_code == 200:
-                            processed += 1
-                            self.logger.info(f"오프라인 작업 성공: {item['id']}")
-                        else:
-                            raise Exception(f"HTTP {response.status_code}")
-                    
-                    elif action_type == 'update_result':
-                        # 분석 결과 업데이트 재시도
-                        record_id = data['record_id']
-                        update_data = data['data']
-                        
-                        url = f"{self.base_url}/{self.table_name}/{record_id}"
-                        response = self.session.patch(
-                            url, 
-                            headers=self.headers, 
-                            json=update_data, 
-                            timeout=30
-                        )
-                        
-                        if response.status_code == 200:
+            last_seq = 0
+
+            # 한 번에 일부만 읽어 처리 (재시도 대기 항목은 이번 처리에서 다시 읽지 않음)
+            while True:
+                items = self.offline_queue.peek(limit=50, after_seq=last_seq)
+                if not items:
+                    break
+
+                last_seq = items[-1]['seq']
+
+                for batch in self._group_offline_items(items):
+                    try:
+                        self._replay_offline_batch(batch)
+                        for item in batch:
+                            self.offline_queue.ack(item['id'], item['revision'])
                             processed += 1
-                            self.logger.info(f"오프라인 업데이트 성공: {item['id']}")
-                        else:
-                            raise Exception(f"HTTP {response.status_code}")
-                    
-                except Exception as e:
-                    item['retry_count'] += 1
-                    item['last_error'] = str(e)
-                    
-                    # 최대 3회 재시도
-                    if item['retry_count'] < 3:
-                        remaining_queue.append(item)
-                        self.logger.warning(f"오프라인 작업 재시도 ({item['retry_count']}/3): {item['id']} - {str(e)}")
-                    else:
-                        failed += 1
-                        self.logger.error(f"오프라인 작업 최종 실패: {item['id']} - {str(e)}")
-            
-            # 남은 큐 저장
-            with open(self.offline_queue_file, 'w', encoding='utf-8') as f:
-                json.dump(remaining_queue, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"오프라인 큐 처리 완료: 성공 {processed}개, 실패 {failed}개, 남은 작업 {len(remaining_queue)}개")
+                        self.logger.info(f"오프라인 작업 {len(batch)}개 성공: {batch[0]['action_type']}")
+
+                    except Exception as e:
+                        for item in batch:
+                            # 최대 3회 재시도
+                            retry_count = item['retry_count'] + 1
+                            if self.offline_queue.nack(item['id'], str(e), max_retries=3):
+                                self.logger.warning(f"오프라인 작업 재시도 ({retry_count}/3): {item['id']} - {str(e)}")
+                            else:
+                                failed += 1
+                                self.logger.error(f"오프라인 작업 최종 실패: {item['id']} - {str(e)}")
+
+            remaining = self.offline_queue.size()
+            self.logger.info(f"오프라인 큐 처리 완료: 성공 {processed}개, 실패 {failed}개, 남은 작업 {remaining}개")
             
             return {
                 'success': True,
                 'processed': processed,
                 'failed': failed,
-                'remaining': len(remaining_queue),
+                'remaining': remaining,
                 'message': f'오프라인 작업 처리 완료: {processed}개 성공, {failed}개 실패'
             }
             
@@ -470,45 +618,50 @@ class AirtableSync:
                 'message': f'오프라인 큐 처리 실패: {str(e)}'
             }
     
-    def get_patient_records(self, filter_formula: str = None, 
-                          max_records: int = 100) -> List[Dict[str, Any]]:
-        """환자 레코드 조회"""
+    def get_patient_records(self, filter_formula: str = None, max_records: int = 100,
+                            session_date: str = None, status: str = None,
+                            registration_number: str = None, fields: List[str] = None) -> List[Dict[str, Any]]:
+        """환자 레코드 조회
+
+        session_date/status/registration_number 조건은 로컬 미러에서 조회하므로 네트워크 없이 동작합니다.
+        filter_formula를 주면 Airtable에 직접 조회하며(100개를 넘으면 여러 페이지로 조회),
+        fields 없이 조회한 결과는 미러에 반영합니다.
+        """
+        if not filter_formula:
+            self._ensure_mirror()
+            records = self.mirror.query(session_date=session_date, status=status,
+                                        registration_number=registration_number, limit=max_records)
+            self.logger.debug(f"미러에서 {len(records)}개의 레코드를 조회했습니다")
+            return records
+
         try:
-            url = f"{self.base_url}/{self.table_name}"
-            params = {'maxRecords': max_records}
-            
-            if filter_formula:
-                params['filterByFormula'] = filter_formula
-            
-            response = self.session.get(url, headers=self.headers, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                records = result.get('records', [])
+            records = []
+            for page in self.iter_record_pages(filter_formula, fields=fields,
+                                               max_records=max_records, timeout=30):
+                records.extend(page)
                 
-                self.logger.info(f"{len(records)}개의 레코드를 조회했습니다")
-                return records
-            else:
-                self.logger.error(f"레코드 조회 실패: HTTP {response.status_code}")
-                return []
+            # 일부 필드만 받은 레코드는 미러에 있는 레코드에만 병합 (불완전한 행을 새로 만들지 않음)
+            self._write_through(records, merge=bool(fields), partial=bool(fields))
+                
+            self.logger.info(f"{len(records)}개의 레코드를 조회했습니다")
+            return records
                 
         except Exception as e:
             self.logger.error(f"레코드 조회 실패: {str(e)}")
             return []
     
     def get_today_statistics(self) -> Dict[str, Any]:
-        """오늘의 통계 조회"""
+        """오늘의 통계 조회 (로컬 미러 집계)"""
         try:
             today = datetime.now().strftime('%Y-%m-%d')
-            filter_formula = f"{{session_date}} = '{today}'"
-            
-            records = self.get_patient_records(filter_formula)
+            self._ensure_mirror()
+            counts = self.mirror.status_counts(today)
             
             # 통계 계산
-            total_patients = len(records)
-            completed = sum(1 for r in records if r['fields'].get('status') == 'COMPLETED')
-            in_progress = sum(1 for r in records if r['fields'].get('status') == 'IN_PROGRESS')
-            failed = sum(1 for r in records if r['fields'].get('status') == 'FAILED')
+            total_patients = sum(counts.values())
+            completed = counts.get('COMPLETED', 0)
+            in_progress = counts.get('IN_PROGRESS', 0)
+            failed = counts.get('FAILED', 0)
             
             return {
                 'date': today,
@@ -516,7 +669,8 @@ class AirtableSync:
                 'completed': completed,
                 'in_progress': in_progress,
                 'failed': failed,
-                'success_rate': (completed / total_patients * 100) if total_patients > 0 else 0
+                'success_rate': (completed / total_patients * 100) if total_patients > 0 else 0,
+                'last_synced_at': self.mirror.get_meta('last_sync_at')
             }
             
         except Exception as e:
@@ -529,55 +683,218 @@ class AirtableSync:
                 'failed': 0,
                 'success_rate': 0
             }
-    
-    def backup_data(self, backup_path: str = None) -> Dict[str, Any]:
-        """데이터 백업"""
+
+    def _write_through(self, records: List[Dict[str, Any]], merge: bool = False, partial: bool = False):
+        """Airtable 응답 레코드를 미러에 즉시 반영 (실패해도 다음 증분 동기화에서 보정)
+
+        partial=True면 일부 필드만 받은 레코드이므로 미러에 이미 있는 레코드만 갱신합니다.
+        """
         try:
-            if not backup_path:
-                backup_dir = Path(self.config.get('paths', 'backup_folder'))
-                backup_dir.mkdir(parents=True, exist_ok=True)
-                backup_path = backup_dir / f"airtable_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            
-            # 모든 레코드 조회
-            all_records = []
-            offset = None
-            
-            while True:
-                url = f"{self.base_url}/{self.table_name}"
-                params = {'maxRecords': 100}
-                if offset:
-                    params['offset'] = offset
-                
-                response = self.session.get(url, headers=self.headers, params=params, timeout=60)
-                
-                if response.status_code != 200:
-                    raise Exception(f"백업 조회 실패: HTTP {response.status_code}")
-                
-                result = response.json()
-                records = result.get('records', [])
-                all_records.extend(records)
-                
-                offset = result.get('offset')
-                if not offset:
-                    break
-            
-            # 백업 파일 저장
-            backup_data = {
-                'backup_date': datetime.now().isoformat(),
-                'total_records': len(all_records),
-                'records': all_records
-            }
-            
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"데이터 백업 완료: {len(all_records)}개 레코드, 파일: {backup_path}")
-            
+            self.mirror.apply_records((record for record in records if record.get('id')),
+                                      replace_fields=not merge, insert_missing=not partial)
+        except Exception as e:
+            self.logger.warning(f"미러 반영 실패: {str(e)}")
+
+    def _ensure_mirror(self):
+        """미러가 한 번도 동기화되지 않았으면 전체 동기화 시도 (오프라인이면 있는 데이터 사용)"""
+        if self.mirror.get_meta('high_water_mark'):
+            return
+        result = self.sync_mirror()
+        if not result['success']:
+            self.logger.warning(f"미러 초기화 실패 (로컬 데이터 사용): {result['message']}")
+
+    def _modified_since_formula(self, high_water_mark: str) -> str:
+        """기준 시각 이후 수정된 레코드 필터 (시계 오차를 고려해 1분 겹치게 조회)"""
+        since = datetime.fromisoformat(high_water_mark) - timedelta(minutes=1)
+        return f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{since.strftime('%Y-%m-%dT%H:%M:%S')}Z'))"
+
+    @traced("airtable.sync_mirror")
+    def sync_mirror(self, full: bool = False) -> Dict[str, Any]:
+        """로컬 미러 동기화
+
+        첫 실행, full=True, 또는 마지막 전체 동기화 후 mirror_full_every_hours가 지나면 전체 동기화
+        (Airtable에서 삭제된 레코드도 제거), 그 외에는 마지막 동기화 이후 수정된 레코드만 가져옵니다.
+        """
+        if not self.api_key or not self.base_id:
+            return {'success': False, 'message': 'API 키 또는 Base ID가 설정되지 않았습니다'}
+
+        # 워커와 UI가 동시에 호출해도 한 번만 조회
+        with self._mirror_lock:
+            try:
+                high_water_mark = self.mirror.get_meta('high_water_mark')
+                last_full_at = self.mirror.get_meta('last_full_sync_at')
+                full_every_hours = self.config.get_int('airtable', 'mirror_full_every_hours', 24)
+                is_full = full or not high_water_mark or not last_full_at or \
+                    (full_every_hours > 0 and
+                     datetime.now() - datetime.fromisoformat(last_full_at) >= timedelta(hours=full_every_hours))
+
+                run_started = datetime.now(timezone.utc)
+                filter_formula = None if is_full else self._modified_since_formula(high_water_mark)
+
+                record_count = 0
+                seen_ids = set()
+                for records in self.iter_record_pages(filter_formula, timeout=30):
+                    record_count += self.mirror.apply_records(records)
+                    if is_full:
+                        seen_ids.update(record['id'] for record in records)
+
+                removed = self.mirror.delete_missing(seen_ids) if is_full else 0
+                if is_full:
+                    self.mirror.set_meta('last_full_sync_at', datetime.now().isoformat())
+                self.mirror.set_meta('high_water_mark', run_started.isoformat())
+                self.mirror.set_meta('last_sync_at', datetime.now().isoformat())
+
+                mode = 'full' if is_full else 'delta'
+                self.logger.info(f"미러 동기화 완료 ({mode}): {record_count}개 반영, {removed}개 삭제")
+                return {
+                    'success': True,
+                    'record_count': record_count,
+                    'removed_count': removed,
+                    'mode': mode,
+                    'message': f'{record_count}개 레코드를 동기화했습니다 ({"전체" if is_full else "증분"})'
+                }
+
+            except Exception as e:
+                self.logger.error(f"미러 동기화 실패: {str(e)}")
+                return {
+                    'success': False,
+                    'message': f'미러 동기화 실패: {str(e)}'
+                }
+
+    def iter_record_pages(self, filter_formula: str = None, fields: List[str] = None,
+                          sort: List[tuple] = None, page_size: int = 100,
+                          max_records: int = None, timeout: int = 60) -> Iterator[List[Dict[str, Any]]]:
+        """offset 토큰으로 테이블을 페이지 단위로 조회 (페이지별 레코드 목록 반환)
+
+        fields를 주면 해당 필드만 받고(analysis_data 등 큰 필드 제외),
+        sort는 [('session_date', 'desc'), ...] 형식입니다.
+        """
+        url = f"{self.base_url}/{self.table_name}"
+        params = {'pageSize': min(max(page_size, 1), 100)}
+        if filter_formula:
+            params['filterByFormula'] = filter_formula
+        if fields:
+            params['fields[]'] = list(fields)
+        if max_records:
+            params['maxRecords'] = max_records
+        for index, (field, direction) in enumerate(sort or []):
+            params[f'sort[{index}][field]'] = field
+            params[f'sort[{index}][direction]'] = direction
+
+        while True:
+            response = self._send('get', url, params=params, timeout=timeout)
+            if response.status_code != 200:
+                raise Exception(f"레코드 조회 실패: {self._error_message(response)}")
+
+            result = response.json()
+            yield result.get('records', [])
+
+            offset = result.get('offset')
+            if not offset:
+                break
+            params['offset'] = offset
+
+    def iter_records(self, filter_formula: str = None, fields: List[str] = None,
+                     sort: List[tuple] = None, page_size: int = 100,
+                     max_records: int = None, timeout: int = 60) -> Iterator[Dict[str, Any]]:
+        """레코드를 하나씩 반환하는 스트리밍 조회 (메모리에는 한 페이지만 유지)"""
+        for records in self.iter_record_pages(filter_formula, fields, sort, page_size, max_records, timeout):
+            yield from records
+
+    def _load_backup_state(self, backup_dir: Path) -> Dict[str, Any]:
+        """증분 백업 상태 로드 (기준 시각, 세그먼트 목록)"""
+        state_file = backup_dir / "backup_state.json"
+        if state_file.exists():
+            with open(state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _save_backup_state(self, backup_dir: Path, state: Dict[str, Any]):
+        """증분 백업 상태 저장 (임시 파일 작성 후 교체)"""
+        state_file = backup_dir / "backup_state.json"
+        temp_file = state_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, state_file)
+
+    def _prune_backup_segments(self, backup_dir: Path, state: Dict[str, Any]):
+        """새 전체 백업 이후 상태 파일이 더 이상 참조하지 않는 세그먼트와 남은 임시 파일 삭제"""
+        referenced = {state.get('base')} | set(state.get('deltas', []))
+        removed = 0
+        for pattern in ("base_*.ndjson.gz", "delta_*.ndjson.gz", "*.ndjson.gz.part"):
+            for segment in backup_dir.glob(pattern):
+                if segment.name in referenced:
+                    continue
+                try:
+                    segment.unlink()
+                    removed += 1
+                except OSError as e:
+                    self.logger.warning(f"이전 백업 세그먼트 삭제 실패: {segment.name} ({e})")
+        if removed:
+            self.logger.info(f"이전 백업 세그먼트 {removed}개 삭제")
+
+    @traced("airtable.backup")
+    def backup_data(self, backup_path: str = None, full: bool = False) -> Dict[str, Any]:
+        """데이터 백업 (증분)
+
+        첫 실행, full=True, 또는 전체 백업 후 backup_full_every_days가 지나면 전체 기준(base) 세그먼트를,
+        그 외에는 마지막 백업 이후 수정된 레코드만 delta 세그먼트로 저장합니다.
+        각 페이지는 받는 즉시 gzip NDJSON으로 기록하므로 메모리 사용량이 테이블 크기와 무관합니다.
+        backup_path를 주면 해당 폴더에 백업합니다.
+        """
+        try:
+            backup_dir = Path(backup_path) if backup_path else \
+                Path(self.config.get('paths', 'backup_folder')) / "airtable"
+            backup_dir.mkdir(parents=True, exist_ok=True)
+
+            state = self._load_backup_state(backup_dir)
+            full_every_days = self.config.get_int('airtable', 'backup_full_every_days', 7)
+            base_age_days = None
+            if state.get('base_created_at'):
+                base_age_days = (datetime.now() - datetime.fromisoformat(state['base_created_at'])).days
+
+            is_full = full or not state.get('high_water_mark') or \
+                (full_every_days > 0 and base_age_days is not None and base_age_days >= full_every_days)
+
+            # 이번 백업의 기준 시각 (조회 시작 직전, 시계 오차를 고려해 1분 겹치게 조회)
+            run_started = datetime.now(timezone.utc)
+            filter_formula = None if is_full else self._modified_since_formula(state['high_water_mark'])
+
+            kind = 'base' if is_full else 'delta'
+            segment_path = backup_dir / f"{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.ndjson.gz"
+            temp_path = segment_path.with_name(segment_path.name + '.part')
+
+            record_count = 0
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                for records in self.iter_record_pages(filter_formula):
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    record_count += len(records)
+            os.replace(temp_path, segment_path)
+
+            # 백업 상태 갱신 (세그먼트가 완성된 뒤에만 기준 시각 이동)
+            if is_full:
+                state = {
+                    'base': segment_path.name,
+                    'base_created_at': datetime.now().isoformat(),
+                    'deltas': []
+                }
+            else:
+                state.setdefault('deltas', []).append(segment_path.name)
+            state['high_water_mark'] = run_started.isoformat()
+            state['last_backup_at'] = datetime.now().isoformat()
+            self._save_backup_state(backup_dir, state)
+            if is_full:
+                self._prune_backup_segments(backup_dir, state)
+
+            self.logger.info(f"데이터 백업 완료 ({kind}): {record_count}개 레코드, 파일: {segment_path}")
+
             return {
                 'success': True,
-                'backup_path': str(backup_path),
-                'record_count': len(all_records),
-                'message': f'{len(all_records)}개 레코드가 성공적으로 백업되었습니다'
+                'backup_path': str(segment_path),
+                'record_count': record_count,
+                'mode': kind,
+                'message': f'{record_count}개 레코드가 성공적으로 백업되었습니다 ({"전체" if is_full else "증분"})'
             }
             
         except Exception as e:
@@ -585,4 +902,57 @@ class AirtableSync:
             return {
                 'success': False,
                 'message': f'데이터 백업 실패: {str(e)}'
-            } 
\ No newline at end of file
+            }
+
+    def rebuild_snapshot(self, backup_path: str = None, output_path: str = None) -> Dict[str, Any]:
+        """기준(base) 세그먼트와 delta 세그먼트를 합쳐 전체 스냅샷 생성 (같은 레코드는 최신 값 사용)"""
+        try:
+            backup_dir = Path(backup_path) if backup_path else \
+                Path(self.config.get('paths', 'backup_folder')) / "airtable"
+            state = self._load_backup_state(backup_dir)
+            if not state.get('base'):
+                raise Exception("기준 백업이 없습니다. 먼저 전체 백업을 실행해주세요")
+
+            records = {}
+            for segment_name in [state['base']] + state.get('deltas', []):
+                with gzip.open(backup_dir / segment_name, 'rt', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            records[record['id']] = record
+
+            if not output_path:
+                output_path = backup_dir / f"snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson.gz"
+
+            with gzip.open(output_path, 'wt', encoding='utf-8') as f:
+                for record in records.values():
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+            self.logger.info(f"스냅샷 생성 완료: {len(records)}개 레코드 "
+                             f"(기준 1개 + 증분 {len(state.get('deltas', []))}개), 파일: {output_path}")
+
+            return {
+                'success': True,
+                'snapshot_path': str(output_path),
+                'record_count': len(records),
+                'message': f'{len(records)}개 레코드로 스냅샷을 생성했습니다'
+            }
+
+        except Exception as e:
+            self.logger.error(f"스냅샷 생성 실패: {str(e)}")
+            return {
+                'success': False,
+                'message': f'스냅샷 생성 실패: {str(e)}'
+            }
+
+_airtable_sync = None
+_airtable_sync_lock = threading.Lock()
+
+def get_airtable_sync() -> AirtableSync:
+    """전역 Airtable 동기화 인스턴스 반환 (오프라인 큐/미러 연결을 하나만 사용, 최초 호출 시 생성)"""
+    global _airtable_sync
+    if _airtable_sync is None:
+        with _airtable_sync_lock:
+            if _airtable_sync is None:
+                _airtable_sync = AirtableSync()
+    return _airtable_sync
@@ -0,0 +1,273 @@
+"""
+Airtable 동기화 워커 모듈
+오프라인 큐를 백그라운드 스레드에서 병렬로 전송하여 자동화 단계가 Airtable 응답을 기다리지 않도록 함
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Any, List
+
+import requests
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from ..config import config
+from .airtable_sync import AirtableSync, get_airtable_sync
+
+class AirtableSyncWorker(QThread):
+    """Airtable 동기화 워커 스레드
+
+    작업은 submit()으로 오프라인 큐에 넣기만 하고 즉시 반환합니다.
+    큐가 모든 쓰기의 공유 버퍼 역할을 하며, 새 작업이 들어오면 10개가 차거나 flush_interval이 지날 때까지
+    모았다가 10개 단위로 여러 요청에 나눠 전송합니다(속도 제한은 AirtableSync._send가 담당).
+    네트워크/서버 오류가 연속되면 회로를 열어 일정 시간 전송을 멈춥니다.
+    """
+
+    # 시그널 정의
+    stats_updated = pyqtSignal(dict)          # 큐 깊이, 처리량, 지연 시간
+    item_synced = pyqtSignal(str)             # 작업 전송 성공 (큐 항목 ID)
+    item_failed = pyqtSignal(str, str)        # 작업 최종 실패 (큐 항목 ID, 오류)
+    circuit_state_changed = pyqtSignal(str)   # 'closed' / 'open' / 'half_open'
+
+    def __init__(self, sync: AirtableSync = None):
+        super().__init__()
+        self.logger = logging.getLogger('AirtableSync')
+        self.sync = sync or get_airtable_sync()
+        self.queue = self.sync.offline_queue
+
+        # 설정값 로드
+        self.concurrency = max(1, config.get_int('airtable', 'sync_concurrency', 3))
+        self.poll_interval = max(1, config.get_int('airtable', 'sync_poll_interval', 5))
+        self.flush_interval = float(config.get('airtable', 'flush_interval', '2.0'))
+        self.failure_threshold = max(1, config.get_int('airtable', 'circuit_failure_threshold', 5))
+        self.base_cooldown = max(1, config.get_int('airtable', 'circuit_cooldown', 30))
+        self.max_cooldown = 600
+        self.mirror_interval = config.get_int('airtable', 'mirror_sync_interval', 300)
+        self.last_mirror_sync = 0.0
+        self.compact_interval = config.get_int('airtable', 'queue_compact_hours', 24) * 3600
+        self.dead_retention_days = config.get_int('airtable', 'dead_retention_days', 30)
+        self.last_compact = 0.0
+
+        # 회로 차단기 상태
+        self.circuit_state = 'closed'
+        self.consecutive_failures = 0
+        self.cooldown = self.base_cooldown
+        self.open_until = 0.0
+
+        # 통계
+        self.sent_times = deque()
+        self.total_sent = 0
+        self.total_failed = 0
+        self.last_error = None
+
+        self.wake_event = threading.Event()
+        self.is_stopped = False
+
+    def submit(self, action_type: str, data: Dict[str, Any]) -> str:
+        """작업을 큐에 넣고 즉시 반환 (전송은 워커가 수행)"""
+        item_id = self.queue.enqueue(action_type, data)
+        self.wake_event.set()
+        return item_id
+
+    def submit_upsert(self, fields: Dict[str, Any]) -> str:
+        """레코드 저장 작업 추가 (session_id 기준 업서트, 같은 세션의 대기 작업이 있으면 병합)"""
+        item_id = self.queue.enqueue('upsert_patient', {"fields": fields}, merge_key=fields.get('session_id'))
+        self.wake_event.set()
+        return item_id
+
+    def submit_patient_record(self, patient_data: Dict[str, Any], session_data: Dict[str, Any] = None) -> str:
+        """환자/세션 레코드 저장 작업 추가 (create_patient_record의 비동기 버전)"""
+        return self.submit_upsert(self.sync._map_patient_data(patient_data, session_data))
+
+    def submit_analysis_result(self, session_id: str, analysis_result: Dict[str, Any]) -> str:
+        """세션 레코드의 분석 결과 저장 작업 추가 (upsert_analysis_result의 비동기 버전)"""
+        return self.submit_upsert({'session_id': session_id, **self.sync._map_analysis_result(analysis_result)})
+
+    def ensure_running(self):
+        """워커가 실행 중이 아니면 시작 (앱 종료로 중지된 경우 제외)"""
+        if not self.is_stopped and not self.isRunning():
+            self.start()
+
+    def stop(self):
+        """워커 중지 (진행 중인 요청은 완료 후 종료)"""
+        self.is_stopped = True
+        self.wake_event.set()
+
+    def run(self):
+        """워커 스레드 실행"""
+        self.logger.info(f"Airtable 동기화 워커 시작 (동시 요청 {self.concurrency}개)")
+        last_seq = 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='AirtableSync') as executor:
+            while not self.is_stopped:
+                # 회로가 열려 있으면 대기
+                if self.circuit_state == 'open':
+                    remaining = self.open_until - time.monotonic()
+                    if remaining > 0:
+                        self._emit_stats()
+                        self.wake_event.wait(min(remaining, self.poll_interval))
+                        self.wake_event.clear()
+                        continue
+                    self._set_circuit_state('half_open')
+
+                # 반개방 상태에서는 1건만 시험 전송
+                limit = 1 if self.circuit_state == 'half_open' else self.concurrency * AirtableSync.BATCH_SIZE
+                items = self.queue.peek(limit=limit, after_seq=last_seq)
+
+                if not items:
+                    # 큐 끝에 도달: 처음부터 다시 확인하기 전 대기
+                    last_seq = 0
+                    self._sync_mirror_if_due()
+                    self._compact_queue_if_due()
+                    self._emit_stats()
+                    woken = self.wake_event.wait(self.poll_interval)
+                    self.wake_event.clear()
+                    if woken:
+                        self._wait_for_batch()
+                    continue
+
+                # 같은 유형끼리 10개씩 묶어 병렬 전송
+                futures = {executor.submit(self.sync._replay_offline_batch, batch): batch
+                           for batch in self.sync._group_offline_items(items)}
+                for future in as_completed(futures):
+                    self._handle_result(futures[future], future.exception())
+
+                last_seq = items[-1]['seq']
+                self._emit_stats()
+
+        self.logger.info("Airtable 동기화 워커 종료")
+
+    def _wait_for_batch(self):
+        """새 작업이 들어오면 10개가 차거나 flush_interval이 지날 때까지 더 모으기"""
+        deadline = time.monotonic() + self.flush_interval
+        while not self.is_stopped and self.queue.size() < AirtableSync.BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self.wake_event.wait(remaining)
+            self.wake_event.clear()
+
+    def _sync_mirror_if_due(self):
+        """큐가 비어 있을 때 주기적으로 로컬 미러 증분 동기화 (mirror_sync_interval=0이면 사용 안 함)"""
+        if self.mirror_interval <= 0 or self.circuit_state != 'closed':
+            return
+        if time.monotonic() - self.last_mirror_sync < self.mirror_interval:
+            return
+
+        self.last_mirror_sync = time.monotonic()
+        self.sync.sync_mirror()
+
+    def _compact_queue_if_due(self):
+        """큐가 비어 있을 때 주기적으로 오래된 실패 작업 삭제 및 DB 정리 (queue_compact_hours=0이면 사용 안 함)"""
+        if self.compact_interval <= 0:
+            return
+        if self.last_compact and time.monotonic() - self.last_compact < self.compact_interval:
+            return
+
+        self.last_compact = time.monotonic()
+        try:
+            self.queue.compact(self.dead_retention_days)
+        except Exception as e:
+            self.logger.warning(f"오프라인 큐 정리 실패: {str(e)}")
+
+    def _handle_result(self, batch: List[Dict[str, Any]], error: Exception):
+        """묶음 전송 결과 처리 (성공: ack, 일시 오류: 큐 유지, 영구 오류: nack)"""
+        if error is None:
+            for item in batch:
+                # 전송 중에 내용이 병합된 항목은 남겨 두었다가 병합된 내용으로 다시 전송
+                self.queue.ack(item['id'], item['revision'])
+                self.total_sent += 1
+                self.sent_times.append(time.monotonic())
+                self.item_synced.emit(item['id'])
+            self.consecutive_failures = 0
+            if self.circuit_state != 'closed':
+                self.cooldown = self.base_cooldown
+                self._set_circuit_state('closed')
+            return
+
+        self.last_error = str(error)
+
+        if self._is_transient(error):
+            # 네트워크/서버 장애: 항목 재시도 횟수는 소모하지 않고 회로 차단기에만 반영
+            self.consecutive_failures += 1
+            if self.circuit_state == 'half_open' or self.consecutive_failures >= self.failure_threshold:
+                self._open_circuit()
+            return
+
+        for item in batch:
+            if not self.queue.nack(item['id'], str(error), max_retries=3):
+                self.total_failed += 1
+                self.logger.error(f"Airtable 동기화 최종 실패: {item['id']} - {str(error)}")
+                self.item_failed.emit(item['id'], str(error))
+
+    def _is_transient(self, error: Exception) -> bool:
+        """일시적 오류 여부 (연결 실패, 시간 초과, 429, 5xx)"""
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              requests.exceptions.RetryError)):
+            return True
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return False
+
+    def _open_circuit(self):
+        """회로 열기 (실패가 반복될수록 대기 시간 2배 증가)"""
+        if self.circuit_state == 'half_open':
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+        self.open_until = time.monotonic() + self.cooldown
+        self.logger.warning(f"Airtable 연결 장애로 {self.cooldown}초 동안 동기화를 중단합니다: {self.last_error}")
+        self._set_circuit_state('open')
+
+    def _set_circuit_state(self, state: str):
+        """회로 상태 변경 및 알림"""
+        if state == self.circuit_state:
+            return
+        self.circuit_state = state
+        self.circuit_state_changed.emit(state)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """동기화 통계 (큐 깊이, 최근 1분 처리량, 가장 오래된 작업의 지연 시간)"""
+        now = time.monotonic()
+        while self.sent_times and now - self.sent_times[0] > 60:
+            self.sent_times.popleft()
+
+        oldest = self.queue.oldest_created_at()
+        return {
+            'depth': self.queue.size(),
+            'dead': self.queue.dead_count(),
+            'throughput_per_min': len(self.sent_times),
+            'lag_seconds': (datetime.now() - oldest).total_seconds() if oldest else 0.0,
+            'circuit_state': self.circuit_state,
+            'total_sent': self.total_sent,
+            'total_failed': self.total_failed,
+            'rate_limited_seconds': self.sync.get_rate_limit_remaining(),
+            'last_error': self.last_error
+        }
+
+    def _emit_stats(self):
+        """통계 시그널 발생"""
+        try:
+            self.stats_updated.emit(self.get_stats())
+        except Exception as e:
+            self.logger.warning(f"동기화 통계 계산 실패: {str(e)}")
+
+_sync_worker = None
+_sync_worker_lock = threading.Lock()
+
+def get_sync_worker() -> AirtableSyncWorker:
+    """전역 Airtable 동기화 워커 반환 (최초 호출 시 생성, 시작은 호출한 쪽에서)"""
+    global _sync_worker
+    if _sync_worker is None:
+        with _sync_worker_lock:
+            if _sync_worker is None:
+                _sync_worker = AirtableSyncWorker()
+    return _sync_worker
+
+def stop_sync_worker(timeout_ms: int = 5000):
+    """전역 워커가 생성되어 실행 중이면 중지 후 종료 대기 (앱 종료 시)"""
+    worker = _sync_worker
+    if worker and worker.isRunning():
+        worker.stop()
+        worker.wait(timeout_ms)
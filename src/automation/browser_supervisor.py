@@ -0,0 +1,252 @@
+"""
+브라우저 프로세스 수명 관리 모듈
+
+ChromeDriver와 그 하위 Chrome 프로세스의 PID를 추적하여
+정상 종료, 비정상 종료, 앱 재시작 어느 경우에도 프로세스가 남지 않도록 보장합니다.
+"""
+
+import os
+import json
+import atexit
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+import psutil
+
+from ..config import config
+
+class BrowserSupervisor:
+    """ChromeDriver/Chrome 프로세스 추적 및 정리 클래스"""
+
+    # 고아 프로세스 판별 시 허용하는 프로세스 이름 (다른 프로그램 오종료 방지)
+    BROWSER_PROCESS_NAMES = ('chrome', 'chromedriver')
+
+    def __init__(self):
+        self.logger = logging.getLogger('BrowserSupervisor')
+        self.lock = threading.RLock()
+
+        # 드라이버 PID -> {pid: create_time} (현재 세션에서 추적 중인 프로세스)
+        self.sessions = {}
+
+        # 종료 시 정리는 첫 브라우저를 추적할 때 등록 (import만으로는 등록하지 않음)
+        self.exit_hook_registered = False
+
+    @property
+    def registry_file(self):
+        """PID 기록 파일 경로 (설정 폴더 기준, 사용할 때 결정)"""
+        return Path(config.app_dir) / "browser_pids.json"
+
+    def _get_driver_pid(self, driver):
+        """WebDriver의 ChromeDriver 프로세스 PID"""
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        return process.pid if process else None
+
+    def _snapshot(self, root_pid):
+        """루트 프로세스와 모든 하위 프로세스의 {pid: create_time}"""
+        processes = {}
+        try:
+            root = psutil.Process(root_pid)
+            for proc in [root] + root.children(recursive=True):
+                try:
+                    processes[proc.pid] = proc.create_time()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+        return processes
+
+    def register(self, driver):
+        """새 WebDriver의 프로세스 트리 추적 시작"""
+        root_pid = self._get_driver_pid(driver)
+        if not root_pid:
+            self.logger.warning("ChromeDriver PID를 확인할 수 없어 프로세스 추적을 건너뜁니다")
+            return None
+
+        with self.lock:
+            if not self.exit_hook_registered:
+                atexit.register(self.terminate_all)
+                self.exit_hook_registered = True
+            self.sessions[root_pid] = self._snapshot(root_pid)
+            self._save_registry()
+
+        self.logger.info(f"브라우저 프로세스 추적 시작: PID {root_pid} (프로세스 {len(self.sessions[root_pid])}개)")
+        return root_pid
+
+    def refresh(self, driver):
+        """추적 중인 프로세스 목록 갱신 (실행 중 새로 생성된 렌더러 포함)"""
+        root_pid = self._get_driver_pid(driver)
+        if not root_pid:
+            return
+
+        with self.lock:
+            if root_pid not in self.sessions:
+                return
+            processes = self.sessions[root_pid]
+            known_pids = set(processes)
+            processes.update(self._snapshot(root_pid))
+            # 메모리 측정마다 호출되므로 PID 목록이 바뀐 경우에만 기록 파일 갱신
+            if set(processes) != known_pids:
+                self._save_registry()
+
+    def get_rss_mb(self, driver):
+        """ChromeDriver 및 하위 Chrome 프로세스 전체 RSS (MB)"""
+        root_pid = self._get_driver_pid(driver)
+        if not root_pid:
+            return None
+
+        self.refresh(driver)
+
+        total = 0
+        for pid in self._snapshot(root_pid):
+            try:
+                total += psutil.Process(pid).memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024) if total else None
+
+    def terminate(self, driver, timeout=5):
+        """WebDriver 종료 후 남은 프로세스 강제 종료"""
+        root_pid = self._get_driver_pid(driver)
+        if root_pid:
+            self.refresh(driver)
+
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"WebDriver 정상 종료 실패, 강제 종료합니다: {str(e)}")
+
+        if not root_pid:
+            return
+
+        with self.lock:
+            processes = self.sessions.pop(root_pid, {})
+            self._save_registry()
+
+        killed = self.kill_tree(processes, timeout)
+        if killed:
+            self.logger.info(f"종료되지 않은 브라우저 프로세스 {killed}개를 강제 종료했습니다")
+
+    def kill_tree(self, processes, timeout=5):
+        """기록된 {pid: create_time} 프로세스 종료 (PID 재사용 프로세스는 제외)"""
+        targets = []
+        for pid, create_time in processes.items():
+            try:
+                proc = psutil.Process(int(pid))
+                # PID가 다른 프로그램에 재할당된 경우 건드리지 않음
+                if abs(proc.create_time() - create_time) > 1:
+                    continue
+                targets.append(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+                continue
+
+        if not targets:
+            return 0
+
+        for proc in targets:
+            try:
+                proc.terminate()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        gone, alive = psutil.wait_procs(targets, timeout=timeout)
+        for proc in alive:
+            try:
+                proc.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        return len(targets)
+
+    def terminate_all(self):
+        """현재 세션에서 추적 중인 모든 브라우저 프로세스 종료 (앱 종료 시)"""
+        with self.lock:
+            sessions = self.sessions
+            self.sessions = {}
+            self._save_registry()
+
+        killed = 0
+        for processes in sessions.values():
+            killed += self.kill_tree(processes, timeout=3)
+
+        if killed:
+            self.logger.info(f"앱 종료 시 남은 브라우저 프로세스 {killed}개를 정리했습니다")
+
+    def reap_orphans(self):
+        """이전 실행에서 남은 고아 브라우저 프로세스 정리 (앱 시작 시)"""
+        killed = 0
+        with self.lock:
+            registry = self._load_registry()
+            remaining = {}
+
+            for owner_pid, entry in registry.items():
+                # 아직 실행 중인 다른 인스턴스의 브라우저는 건드리지 않음
+                if self._is_alive(int(owner_pid), entry.get('owner_create_time')):
+                    remaining[owner_pid] = entry
+                    continue
+
+                for processes in entry.get('sessions', {}).values():
+                    orphans = {pid: create_time for pid, create_time in processes.items()
+                               if self._is_browser_process(int(pid))}
+                    killed += self.kill_tree(orphans, timeout=3)
+
+            self._write_registry(remaining)
+
+        if killed:
+            self.logger.info(f"이전 실행에서 남은 브라우저 프로세스 {killed}개를 정리했습니다")
+        return killed
+
+    def _is_alive(self, pid, create_time):
+        """프로세스가 실행 중인지 확인 (PID 재사용 고려)"""
+        try:
+            proc = psutil.Process(pid)
+            return create_time is None or abs(proc.create_time() - create_time) <= 1
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+
+    def _is_browser_process(self, pid):
+        """Chrome/ChromeDriver 프로세스인지 확인"""
+        try:
+            name = psutil.Process(pid).name().lower()
+            return any(browser_name in name for browser_name in self.BROWSER_PROCESS_NAMES)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+
+    def _load_registry(self):
+        """PID 기록 파일 로드"""
+        try:
+            if self.registry_file.exists():
+                with open(self.registry_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"브라우저 PID 기록 로드 실패: {str(e)}")
+        return {}
+
+    def _write_registry(self, registry):
+        """PID 기록 파일 저장"""
+        try:
+            self.registry_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.registry_file, 'w', encoding='utf-8') as f:
+                json.dump(registry, f, indent=2)
+        except OSError as e:
+            self.logger.warning(f"브라우저 PID 기록 저장 실패: {str(e)}")
+
+    def _save_registry(self):
+        """현재 프로세스의 추적 정보를 PID 기록 파일에 반영"""
+        registry = self._load_registry()
+        owner_pid = str(os.getpid())
+
+        if self.sessions:
+            registry[owner_pid] = {
+                'owner_create_time': psutil.Process().create_time(),
+                'updated_at': datetime.now().isoformat(),
+                'sessions': {str(root_pid): {str(pid): create_time for pid, create_time in processes.items()}
+                             for root_pid, processes in self.sessions.items()}
+            }
+        else:
+            registry.pop(owner_pid, None)
+
+        self._write_registry(registry)
+
+# 전역 브라우저 감독 인스턴스
+browser_supervisor = BrowserSupervisor()
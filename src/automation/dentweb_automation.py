@@ -5,10 +5,12 @@ Dentweb 자동화 모듈
 
 import os
 import io
+import logging
 import base64
 import requests
 import json
 import re
+import uuid
 from datetime import datetime, date
 from pathlib import Path
 from typing import Dict, Tuple, Optional
@@ -18,20 +20,32 @@ import win32gui
 from PyQt5.QtCore import QThread, pyqtSignal
 
 from ..config import config
+from ..utils.tracing import tracer, traced
+from .pipeline import get_resource_lock
 
 class DentwebOCRExtractor:
     """Dentweb 스크린샷 및 OCR 추출 클래스"""
     
     def __init__(self):
-        self.api_key = config.get_upstage_api_key()
-        self.api_url = config.get('upstage', 'api_url', 'https://api.upstage.ai/v1/document-ai/ocr')
+        self.logger = logging.getLogger('DentwebOCR')
     
+    @property
+    def api_key(self) -> str:
+        """Upstage API 키 (복호화 결과는 Config가 캐시)"""
+        return config.get_upstage_api_key()
+    
+    @property
+    def api_url(self) -> str:
+        """Upstage OCR API URL (설정 변경 시 바로 반영)"""
+        return config.snapshot.upstage_api_url
+    
+    @traced("ocr.find_window")
     def find_dentweb_window(self) -> Optional[Dict]:
         """Dentweb 프로그램 창 찾기 (최소화 창 포함 강화 버전)"""
         try:
             dentweb_windows = []
             
-            print("모든 창을 스캔하여 덴트웹 프로그램을 찾습니다...")
+            self.logger.info("모든 창을 스캔하여 덴트웹 프로그램을 찾습니다...")
             
             def enum_windows_callback(hwnd, windows):
                 try:
@@ -46,7 +60,7 @@ class DentwebOCRExtractor:
                     except:
                         class_name = ""
                     
-                    print(f"창 스캔: '{window_title}' (클래스: {class_name})")
+                    self.logger.debug("창 스캔: '%s' (클래스: %s)", window_title, class_name)
                     
                     # 1. 매우 강력한 패턴: Chart No.와 이름이 포함된 덴트웹 창
                     super_strong_patterns = [
@@ -90,7 +104,7 @@ class DentwebOCRExtractor:
                                 is_actually_minimized = (placement[1] == win32con.SW_SHOWMINIMIZED)
                                 if is_actually_minimized:
                                     is_minimized = True
-                                    print(f"Windows API로 최소화 확인: {window_title}")
+                                    self.logger.debug("Windows API로 최소화 확인: %s", window_title)
                             except:
                                 pass
                             
@@ -98,59 +112,59 @@ class DentwebOCRExtractor:
                             is_window_visible = win32gui.IsWindowVisible(hwnd)
                             is_window_enabled = win32gui.IsWindowEnabled(hwnd)
                             
-                            print(f"창 상태 상세: 최소화={is_minimized}, 보임={is_window_visible}, 활성={is_window_enabled}")
+                            self.logger.debug("창 상태 상세: 최소화=%s, 보임=%s, 활성=%s", is_minimized, is_window_visible, is_window_enabled)
                             
                             # 최소화되었거나 보이지 않는 창 복원 시도 (더욱 강화된 버전)
                             if is_minimized or not is_window_visible or (rect[2] - rect[0] <= 0):
-                                print(f"숨겨진/최소화된 창 발견 (강력한 복원 시도): {window_title}")
+                                self.logger.warning(f"숨겨진/최소화된 창 발견 (강력한 복원 시도): {window_title}")
                                 try:
                                     import time
                                     
                                     # 1단계: 기본 복원 시퀀스
-                                    print("1단계: 기본 복원...")
+                                    self.logger.debug("1단계: 기본 복원...")
                                     win32gui.ShowWindow(hwnd, 9)  # SW_RESTORE
                                     time.sleep(0.3)
                                     
                                     # 2단계: 강제 표시
-                                    print("2단계: 강제 표시...")
+                                    self.logger.debug("2단계: 강제 표시...")
                                     win32gui.ShowWindow(hwnd, 5)  # SW_SHOW
                                     time.sleep(0.2)
                                     
                                     # 3단계: 일반 창으로 표시
-                                    print("3단계: 일반 창으로 표시...")
+                                    self.logger.debug("3단계: 일반 창으로 표시...")
                                     win32gui.ShowWindow(hwnd, 1)  # SW_SHOWNORMAL
                                     time.sleep(0.3)
                                     
                                     # 4단계: 최전면으로 이동
-                                    print("4단계: 최전면으로 이동...")
+                                    self.logger.debug("4단계: 최전면으로 이동...")
                                     try:
                                         win32gui.SetForegroundWindow(hwnd)
                                         win32gui.BringWindowToTop(hwnd)
                                         # 추가: 활성 창으로 설정
                                         win32gui.SetActiveWindow(hwnd)
                                     except Exception as fg_error:
-                                        print(f"최전면 이동 실패: {fg_error}")
+                                        self.logger.warning(f"최전면 이동 실패: {fg_error}")
                                     
                                     time.sleep(0.5)
                                     
                                     # 5단계: 복원 결과 확인
                                     rect_after = win32gui.GetWindowRect(hwnd)
-                                    print(f"복원 후 위치: {rect_after}")
+                                    self.logger.debug("복원 후 위치: %s", rect_after)
                                     
                                     # 여전히 복원되지 않은 경우 최대화 시도
                                     if rect_after[0] < -30000 or rect_after[1] < -30000 or (rect_after[2] - rect_after[0] <= 0):
-                                        print("5단계: 최대화로 강제 복원...")
+                                        self.logger.info("5단계: 최대화로 강제 복원...")
                                         win32gui.ShowWindow(hwnd, 3)  # SW_SHOWMAXIMIZED
                                         time.sleep(0.5)
                                         rect_after = win32gui.GetWindowRect(hwnd)
-                                        print(f"최대화 후 위치: {rect_after}")
+                                        self.logger.debug("최대화 후 위치: %s", rect_after)
                                     
                                     rect = rect_after
                                     is_minimized = False
-                                    print(f"창 복원 완료: {rect}")
+                                    self.logger.info(f"창 복원 완료: {rect}")
                                         
                                 except Exception as e:
-                                    print(f"창 복원 중 오류: {e}")
+                                    self.logger.error(f"창 복원 중 오류: {e}")
                                     # 복원 실패해도 창 정보는 저장 (나중에 재시도 가능)
                                     pass
                             
@@ -169,19 +183,19 @@ class DentwebOCRExtractor:
                                 'area': (rect[2] - rect[0]) * (rect[3] - rect[1])
                             }
                             windows.append(window_info)
-                            print(f"Dentweb 창 발견: {window_title}")
-                            print(f"  위치: {rect}, 활성: {is_foreground}, 최소화: {is_minimized}")
+                            self.logger.info(f"Dentweb 창 발견: {window_title}")
+                            self.logger.debug("  위치: %s, 활성: %s, 최소화: %s", rect, is_foreground, is_minimized)
                                 
                         except Exception as e:
-                            print(f"창 정보 가져오기 실패: {e}")
+                            self.logger.error(f"창 정보 가져오기 실패: {e}")
                 except Exception as callback_error:
-                    print(f"창 콜백 처리 중 오류: {callback_error}")
+                    self.logger.error(f"창 콜백 처리 중 오류: {callback_error}")
                 return True
             
             win32gui.EnumWindows(enum_windows_callback, dentweb_windows)
             
             if dentweb_windows:
-                print(f"총 {len(dentweb_windows)}개의 덴트웹 관련 창 발견")
+                self.logger.info(f"총 {len(dentweb_windows)}개의 덴트웹 관련 창 발견")
                 
                 # 우선순위 기반 선택
                 # 1순위: 매우 강력한 패턴 (Chart No. + 이름 포함)
@@ -193,7 +207,7 @@ class DentwebOCRExtractor:
                         selected_window = max(foreground_matches, key=lambda w: w['area'])
                     else:
                         selected_window = max(super_strong_matches, key=lambda w: w['area'])
-                    print(f"매우 강력한 패턴으로 선택: {selected_window['title']}")
+                    self.logger.info(f"매우 강력한 패턴으로 선택: {selected_window['title']}")
                     
                     # 선택된 창 최종 복원 확인
                     self._ensure_window_restored(selected_window)
@@ -208,7 +222,7 @@ class DentwebOCRExtractor:
                         selected_window = max(foreground_matches, key=lambda w: w['area'])
                     else:
                         selected_window = max(strong_matches, key=lambda w: w['area'])
-                    print(f"강력한 패턴으로 선택: {selected_window['title']}")
+                    self.logger.info(f"강력한 패턴으로 선택: {selected_window['title']}")
                     
                     # 선택된 창 최종 복원 확인
                     self._ensure_window_restored(selected_window)
@@ -218,7 +232,7 @@ class DentwebOCRExtractor:
                 visible_windows = [w for w in dentweb_windows if w.get('is_visible_area', True)]
                 if visible_windows:
                     selected_window = max(visible_windows, key=lambda w: w['area'])
-                    print(f"가장 큰 창으로 선택: {selected_window['title']}")
+                    self.logger.info(f"가장 큰 창으로 선택: {selected_window['title']}")
                     
                     # 선택된 창 최종 복원 확인
                     self._ensure_window_restored(selected_window)
@@ -226,39 +240,40 @@ class DentwebOCRExtractor:
                 
                 # 마지막: 아무거나
                 selected_window = dentweb_windows[0]
-                print(f"첫 번째 창으로 선택: {selected_window['title']}")
+                self.logger.info(f"첫 번째 창으로 선택: {selected_window['title']}")
                 
                 # 선택된 창 최종 복원 확인
                 self._ensure_window_restored(selected_window)
                 return selected_window
                 
             else:
-                print("Dentweb 창을 찾을 수 없습니다")
+                self.logger.warning("Dentweb 창을 찾을 수 없습니다")
                 return None
                 
         except Exception as e:
-            print(f"Dentweb 창 찾기 오류: {e}")
+            self.logger.error(f"Dentweb 창 찾기 오류: {e}")
             return None
     
+    @traced("ocr.ensure_window_restored")
     def _ensure_window_restored(self, window_info: Dict):
         """선택된 창이 확실히 복원되었는지 최종 확인 및 복원"""
         try:
             hwnd = window_info['hwnd']
             window_title = window_info['title']
             
-            print(f"최종 창 복원 확인: {window_title}")
+            self.logger.debug(f"최종 창 복원 확인: {window_title}")
             
             # 현재 창 상태 확인
             current_rect = win32gui.GetWindowRect(hwnd)
             is_visible = win32gui.IsWindowVisible(hwnd)
             
-            print(f"최종 확인 - 위치: {current_rect}, 보임: {is_visible}")
+            self.logger.debug(f"최종 확인 - 위치: {current_rect}, 보임: {is_visible}")
             
             # 여전히 최소화되어 있거나 보이지 않는 경우
             if (current_rect[0] < -30000 or current_rect[1] < -30000 or 
                 current_rect[2] - current_rect[0] <= 0 or not is_visible):
                 
-                print("창이 여전히 숨겨져 있음 - 최종 복원 시도...")
+                self.logger.warning("창이 여전히 숨겨져 있음 - 최종 복원 시도...")
                 
                 import time
                 
@@ -288,24 +303,25 @@ class DentwebOCRExtractor:
                     final_rect = win32gui.GetWindowRect(hwnd)
                     final_visible = win32gui.IsWindowVisible(hwnd)
                     
-                    print(f"최종 복원 결과 - 위치: {final_rect}, 보임: {final_visible}")
+                    self.logger.debug(f"최종 복원 결과 - 위치: {final_rect}, 보임: {final_visible}")
                     
                     # 창 정보 업데이트
                     window_info['rect'] = final_rect
                     window_info['is_minimized'] = False
                     
                 except Exception as restore_error:
-                    print(f"최종 복원 실패: {restore_error}")
+                    self.logger.warning(f"최종 복원 실패: {restore_error}")
             else:
-                print("창이 이미 올바르게 복원되어 있습니다")
+                self.logger.info("창이 이미 올바르게 복원되어 있습니다")
                 
         except Exception as e:
-            print(f"최종 창 복원 확인 중 오류: {e}")
+            self.logger.error(f"최종 창 복원 확인 중 오류: {e}")
     
+    @traced("ocr.force_restore_window")
     def force_restore_dentweb_window(self) -> Optional[Dict]:
         """최소화된 덴트웹 창을 강제로 찾아서 최대화하는 최강 메서드"""
         try:
-            print("🔍 최소화된 덴트웹 창을 강제로 찾아서 복원합니다...")
+            self.logger.info("🔍 최소화된 덴트웹 창을 강제로 찾아서 복원합니다...")
             
             all_windows = []
             
@@ -357,7 +373,7 @@ class DentwebOCRExtractor:
                             }
                             
                             windows.append(window_info)
-                            print(f"덴트웹 관련 창 발견: '{window_title}' (최소화: {is_minimized}, 보임: {is_visible})")
+                            self.logger.debug("덴트웹 관련 창 발견: '%s' (최소화: %s, 보임: %s)", window_title, is_minimized, is_visible)
                             
                 except Exception as e:
                     pass  # 개별 창 처리 실패는 무시하고 계속
@@ -368,10 +384,10 @@ class DentwebOCRExtractor:
             win32gui.EnumWindows(force_enum_callback, all_windows)
             
             if not all_windows:
-                print("❌ 덴트웹 창을 전혀 찾을 수 없습니다")
+                self.logger.warning("❌ 덴트웹 창을 전혀 찾을 수 없습니다")
                 return None
             
-            print(f"📋 총 {len(all_windows)}개의 덴트웹 관련 창 발견")
+            self.logger.info(f"📋 총 {len(all_windows)}개의 덴트웹 관련 창 발견")
             
             # 가장 적합한 창 선택 (최소화된 창 우선)
             target_window = None
@@ -380,17 +396,17 @@ class DentwebOCRExtractor:
             minimized_windows = [w for w in all_windows if w['is_minimized']]
             if minimized_windows:
                 target_window = minimized_windows[0]
-                print(f"✅ 최소화된 창 선택: {target_window['title']}")
+                self.logger.info(f"✅ 최소화된 창 선택: {target_window['title']}")
             else:
                 # 2. 보이지 않는 창 중에서 선택
                 hidden_windows = [w for w in all_windows if not w['is_visible']]
                 if hidden_windows:
                     target_window = hidden_windows[0]
-                    print(f"✅ 숨겨진 창 선택: {target_window['title']}")
+                    self.logger.info(f"✅ 숨겨진 창 선택: {target_window['title']}")
                 else:
                     # 3. 아무 창이나 선택
                     target_window = all_windows[0]
-                    print(f"✅ 첫 번째 창 선택: {target_window['title']}")
+                    self.logger.info(f"✅ 첫 번째 창 선택: {target_window['title']}")
             
             # 선택된 창 강력 복원
             if target_window:
@@ -398,13 +414,13 @@ class DentwebOCRExtractor:
                 if restore_success:
                     return target_window
                 else:
-                    print("❌ 덴트웹 창 복원에 실패했습니다.")
+                    self.logger.warning("❌ 덴트웹 창 복원에 실패했습니다.")
                     return None
             
             return None
             
         except Exception as e:
-            print(f"❌ 강제 창 복원 중 오류: {e}")
+            self.logger.error(f"❌ 강제 창 복원 중 오류: {e}")
             return None
     
     def _force_restore_window(self, window_info: Dict):
@@ -413,7 +429,7 @@ class DentwebOCRExtractor:
             hwnd = window_info['hwnd']
             title = window_info['title']
             
-            print(f"🚀 '{title}' 창을 강력하게 복원합니다...")
+            self.logger.info(f"🚀 '{title}' 창을 강력하게 복원합니다...")
             
             import time
             
@@ -427,7 +443,7 @@ class DentwebOCRExtractor:
             
             for cmd, name in restoration_commands:
                 try:
-                    print(f"  단계: {name}")
+                    self.logger.debug(f"  단계: {name}")
                     win32gui.ShowWindow(hwnd, cmd)
                     time.sleep(0.3)
                     
@@ -436,32 +452,32 @@ class DentwebOCRExtractor:
                     is_visible = win32gui.IsWindowVisible(hwnd)
                     
                     if is_visible and current_rect[2] - current_rect[0] > 100:
-                        print(f"  ✅ {name} 성공: {current_rect}")
+                        self.logger.debug(f"  ✅ {name} 성공: {current_rect}")
                         break
                     else:
-                        print(f"  ⏳ {name} 진행 중...")
+                        self.logger.debug(f"  ⏳ {name} 진행 중...")
                         
                 except Exception as step_error:
-                    print(f"  ❌ {name} 실패: {step_error}")
+                    self.logger.warning(f"  ❌ {name} 실패: {step_error}")
                     continue
             
             # 2단계: 최전면 이동
             try:
-                print("  단계: 최전면 이동")
+                self.logger.debug("  단계: 최전면 이동")
                 win32gui.SetForegroundWindow(hwnd)
                 win32gui.BringWindowToTop(hwnd)
                 time.sleep(0.3)
             except Exception as fg_error:
-                print(f"  ⚠️ 최전면 이동 실패: {fg_error}")
+                self.logger.warning(f"  ⚠️ 최전면 이동 실패: {fg_error}")
             
             # 3단계: 최종 확인
             final_rect = win32gui.GetWindowRect(hwnd)
             final_visible = win32gui.IsWindowVisible(hwnd)
             
-            print(f"🎯 최종 복원 결과:")
-            print(f"  위치: {final_rect}")
-            print(f"  보임: {final_visible}")
-            print(f"  크기: {final_rect[2] - final_rect[0]}x{final_rect[3] - final_rect[1]}")
+            self.logger.debug(f"🎯 최종 복원 결과:")
+            self.logger.debug(f"  위치: {final_rect}")
+            self.logger.debug(f"  보임: {final_visible}")
+            self.logger.debug(f"  크기: {final_rect[2] - final_rect[0]}x{final_rect[3] - final_rect[1]}")
             
             # 창 정보 업데이트
             window_info['rect'] = final_rect
@@ -469,17 +485,18 @@ class DentwebOCRExtractor:
             window_info['is_minimized'] = False
             
             if final_visible and (final_rect[2] - final_rect[0] > 100):
-                print("✅ 창 복원 성공!")
+                self.logger.info("✅ 창 복원 성공!")
                 return True
             else:
-                print("❌ 창 복원 실패!")
-                print("💡 Dentweb 프로그램을 수동으로 최대화한 후 다시 시도해주세요.")
+                self.logger.error("❌ 창 복원 실패!")
+                self.logger.warning("💡 Dentweb 프로그램을 수동으로 최대화한 후 다시 시도해주세요.")
                 return False
                 
         except Exception as e:
-            print(f"❌ 강력한 창 복원 실패: {e}")
+            self.logger.error(f"❌ 강력한 창 복원 실패: {e}")
             return False
     
+    @traced("ocr.capture")
     def capture_dentweb_screenshot(self, x: int = None, y: int = None, 
                                  width: int = None, height: int = None) -> Optional[Image.Image]:
         """
@@ -492,7 +509,7 @@ class DentwebOCRExtractor:
             
             # 1-1. 기본 방법 실패 시 강력한 방법 사용
             if not dentweb_window:
-                print("⚠️ 기본 창 찾기 실패 - 강력한 방법으로 재시도...")
+                self.logger.warning("⚠️ 기본 창 찾기 실패 - 강력한 방법으로 재시도...")
                 dentweb_window = self.force_restore_dentweb_window()
             
             if dentweb_window:
@@ -504,7 +521,7 @@ class DentwebOCRExtractor:
                     import time
                     hwnd = dentweb_window['hwnd']
                     
-                    print(f"창 상태 최적화 시작 - 현재 크기: {rect}")
+                    self.logger.debug(f"창 상태 최적화 시작 - 현재 크기: {rect}")
                     
                     # 1단계: 최소화 해제
                     win32gui.ShowWindow(hwnd, 9)  # SW_RESTORE
@@ -515,17 +532,17 @@ class DentwebOCRExtractor:
                     current_width = current_rect[2] - current_rect[0]
                     current_height = current_rect[3] - current_rect[1]
                     
-                    print(f"복원 후 크기: {current_width}x{current_height}")
+                    self.logger.debug(f"복원 후 크기: {current_width}x{current_height}")
                     
                     # 창이 너무 작거나 위치가 이상하면 최대화 시도
                     if (current_width < 1000 or current_height < 700 or 
                         current_rect[0] < -100 or current_rect[1] < -100):
-                        print("창 크기가 부적절함 - 최대화 시도")
+                        self.logger.warning("창 크기가 부적절함 - 최대화 시도")
                         win32gui.ShowWindow(hwnd, 3)  # SW_MAXIMIZE
                         time.sleep(0.5)
                     else:
                         # 적절한 크기라면 화면에 보이도록 조정
-                        print("창 크기 적절함 - 표시 상태로 전환")
+                        self.logger.info("창 크기 적절함 - 표시 상태로 전환")
                         win32gui.ShowWindow(hwnd, 5)  # SW_SHOW
                         time.sleep(0.3)
                     
@@ -538,12 +555,12 @@ class DentwebOCRExtractor:
                     final_width = final_rect[2] - final_rect[0]
                     final_height = final_rect[3] - final_rect[1]
                     
-                    print(f"최종 창 상태: {final_width}x{final_height}, 위치: {final_rect}")
+                    self.logger.debug(f"최종 창 상태: {final_width}x{final_height}, 위치: {final_rect}")
                     
                     # 여전히 문제가 있으면 강력한 복원 시도
                     if (final_width < 800 or final_height < 600 or 
                         final_rect[0] < -30000 or final_rect[1] < -30000):
-                        print("강력한 창 복원 시도")
+                        self.logger.warning("강력한 창 복원 시도")
                         
                         # 1. 강제 일반 상태로 복원
                         win32gui.ShowWindow(hwnd, 1)  # SW_SHOWNORMAL
@@ -565,36 +582,36 @@ class DentwebOCRExtractor:
                             win32gui.SetWindowPos(hwnd, 0, new_x, new_y, new_width, new_height, 0x0040)
                             time.sleep(0.5)
                             
-                            print(f"창 위치 강제 조정: ({new_x}, {new_y}) - {new_width}x{new_height}")
+                            self.logger.debug(f"창 위치 강제 조정: ({new_x}, {new_y}) - {new_width}x{new_height}")
                             
                         except Exception as pos_error:
-                            print(f"창 위치 조정 실패: {pos_error}")
+                            self.logger.warning(f"창 위치 조정 실패: {pos_error}")
                             # 마지막 수단으로 최대화
                             win32gui.ShowWindow(hwnd, 3)  # SW_MAXIMIZE
                             time.sleep(0.5)
                         
                         # 최종 확인
                         final_rect = win32gui.GetWindowRect(hwnd)
-                        print(f"강력한 복원 후: {final_rect}")
+                        self.logger.debug(f"강력한 복원 후: {final_rect}")
                     
                     rect = final_rect
                     
                 except Exception as e:
-                    print(f"창 최적화 실패: {e}")
-                    print("기본 설정으로 진행합니다")
+                    self.logger.warning(f"창 최적화 실패: {e}")
+                    self.logger.warning("기본 설정으로 진행합니다")
                 
                 # 캡처 영역 설정 (최대화시 (0,0)에서 670*470 영역만 캡처)
                 window_width = rect[2] - rect[0]
                 window_height = rect[3] - rect[1]
                 
-                print(f"창 전체 크기: {window_width}x{window_height}")
-                print(f"창 위치: ({rect[0]}, {rect[1]}) - ({rect[2]}, {rect[3]})")
+                self.logger.debug(f"창 전체 크기: {window_width}x{window_height}")
+                self.logger.debug(f"창 위치: ({rect[0]}, {rect[1]}) - ({rect[2]}, {rect[3]})")
                 
                 # 화면 크기 가져오기
                 import win32api
                 screen_width = win32api.GetSystemMetrics(0)
                 screen_height = win32api.GetSystemMetrics(1)
-                print(f"화면 크기: {screen_width}x{screen_height}")
+                self.logger.debug(f"화면 크기: {screen_width}x{screen_height}")
                 
                 # 창이 최대화된 상태인지 확인 (더 정확한 판별)
                 is_maximized = (
@@ -603,7 +620,7 @@ class DentwebOCRExtractor:
                     rect[0] <= 10 and rect[1] <= 10  # 창이 화면 좌상단 근처에 있는지 확인
                 )
                 
-                print(f"최대화 상태 판별: {is_maximized}")
+                self.logger.debug(f"최대화 상태 판별: {is_maximized}")
                 
                 if is_maximized:
                     # 최대화된 경우: 절대 화면 좌표 (0,0) 기준으로 670*470 영역만 캡처
@@ -611,7 +628,7 @@ class DentwebOCRExtractor:
                     y = 0
                     width = 670
                     height = 470
-                    print(f"최대화 감지: 절대 화면 좌표 (0,0) 기준으로 670×470 영역 캡처")
+                    self.logger.debug(f"최대화 감지: 절대 화면 좌표 (0,0) 기준으로 670×470 영역 캡처")
                 else:
                     # 최대화되지 않은 경우: 창 기준 상대 좌표로 캡처
                     if window_width >= 800 and window_height >= 600:
@@ -637,14 +654,14 @@ class DentwebOCRExtractor:
                     if y + height > screen_height:
                         height = screen_height - y
                     
-                    print(f"일반 창 모드: 창 기준 상대 좌표로 캡처")
+                    self.logger.debug(f"일반 창 모드: 창 기준 상대 좌표로 캡처")
                 
-                print(f"최종 캡처 영역: ({x}, {y}) - {width}×{height}")
+                self.logger.debug(f"최종 캡처 영역: ({x}, {y}) - {width}×{height}")
                 if is_maximized:
-                    print(f"캡처 모드: 절대 화면 좌표 (0,0) 기준")
+                    self.logger.debug(f"캡처 모드: 절대 화면 좌표 (0,0) 기준")
                 else:
-                    print(f"캡처 영역 비율: {width/window_width:.1%} x {height/window_height:.1%}")
-                    print(f"캡처 모드: 창 기준 상대 좌표")
+                    self.logger.debug(f"캡처 영역 비율: {width/window_width:.1%} x {height/window_height:.1%}")
+                    self.logger.debug(f"캡처 모드: 창 기준 상대 좌표")
             else:
                 # 2. Dentweb 창을 찾지 못한 경우 (0,0,800,600) 기본값 사용
                 if x is None:
@@ -655,7 +672,7 @@ class DentwebOCRExtractor:
                     width = 800
                 if height is None:
                     height = 600
-                print(f"설정값으로 캡처: ({x}, {y}) - {width}×{height}")
+                self.logger.debug(f"설정값으로 캡처: ({x}, {y}) - {width}×{height}")
             # MSS를 사용한 스크린샷 촬영
             with mss.mss() as sct:
                 monitor = {
@@ -666,17 +683,18 @@ class DentwebOCRExtractor:
                 }
                 screenshot = sct.grab(monitor)
                 img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-                screenshots_dir = Path.home() / "AppData" / "Local" / "WebCephAuto" / "screenshots"
+                screenshots_dir = Path(config.app_dir) / "screenshots"
                 screenshots_dir.mkdir(parents=True, exist_ok=True)
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 screenshot_path = screenshots_dir / f"dentweb_screenshot_{timestamp}.png"
                 img.save(screenshot_path)
-                print(f"스크린샷 저장됨: {screenshot_path}")
+                self.logger.info(f"스크린샷 저장됨: {screenshot_path}")
                 return img
         except Exception as e:
-            print(f"스크린샷 촬영 오류: {e}")
+            self.logger.error(f"스크린샷 촬영 오류: {e}")
             return None
     
+    @traced("ocr.request")
     def extract_text_with_upstage_ocr(self, image: Image.Image) -> Optional[str]:
         """
         Upstage OCR API를 사용하여 이미지에서 텍스트 추출
@@ -692,7 +710,7 @@ class DentwebOCRExtractor:
             if not self.api_key:
                 raise Exception("Upstage API 키가 설정되지 않았습니다")
             
-            print(f"OCR API 호출 시작 - URL: {self.api_url}")
+            self.logger.debug(f"OCR API 호출 시작 - URL: {self.api_url}")
             
             # 이미지 전처리 (OCR 정확도 향상)
             processed_image = self._preprocess_image_for_ocr(image)
@@ -714,7 +732,7 @@ class DentwebOCRExtractor:
                     files = {"document": f}
                     data = {"model": "ocr"}
                     
-                    print("Upstage OCR API 요청 전송 중...")
+                    self.logger.debug("Upstage OCR API 요청 전송 중...")
                     
                     # API 호출
                     response = requests.post(
@@ -725,24 +743,25 @@ class DentwebOCRExtractor:
                         timeout=30
                     )
                 
-                print(f"API 응답 상태 코드: {response.status_code}")
+                self.logger.debug(f"API 응답 상태 코드: {response.status_code}")
                 
                 if response.status_code == 200:
                     result = response.json()
-                    print(f"OCR API 성공 응답: {result}")
+                    self.logger.debug("OCR API 성공 응답: %s", result)
                     
                     # 응답에서 텍스트 추출 (공식 응답 구조에 맞춤)
                     extracted_text = self._extract_text_from_response(result)
                     if extracted_text:
-                        print(f"추출된 텍스트 길이: {len(extracted_text)} 문자")
+                        self.logger.debug(f"추출된 텍스트 길이: {len(extracted_text)} 문자")
                         return extracted_text
                     else:
-                        print("응답에서 텍스트를 찾을 수 없습니다")
+                        self.logger.warning("응답에서 텍스트를 찾을 수 없습니다")
                         return None
                         
                 elif response.status_code == 401:
                     raise Exception("API 키가 올바르지 않습니다. 설정을 확인해주세요.")
                 elif response.status_code == 429:
+                    tracer.event('upstage.rate_limited')
                     raise Exception("API 호출 한도를 초과했습니다. 잠시 후 다시 시도해주세요.")
                 else:
                     error_msg = f"OCR API 오류 (코드: {response.status_code})"
@@ -751,7 +770,7 @@ class DentwebOCRExtractor:
                         error_msg += f" - {error_detail}"
                     except:
                         error_msg += f" - {response.text}"
-                    print(error_msg)
+                    self.logger.error(error_msg)
                     raise Exception(error_msg)
                     
             finally:
@@ -760,7 +779,7 @@ class DentwebOCRExtractor:
                     os.unlink(temp_filename)
                 
         except Exception as e:
-            print(f"OCR 처리 오류: {e}")
+            self.logger.error(f"OCR 처리 오류: {e}")
             return None
     
     def _extract_text_from_response(self, response_data: dict) -> Optional[str]:
@@ -818,9 +837,10 @@ class DentwebOCRExtractor:
             return None
             
         except Exception as e:
-            print(f"응답 텍스트 추출 오류: {e}")
+            self.logger.error(f"응답 텍스트 추출 오류: {e}")
             return None
     
+    @traced("ocr.preprocess")
     def _preprocess_image_for_ocr(self, image: Image.Image) -> Image.Image:
         """
         OCR 정확도 향상을 위한 이미지 전처리
@@ -843,7 +863,7 @@ class DentwebOCRExtractor:
                 new_width = int(width * scale_factor)
                 new_height = int(height * scale_factor)
                 image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                print(f"이미지 크기 조정: {width}x{height} -> {new_width}x{new_height}")
+                self.logger.debug(f"이미지 크기 조정: {width}x{height} -> {new_width}x{new_height}")
             
             # 대비 및 선명도 향상
             from PIL import ImageEnhance
@@ -859,9 +879,10 @@ class DentwebOCRExtractor:
             return image
             
         except Exception as e:
-            print(f"이미지 전처리 오류: {e}")
+            self.logger.error(f"이미지 전처리 오류: {e}")
             return image  # 오류 시 원본 반환
     
+    @traced("ocr.parse")
     def parse_patient_info(self, ocr_text: str) -> Dict[str, str]:
         """
         OCR로 추출된 텍스트에서 환자 정보를 파싱
@@ -881,13 +902,13 @@ class DentwebOCRExtractor:
             'capture_date': datetime.now().strftime('%Y-%m-%d')
         }
         try:
-            print(f"OCR 텍스트 파싱 시작:\n{ocr_text}")
+            self.logger.debug(f"OCR 텍스트 파싱 시작:\n{ocr_text}")
             lines = [line.strip() for line in ocr_text.split('\n') if line.strip()]
             full_text = ' '.join(lines)
             
             # 맨 윗줄(첫 번째 줄) 우선 파싱 - 환자 이름, 나이, 생년월일
             first_line = lines[0] if lines else ""
-            print(f"맨 윗줄 우선 파싱: {first_line}")
+            self.logger.debug(f"맨 윗줄 우선 파싱: {first_line}")
             
             # 1. 첫 번째 줄에서 환자 이름 우선 추출
             top_line_name_patterns = [
@@ -905,7 +926,7 @@ class DentwebOCRExtractor:
                     if len(full_name) >= 2:
                         patient_info['last_name'] = full_name[0]
                         patient_info['first_name'] = full_name[1:]
-                        print(f"첫 줄에서 이름 발견: 성={full_name[0]}, 이름={full_name[1:]}")
+                        self.logger.debug(f"첫 줄에서 이름 발견: 성={full_name[0]}, 이름={full_name[1:]}")
                         break
             
             # 2. 첫 번째 줄에서 생년월일 우선 추출 (나이와 함께 있는 경우 많음)
@@ -920,7 +941,7 @@ class DentwebOCRExtractor:
                     birth_date = re.sub(r'[./년월일\s]', '-', m.group(1))
                     birth_date = re.sub(r'-+', '-', birth_date).strip('-')
                     patient_info['birth_date'] = birth_date
-                    print(f"첫 줄에서 생년월일 발견: {birth_date}")
+                    self.logger.debug(f"첫 줄에서 생년월일 발견: {birth_date}")
                     break
             
             # 3. Chart No. (차트번호) - 첫 줄 우선, 없으면 전체에서 검색
@@ -935,7 +956,7 @@ class DentwebOCRExtractor:
                 m = re.search(pattern, first_line)
                 if m:
                     patient_info['chart_no'] = m.group(1)
-                    print(f"첫 줄에서 차트번호 발견: {m.group(1)}")
+                    self.logger.debug(f"첫 줄에서 차트번호 발견: {m.group(1)}")
                     break
             
             # 첫 줄에서 찾지 못한 경우 전체에서 검색
@@ -945,7 +966,7 @@ class DentwebOCRExtractor:
                         m = re.search(pattern, line)
                         if m:
                             patient_info['chart_no'] = m.group(1)
-                            print(f"차트번호 발견: {m.group(1)}")
+                            self.logger.debug(f"차트번호 발견: {m.group(1)}")
                             break
                     if patient_info['chart_no']:
                         break
@@ -968,7 +989,7 @@ class DentwebOCRExtractor:
                             if len(full_name) >= 2:
                                 patient_info['last_name'] = full_name[0]
                                 patient_info['first_name'] = full_name[1:]
-                                print(f"이름 발견: 성={full_name[0]}, 이름={full_name[1:]}")
+                                self.logger.debug(f"이름 발견: 성={full_name[0]}, 이름={full_name[1:]}")
                                 break
                     if patient_info['first_name']:
                         break
@@ -988,7 +1009,7 @@ class DentwebOCRExtractor:
                         if m:
                             birth_date = re.sub(r'[./]', '-', m.group(1))
                             patient_info['birth_date'] = birth_date
-                            print(f"생년월일 발견: {birth_date}")
+                            self.logger.debug(f"생년월일 발견: {birth_date}")
                             break
                     if patient_info['birth_date']:
                         break
@@ -1002,7 +1023,7 @@ class DentwebOCRExtractor:
                     m = re.search(pattern, line)
                     if m and not patient_info['phone']:
                         patient_info['phone'] = m.group(1)
-                        print(f"휴대전화 발견: {m.group(1)}")
+                        self.logger.debug(f"휴대전화 발견: {m.group(1)}")
                         break
             # 주소 (여러 줄 지원)
             address_lines = []
@@ -1019,7 +1040,7 @@ class DentwebOCRExtractor:
                     capture = True
             if address_lines:
                 patient_info['address'] = ' '.join(address_lines)
-                print(f"주소 발견: {patient_info['address']}")
+                self.logger.debug(f"주소 발견: {patient_info['address']}")
             # 성별 (1) 상단 (남 xxY xxM), (여 xxY xxM) 패턴
             gender_from_text = ''
             gender_text_patterns = [
@@ -1031,7 +1052,7 @@ class DentwebOCRExtractor:
                     m = re.search(pattern, line)
                     if m:
                         gender_from_text = m.group(1)
-                        print(f"성별(텍스트) 발견: {gender_from_text}")
+                        self.logger.debug(f"성별(텍스트) 발견: {gender_from_text}")
                         break
                 if gender_from_text:
                     break
@@ -1046,7 +1067,7 @@ class DentwebOCRExtractor:
                         gender_from_jumin = '남'
                     elif code in ['2', '4']:
                         gender_from_jumin = '여'
-                    print(f"성별(주민번호) 발견: {gender_from_jumin}")
+                    self.logger.debug(f"성별(주민번호) 발견: {gender_from_jumin}")
                     break
             # 최종 gender 결정
             gender = ''
@@ -1056,14 +1077,13 @@ class DentwebOCRExtractor:
                 gender = 'M' if gender_from_jumin == '남' else 'F'
             patient_info['gender'] = gender
             if gender:
-                print(f"최종 성별: {gender}")
-            print("파싱된 환자 정보:")
-            for key, value in patient_info.items():
-                print(f"  {key}: {value}")
+                self.logger.debug(f"최종 성별: {gender}")
+            self.logger.debug("파싱된 환자 정보: %s", patient_info)
         except Exception as e:
-            print(f"환자 정보 파싱 오류: {e}")
+            self.logger.error(f"환자 정보 파싱 오류: {e}")
         return patient_info
     
+    @traced("ocr.extract_patient_info")
     def extract_patient_info_from_dentweb(self, x: int = None, y: int = None,
                                         width: int = None, height: int = None) -> Dict[str, str]:
         """
@@ -1079,14 +1099,14 @@ class DentwebOCRExtractor:
         original_window_state = None
         
         try:
-            print("🔍 Dentweb 창 찾기 및 강제 복원 시작...")
+            self.logger.info("🔍 Dentweb 창 찾기 및 강제 복원 시작...")
             
             # 1. 기본 방법으로 Dentweb 창 찾기 시도
             dentweb_window = self.find_dentweb_window()
             
             # 2. 기본 방법 실패 시 강력한 방법 사용
             if not dentweb_window:
-                print("⚠️ 기본 방법으로 창을 찾지 못함 - 강력한 방법 시도...")
+                self.logger.warning("⚠️ 기본 방법으로 창을 찾지 못함 - 강력한 방법 시도...")
                 dentweb_window = self.force_restore_dentweb_window()
             
             if dentweb_window:
@@ -1096,36 +1116,36 @@ class DentwebOCRExtractor:
                 current_rect = win32gui.GetWindowRect(hwnd)
                 is_visible = win32gui.IsWindowVisible(hwnd)
                 
-                print(f"📊 현재 창 상태:")
-                print(f"  위치: {current_rect}")
-                print(f"  보임: {is_visible}")
-                print(f"  크기: {current_rect[2] - current_rect[0]}x{current_rect[3] - current_rect[1]}")
+                self.logger.debug(f"📊 현재 창 상태:")
+                self.logger.debug(f"  위치: {current_rect}")
+                self.logger.debug(f"  보임: {is_visible}")
+                self.logger.debug(f"  크기: {current_rect[2] - current_rect[0]}x{current_rect[3] - current_rect[1]}")
                 
                 # 창이 여전히 문제가 있으면 추가 복원
                 if (not is_visible or current_rect[0] < -30000 or current_rect[1] < -30000 or 
                     current_rect[2] - current_rect[0] <= 100):
                     
-                    print("⚠️ 창 상태가 여전히 불완전 - 최종 강력 복원...")
+                    self.logger.warning("⚠️ 창 상태가 여전히 불완전 - 최종 강력 복원...")
                     restore_success = self._force_restore_window(dentweb_window)
                     
                     if not restore_success:
-                        print("❌ 덴트웹 창 복원 실패!")
-                        print("🔧 해결 방법:")
-                        print("  1. 덴트웹 프로그램을 수동으로 최대화해주세요")
-                        print("  2. 덴트웹이 다른 모니터에 열려있는지 확인해주세요")
-                        print("  3. 덴트웹을 재시작한 후 다시 시도해주세요")
+                        self.logger.error("❌ 덴트웹 창 복원 실패!")
+                        self.logger.warning("🔧 해결 방법:")
+                        self.logger.warning("  1. 덴트웹 프로그램을 수동으로 최대화해주세요")
+                        self.logger.warning("  2. 덴트웹이 다른 모니터에 열려있는지 확인해주세요")
+                        self.logger.warning("  3. 덴트웹을 재시작한 후 다시 시도해주세요")
                         
                         raise Exception("덴트웹 창을 복원할 수 없습니다. 위 방법을 시도한 후 다시 실행해주세요.")
                     
                     # 복원 후 재확인
                     current_rect = win32gui.GetWindowRect(hwnd)
-                    print(f"최종 복원 후 상태: {current_rect}")
+                    self.logger.debug(f"최종 복원 후 상태: {current_rect}")
                 
                 # 현재 창 상태 저장 (복원을 위해)
                 original_window_state = current_rect
                 
                 # 창 최대화 (OCR을 위해)
-                print("🔧 Dentweb 창을 최대화합니다...")
+                self.logger.info("🔧 Dentweb 창을 최대화합니다...")
                 try:
                     win32gui.ShowWindow(hwnd, 3)  # SW_MAXIMIZE
                     win32gui.SetForegroundWindow(hwnd)  # 최전면으로 이동
@@ -1135,35 +1155,35 @@ class DentwebOCRExtractor:
                     
                     # 최대화 결과 확인
                     maximized_rect = win32gui.GetWindowRect(hwnd)
-                    print(f"✅ 최대화 완료: {maximized_rect}")
+                    self.logger.info(f"✅ 최대화 완료: {maximized_rect}")
                     
                 except Exception as max_error:
-                    print(f"⚠️ 최대화 중 오류: {max_error}")
+                    self.logger.warning(f"⚠️ 최대화 중 오류: {max_error}")
                     
             else:
-                print("❌ 모든 방법으로도 Dentweb 창을 찾을 수 없습니다")
-                print("🔧 해결 방법:")
-                print("  1. 덴트웹 프로그램이 실행 중인지 확인해주세요")
-                print("  2. 덴트웹 프로그램을 재시작해주세요")
-                print("  3. 덴트웹이 다른 사용자 계정으로 실행 중인지 확인해주세요")
+                self.logger.error("❌ 모든 방법으로도 Dentweb 창을 찾을 수 없습니다")
+                self.logger.warning("🔧 해결 방법:")
+                self.logger.warning("  1. 덴트웹 프로그램이 실행 중인지 확인해주세요")
+                self.logger.warning("  2. 덴트웹 프로그램을 재시작해주세요")
+                self.logger.warning("  3. 덴트웹이 다른 사용자 계정으로 실행 중인지 확인해주세요")
                 
                 raise Exception("덴트웹 프로그램을 찾을 수 없습니다. 덴트웹을 실행한 후 다시 시도해주세요.")
             
-            print("Dentweb 스크린샷 촬영 중...")
+            self.logger.info("Dentweb 스크린샷 촬영 중...")
             
             # 2. 스크린샷 촬영
             screenshot = self.capture_dentweb_screenshot(x, y, width, height)
             if not screenshot:
                 raise Exception("스크린샷 촬영에 실패했습니다")
             
-            print("OCR 텍스트 추출 중...")
+            self.logger.info("OCR 텍스트 추출 중...")
             
             # 3. OCR 텍스트 추출
             ocr_text = self.extract_text_with_upstage_ocr(screenshot)
             if not ocr_text:
                 raise Exception("OCR 텍스트 추출에 실패했습니다")
             
-            print(f"추출된 텍스트:\n{ocr_text}")
+            self.logger.debug(f"추출된 텍스트:\n{ocr_text}")
             
             # 4. 환자 정보 파싱
             patient_info = self.parse_patient_info(ocr_text)
@@ -1171,7 +1191,7 @@ class DentwebOCRExtractor:
             return patient_info
             
         except Exception as e:
-            print(f"환자 정보 추출 오류: {e}")
+            self.logger.error(f"환자 정보 추출 오류: {e}")
             return {
                 'name': '',
                 'birth_date': '',
@@ -1184,13 +1204,13 @@ class DentwebOCRExtractor:
             if dentweb_window:
                 try:
                     hwnd = dentweb_window['hwnd']
-                    print("OCR 완료 - Dentweb 창을 최소화합니다...")
+                    self.logger.info("OCR 완료 - Dentweb 창을 최소화합니다...")
                     win32gui.ShowWindow(hwnd, 6)  # SW_MINIMIZE
-                    print("Dentweb 창이 최소화되었습니다")
+                    self.logger.info("Dentweb 창이 최소화되었습니다")
                 except Exception as minimize_error:
-                    print(f"창 최소화 실패: {minimize_error}")
+                    self.logger.warning(f"창 최소화 실패: {minimize_error}")
             else:
-                print("최소화할 Dentweb 창이 없습니다")
+                self.logger.info("최소화할 Dentweb 창이 없습니다")
 
     def test_ocr_with_current_screen(self, x: int = 0, y: int = 0, 
                                    width: int = 400, height: int = 400) -> Dict[str, str]:
@@ -1211,7 +1231,7 @@ class DentwebOCRExtractor:
         }
         
         try:
-            print(f"테스트 OCR 시작 - 영역: ({x}, {y}, {width}, {height})")
+            self.logger.debug(f"테스트 OCR 시작 - 영역: ({x}, {y}, {width}, {height})")
             
             # 1. 스크린샷 촬영
             screenshot = self.capture_dentweb_screenshot(x, y, width, height)
@@ -1220,26 +1240,26 @@ class DentwebOCRExtractor:
                 return result
             
             # 스크린샷 경로 저장
-            screenshots_dir = Path.home() / "AppData" / "Local" / "WebCephAuto" / "screenshots"
+            screenshots_dir = Path(config.app_dir) / "screenshots"
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             screenshot_path = screenshots_dir / f"test_ocr_{timestamp}.png"
             screenshot.save(screenshot_path)
             result['screenshot_path'] = str(screenshot_path)
             
-            print(f"테스트 스크린샷 저장: {screenshot_path}")
+            self.logger.debug(f"테스트 스크린샷 저장: {screenshot_path}")
             
             # 2. OCR 텍스트 추출
             extracted_text = self.extract_text_with_upstage_ocr(screenshot)
             if extracted_text:
                 result['success'] = True
                 result['text'] = extracted_text
-                print(f"OCR 테스트 성공! 추출된 텍스트:\n{extracted_text}")
+                self.logger.info(f"OCR 테스트 성공! 추출된 텍스트:\n{extracted_text}")
             else:
                 result['error'] = "OCR 텍스트 추출에 실패했습니다"
                 
         except Exception as e:
             result['error'] = f"OCR 테스트 오류: {str(e)}"
-            print(f"OCR 테스트 실패: {e}")
+            self.logger.error(f"OCR 테스트 실패: {e}")
         
         return result
 
@@ -1257,22 +1277,37 @@ class DentwebAutomationWorker(QThread):
         super().__init__()
         self.extractor = DentwebOCRExtractor()
         self.screenshot_coords = None
+        # 작업 엔진 밖에서 실행되므로 OCR span을 묶을 작업 ID를 직접 지정
+        self.job_id = f"ocr_{uuid.uuid4().hex[:12]}"
     
     def set_screenshot_coordinates(self, x: int, y: int, width: int, height: int):
         """스크린샷 좌표 설정"""
         self.screenshot_coords = (x, y, width, height)
     
     def run(self):
-        """워커 스레드 실행"""
+        """워커 스레드 실행 (OCR 단계 span을 이 워커의 작업으로 묶음)"""
+        with tracer.job_context(self.job_id), tracer.span('job', job_name="Dentweb OCR 추출"):
+            self._extract()
+    
+    def _extract(self):
+        """환자 정보 추출 후 결과 시그널 발생"""
         try:
-            self.status_updated.emit("Dentweb 화면에서 환자 정보를 추출하는 중...")
-            
-            # 좌표 설정 확인
-            if self.screenshot_coords:
-                x, y, width, height = self.screenshot_coords
-                patient_info = self.extractor.extract_patient_info_from_dentweb(x, y, width, height)
-            else:
-                patient_info = self.extractor.extract_patient_info_from_dentweb()
+            # 파이프라인의 화면 사용 단계(브라우저 실행 등)와 창 전환/캡처가 겹치지 않도록 같은 잠금 사용
+            desktop_lock = get_resource_lock('desktop')
+            if not desktop_lock.acquire(blocking=False):
+                self.status_updated.emit("다른 작업이 화면을 사용 중입니다. 끝나면 캡처합니다...")
+                desktop_lock.acquire()
+            try:
+                self.status_updated.emit("Dentweb 화면에서 환자 정보를 추출하는 중...")
+                
+                # 좌표 설정 확인
+                if self.screenshot_coords:
+                    x, y, width, height = self.screenshot_coords
+                    patient_info = self.extractor.extract_patient_info_from_dentweb(x, y, width, height)
+                else:
+                    patient_info = self.extractor.extract_patient_info_from_dentweb()
+            finally:
+                desktop_lock.release()
             
             if 'error' in patient_info:
                 self.error_occurred.emit(patient_info['error'])
@@ -0,0 +1,289 @@
+"""
+자동화 작업 엔진 모듈
+브라우저 자동화처럼 오래 걸리는 작업을 GUI 스레드 밖에서 순서대로 실행하고
+로그/진행률/단계 상태를 시그널로 UI에 전달
+"""
+
+import time
+import uuid
+import queue
+import logging
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from .job_store import JobStore, get_job_store
+from ..utils.tracing import tracer
+
+class JobCancelled(Exception):
+    """작업 취소 예외"""
+    pass
+
+class AutomationJob:
+    """엔진에서 실행할 자동화 작업
+
+    func(job)은 워커 스레드에서 실행되므로 위젯에 직접 접근하지 말고
+    job.log() / job.progress() / job.step_status()로 UI에 알려야 합니다.
+    반환값(딕셔너리)은 job_finished 시그널로 전달되고 작업 저장소에 결과로 기록됩니다.
+    """
+
+    STATUS_TEXTS = {
+        'queued': "대기 중",
+        'running': "실행 중...",
+        'completed': "완료",
+        'failed': "실패",
+        'cancelled': "취소됨"
+    }
+
+    def __init__(self, name: str, func: Callable[['AutomationJob'], Optional[Dict[str, Any]]],
+                 step_id: str = None, patient_data: Dict[str, Any] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.func = func
+        self.step_id = step_id
+        self.patient_data = patient_data
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.engine = None
+        self.cancel_event = threading.Event()
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+        self.cancel_callbacks = []
+
+    def log(self, message: str, level: str = "info"):
+        """UI 로그 전달"""
+        self.engine.log_message.emit(self.id, message, level)
+
+    def progress(self, value: int):
+        """진행률 전달 (0-100)"""
+        self.engine.progress_changed.emit(self.id, value)
+
+    def step_status(self, step_id: str, status: str, status_text: str = None):
+        """단계 상태 전달 (작업 저장소에도 기록)"""
+        status_text = status_text or self.STATUS_TEXTS.get(status, status)
+        self.engine.record('record_step', self.id, step_id, status, status_text)
+        self.engine.step_status_changed.emit(self.id, step_id, status, status_text)
+
+    def cancel(self):
+        """취소 요청 (실행 중이면 다음 check_cancelled() 지점에서 중단)"""
+        self.cancel_event.set()
+        self.resume_event.set()
+        for callback in list(self.cancel_callbacks):
+            try:
+                callback()
+            except Exception as e:
+                logging.getLogger('JobEngine').warning(f"취소 처리 실패: {str(e)}")
+
+    def add_cancel_callback(self, callback: Callable[[], None]):
+        """취소 시 호출할 함수 등록 (분석 대기처럼 단계 경계까지 오래 걸리는 대기를 깨우는 용도)"""
+        self.cancel_callbacks.append(callback)
+        if self.cancel_event.is_set():
+            callback()
+
+    def pause(self):
+        """일시정지 요청 (다음 check_cancelled() 지점에서 대기)"""
+        self.resume_event.clear()
+
+    def resume(self):
+        """일시정지 해제"""
+        self.resume_event.set()
+
+    def is_paused(self) -> bool:
+        """일시정지 상태 확인"""
+        return not self.resume_event.is_set()
+
+    def check_cancelled(self):
+        """단계 사이에서 호출 (일시정지 중이면 재개까지 대기, 취소 요청 시 JobCancelled)"""
+        self.resume_event.wait()
+        if self.cancel_event.is_set():
+            raise JobCancelled(f"작업이 취소되었습니다: {self.name}")
+
+    def get_duration(self) -> Optional[float]:
+        """실행 시간 (초)"""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+class JobEngine(QThread):
+    """자동화 작업 엔진 (작업 큐 + 워커 스레드)
+
+    브라우저는 한 번에 하나만 조작할 수 있으므로 작업은 제출 순서대로 하나씩 실행합니다.
+    여러 환자를 제출하면 큐에 쌓여 차례로 처리됩니다.
+    화면들은 get_job_engine()으로 같은 엔진을 공유하고, 시그널의 작업 ID로 자기 작업만 표시합니다.
+    작업/단계 상태 변화는 작업 저장소(SQLite)에 기록되어 재시작 후에도 남습니다.
+    """
+
+    # 시그널 정의
+    job_started = pyqtSignal(str)                     # 작업 ID
+    job_finished = pyqtSignal(str, dict)              # 작업 ID, 결과
+    job_failed = pyqtSignal(str, str)                 # 작업 ID, 오류 메시지
+    log_message = pyqtSignal(str, str, str)           # 작업 ID, 메시지, 레벨
+    progress_changed = pyqtSignal(str, int)           # 작업 ID, 진행률
+    step_status_changed = pyqtSignal(str, str, str, str)  # 작업 ID, 단계 ID, 상태, 상태 텍스트
+    queue_changed = pyqtSignal(int)                   # 대기/실행 중인 작업 수
+
+    def __init__(self, store: JobStore = None):
+        super().__init__()
+        self.logger = logging.getLogger('JobEngine')
+        self.store = store if store is not None else get_job_store()
+        self.job_queue = queue.Queue()
+        self.jobs = {}
+        self.current_job = None
+        self.is_stopped = False
+
+    def submit(self, job: AutomationJob) -> str:
+        """작업 추가 후 ID 반환 (엔진이 시작되지 않았으면 시작)"""
+        job.engine = self
+        self.jobs[job.id] = job
+        self.record('create_job', job.id, job.name, job.patient_data, job.created_at)
+        self.job_queue.put(job)
+        if job.step_id:
+            job.step_status(job.step_id, 'queued')
+        self.queue_changed.emit(self.active_count())
+
+        if not self.isRunning():
+            self.start()
+        return job.id
+
+    def cancel(self, job_id: str):
+        """작업 취소 요청"""
+        job = self.jobs.get(job_id)
+        if job:
+            job.cancel()
+
+    def cancel_all(self):
+        """대기/실행 중인 모든 작업 취소"""
+        for job in self.jobs.values():
+            if job.status in ('queued', 'running'):
+                job.cancel()
+
+    def pending_count(self) -> int:
+        """대기 중인 작업 수"""
+        return sum(1 for job in self.jobs.values() if job.status == 'queued')
+
+    def active_count(self) -> int:
+        """대기 중이거나 실행 중인 작업 수 (아직 끝나지 않은 작업)"""
+        return sum(1 for job in self.jobs.values() if job.status in ('queued', 'running'))
+
+    def is_busy(self) -> bool:
+        """실행 중이거나 대기 중인 작업이 있는지 확인"""
+        return self.current_job is not None or self.pending_count() > 0
+
+    def get_jobs(self) -> List[AutomationJob]:
+        """제출된 작업 목록 (제출 순)"""
+        return sorted(self.jobs.values(), key=lambda job: job.created_at)
+
+    def record(self, method: str, *args, **kwargs):
+        """작업 저장소 기록 (기록 실패가 자동화를 중단시키지 않도록 로그만 남김)"""
+        try:
+            getattr(self.store, method)(*args, **kwargs)
+        except Exception as e:
+            self.logger.error(f"작업 기록 실패 ({method}): {str(e)}")
+
+    def stop(self, wait_ms: int = 10000) -> bool:
+        """엔진 종료 (대기 작업 취소, 실행 중 작업은 단계 경계에서 중단)
+
+        워커 스레드가 wait_ms 안에 끝나면 True, 아직 작업을 실행 중이면 False를 반환합니다.
+        False인 경우 작업이 쓰는 브라우저를 다른 스레드에서 건드리면 안 됩니다.
+        """
+        self.is_stopped = True
+        self.cancel_all()
+        self.job_queue.put(None)
+        if self.isRunning() and not self.wait(wait_ms):
+            job = self.current_job
+            self.logger.warning(f"작업 엔진이 {wait_ms / 1000:.0f}초 안에 종료되지 않았습니다"
+                                f"{f': {job.name}' if job else ''}")
+            return False
+        return True
+
+    def run(self):
+        """워커 스레드 실행"""
+        self.logger.info("자동화 작업 엔진 시작")
+
+        while not self.is_stopped:
+            job = self.job_queue.get()
+            if job is None:
+                break
+            self._execute(job)
+
+        self.logger.info("자동화 작업 엔진 종료")
+
+    def _execute(self, job: AutomationJob):
+        """작업 하나 실행 및 결과 시그널 발생"""
+        if job.cancel_event.is_set():
+            job.status = 'cancelled'
+            self.record('update_job', job.id, 'cancelled', finished_at=time.time(), error="실행 전 취소됨")
+            if job.step_id:
+                job.step_status(job.step_id, 'pending', "대기 중")
+            self.queue_changed.emit(self.active_count())
+            return
+
+        self.current_job = job
+        job.status = 'running'
+        job.started_at = time.time()
+        self.record('update_job', job.id, 'running', started_at=job.started_at)
+        self.queue_changed.emit(self.active_count())
+        self.job_started.emit(job.id)
+        if job.step_id:
+            job.step_status(job.step_id, 'running')
+
+        try:
+            with tracer.job_context(job.id), tracer.span('job', job_name=job.name):
+                job.result = job.func(job) or {}
+            job.status = 'completed'
+            job.finished_at = time.time()
+            self.record('update_job', job.id, 'completed', finished_at=job.finished_at, result=job.result)
+            self.logger.info(f"작업 완료: {job.name} ({job.get_duration():.1f}초)")
+            if job.step_id:
+                job.step_status(job.step_id, 'completed')
+            self.job_finished.emit(job.id, job.result)
+
+        except JobCancelled as e:
+            job.status = 'cancelled'
+            job.error = str(e)
+            job.finished_at = time.time()
+            self.record('update_job', job.id, 'cancelled', finished_at=job.finished_at, error=job.error)
+            self.logger.info(str(e))
+            if job.step_id:
+                job.step_status(job.step_id, 'pending', "대기 중")
+            self.job_failed.emit(job.id, str(e))
+
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            job.finished_at = time.time()
+            self.record('update_job', job.id, 'failed', finished_at=job.finished_at, error=job.error)
+            self.logger.error(f"작업 실패: {job.name} - {str(e)}")
+            if job.step_id:
+                job.step_status(job.step_id, 'failed')
+            self.job_failed.emit(job.id, str(e))
+
+        finally:
+            self.current_job = None
+            self.queue_changed.emit(self.active_count())
+
+# 전역 작업 엔진 (처음 사용할 때 생성, GUI 스레드에서 호출)
+_job_engine = None
+_job_engine_lock = threading.Lock()
+
+def get_job_engine() -> JobEngine:
+    """전역 작업 엔진 반환 (자동화 화면들이 같은 작업 순서와 브라우저 사용 순서를 공유)"""
+    global _job_engine
+    if _job_engine is None:
+        with _job_engine_lock:
+            if _job_engine is None:
+                _job_engine = JobEngine()
+    return _job_engine
+
+def stop_job_engine(wait_ms: int = 10000) -> bool:
+    """전역 작업 엔진 종료 (생성되지 않았으면 True, 반환값은 JobEngine.stop()과 같음)"""
+    with _job_engine_lock:
+        engine = _job_engine
+    if engine is None:
+        return True
+    return engine.stop(wait_ms)
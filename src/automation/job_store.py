@@ -0,0 +1,379 @@
+"""
+자동화 작업 저장소 모듈
+환자별 작업과 단계 상태 변화, 소요 시간, 오류, 결과 파일 경로를 SQLite(WAL 모드)에 기록하여
+재시작 후에도 재시도/통계/감사 기록으로 사용
+"""
+
+import json
+import time
+import bisect
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from ..config import config
+
+class JobStore:
+    """자동화 작업 SQLite 저장소 클래스
+
+    작업 엔진 워커 스레드와 파이프라인 풀 스레드에서 동시에 기록하므로 연결 하나를 잠금으로 보호합니다.
+    프로그램이 비정상 종료되어 대기/실행 상태로 남은 작업은 다음 실행 시 'interrupted'로 정리합니다.
+    """
+
+    FINISHED_STEP_STATUSES = ('completed', 'failed', 'skipped', 'pending')
+    RETRYABLE_STATUSES = ('failed', 'cancelled', 'interrupted')
+    FINAL_JOB_STATUSES = ('completed', 'failed', 'cancelled', 'interrupted')
+
+    # 단계 소요 시간 히스토그램 구간 상한 (초, 마지막은 그 이상)
+    LATENCY_BUCKETS = (0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300, 600)
+
+    def __init__(self, db_path: Path):
+        self.logger = logging.getLogger('JobStore')
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                patient_name TEXT,
+                registration_number TEXT,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                duration REAL,
+                error TEXT,
+                patient_data TEXT,
+                result TEXT
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_steps (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                step_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                message TEXT,
+                started_at REAL,
+                finished_at REAL,
+                duration REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_registration_number ON jobs (registration_number)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_job_steps_job_id ON job_steps (job_id, step_id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_job_steps_step_status ON job_steps (step_id, status)")
+
+        # 일별 집계 (작업/단계가 끝날 때마다 증분 갱신하여 대시보드 조회 시 이력을 다시 읽지 않음)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_stats (
+                day TEXT PRIMARY KEY,
+                completed INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                cancelled INTEGER NOT NULL DEFAULT 0,
+                interrupted INTEGER NOT NULL DEFAULT 0,
+                total_duration REAL NOT NULL DEFAULT 0,
+                timed_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_step_latency (
+                day TEXT NOT NULL,
+                step_id TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, step_id, bucket)
+            )
+        """)
+
+        # 집계 테이블이 생기기 전에 기록된 작업은 한 번만 다시 집계
+        if not self.conn.execute("SELECT 1 FROM daily_stats LIMIT 1").fetchone():
+            self.rebuild_daily_stats()
+
+        recovered = self.recover_interrupted()
+        if recovered:
+            self.logger.warning(f"비정상 종료로 중단된 작업 {recovered}건을 'interrupted'로 정리했습니다")
+
+    def create_job(self, job_id: str, name: str, patient_data: Dict[str, Any] = None,
+                   created_at: float = None, status: str = 'queued'):
+        """작업 등록"""
+        patient_data = patient_data or {}
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, name, patient_name, registration_number, status, created_at, "
+                "patient_data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, name, patient_data.get('name'), patient_data.get('registration_number'), status,
+                 created_at or time.time(), json.dumps(patient_data, ensure_ascii=False, default=str))
+            )
+
+    def update_job(self, job_id: str, status: str, started_at: float = None, finished_at: float = None,
+                   error: str = None, result: Dict[str, Any] = None):
+        """작업 상태 변경 (지정한 값만 갱신)"""
+        assignments, params = ["status = ?"], [status]
+        if started_at is not None:
+            assignments.append("started_at = ?")
+            params.append(started_at)
+        if finished_at is not None:
+            assignments.append("finished_at = ?")
+            assignments.append("duration = ? - COALESCE(started_at, ?)")
+            params.extend([finished_at, finished_at, finished_at])
+        if error is not None:
+            assignments.append("error = ?")
+            params.append(error)
+        if result is not None:
+            assignments.append("result = ?")
+            params.append(json.dumps(result, ensure_ascii=False, default=str))
+        params.append(job_id)
+
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                previous = self.conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                self.conn.execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE id = ?", params)
+
+                # 처음 종료 상태가 될 때 한 번만 일별 집계에 반영
+                if (status in self.FINAL_JOB_STATUSES and previous
+                        and previous['status'] not in self.FINAL_JOB_STATUSES):
+                    row = self.conn.execute("SELECT finished_at, duration FROM jobs WHERE id = ?",
+                                            (job_id,)).fetchone()
+                    self._add_daily_job(status, row['finished_at'] or time.time(), row['duration'])
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def _day(self, timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+    def _add_daily_job(self, status: str, finished_at: float, duration: Optional[float]):
+        """일별 작업 집계 증분 갱신 (잠금/트랜잭션 안에서 호출)"""
+        timed = 1 if status == 'completed' and duration is not None else 0
+        self.conn.execute(
+            f"INSERT INTO daily_stats (day, {status}, total_duration, timed_count) VALUES (?, 1, ?, ?) "
+            f"ON CONFLICT(day) DO UPDATE SET {status} = {status} + 1, "
+            f"total_duration = total_duration + excluded.total_duration, "
+            f"timed_count = timed_count + excluded.timed_count",
+            (self._day(finished_at), duration if timed else 0, timed)
+        )
+
+    def _add_step_latency(self, step_id: str, finished_at: float, duration: float):
+        """일별 단계 소요 시간 히스토그램 증분 갱신 (잠금/트랜잭션 안에서 호출)"""
+        bucket = bisect.bisect_left(self.LATENCY_BUCKETS, duration)
+        self.conn.execute(
+            "INSERT INTO daily_step_latency (day, step_id, bucket, count) VALUES (?, ?, ?, 1) "
+            "ON CONFLICT(day, step_id, bucket) DO UPDATE SET count = count + 1",
+            (self._day(finished_at), step_id, bucket)
+        )
+
+    def record_step(self, job_id: str, step_id: str, status: str, message: str = None,
+                    timestamp: float = None):
+        """단계 상태 변화 기록
+
+        'running'/'queued'는 새 단계 실행 행을 만들고, 완료/실패/건너뜀은 마지막 실행 행을 마감합니다.
+        """
+        timestamp = timestamp or time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT id, status FROM job_steps WHERE job_id = ? AND step_id = ? ORDER BY id DESC LIMIT 1",
+                (job_id, step_id)
+            ).fetchone()
+            open_row = row if row and row['status'] in ('queued', 'running') else None
+
+            if status in self.FINISHED_STEP_STATUSES and open_row:
+                self.conn.execute("BEGIN")
+                try:
+                    self.conn.execute(
+                        "UPDATE job_steps SET status = ?, message = ?, finished_at = ?, "
+                        "duration = ? - COALESCE(started_at, ?) WHERE id = ?",
+                        (status, message, timestamp, timestamp, timestamp, open_row['id'])
+                    )
+                    if status == 'completed':
+                        duration = self.conn.execute("SELECT duration FROM job_steps WHERE id = ?",
+                                                     (open_row['id'],)).fetchone()['duration']
+                        self._add_step_latency(step_id, timestamp, duration)
+                    self.conn.execute("COMMIT")
+                except Exception:
+                    self.conn.execute("ROLLBACK")
+                    raise
+            elif status == 'running' and open_row and open_row['status'] == 'queued':
+                self.conn.execute(
+                    "UPDATE job_steps SET status = ?, message = ?, started_at = ? WHERE id = ?",
+                    (status, message, timestamp, open_row['id'])
+                )
+            elif status == 'pending' and not open_row:
+                return
+            else:
+                started_at = timestamp if status == 'running' else None
+                finished_at = timestamp if status in self.FINISHED_STEP_STATUSES else None
+                self.conn.execute(
+                    "INSERT INTO job_steps (job_id, step_id, status, message, started_at, finished_at, duration) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, step_id, status, message, started_at, finished_at, 0 if finished_at else None)
+                )
+
+    def recover_interrupted(self) -> int:
+        """대기/실행 상태로 남은 작업과 단계를 'interrupted'로 정리 (시작 시 호출)"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                cursor = self.conn.execute(
+                    "UPDATE jobs SET status = 'interrupted', error = COALESCE(error, ?), finished_at = ? "
+                    "WHERE status IN ('queued', 'running')",
+                    ("프로그램 종료로 작업이 중단되었습니다", now)
+                )
+                for _ in range(cursor.rowcount):
+                    self._add_daily_job('interrupted', now, None)
+                self.conn.execute(
+                    "UPDATE job_steps SET status = 'interrupted', finished_at = ? "
+                    "WHERE status IN ('queued', 'running')",
+                    (now,)
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    def _row_to_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['patient_data'] = json.loads(job['patient_data']) if job['patient_data'] else {}
+        job['result'] = json.loads(job['result']) if job['result'] else {}
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 조회"""
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, status: str = None, since: float = None, until: float = None,
+                  registration_number: str = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """작업 목록 조회 (최신순)"""
+        conditions, params = [], []
+        for clause, value in (("status = ?", status), ("created_at >= ?", since),
+                              ("created_at < ?", until), ("registration_number = ?", registration_number)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+
+        sql = "SELECT * FROM jobs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY created_at DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def get_steps(self, job_id: str) -> List[Dict[str, Any]]:
+        """작업의 단계 기록 (발생 순)"""
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM job_steps WHERE job_id = ? ORDER BY id", (job_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_retryable_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """재시도 대상 작업 (실패/취소/중단, 환자 정보 포함)
+
+        같은 환자(등록번호)의 더 최근 작업이 있으면 이미 다시 처리한 것이므로 제외합니다.
+        """
+        placeholders = ", ".join("?" for _ in self.RETRYABLE_STATUSES)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM jobs AS job WHERE status IN ({placeholders}) "
+                "AND NOT EXISTS (SELECT 1 FROM jobs AS newer WHERE newer.registration_number = job.registration_number "
+                "AND newer.created_at > job.created_at) "
+                "ORDER BY created_at DESC LIMIT ?",
+                (*self.RETRYABLE_STATUSES, limit)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def rebuild_daily_stats(self):
+        """작업/단계 기록 전체로 일별 집계 재생성"""
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.execute("DELETE FROM daily_stats")
+                self.conn.execute("DELETE FROM daily_step_latency")
+                placeholders = ", ".join("?" for _ in self.FINAL_JOB_STATUSES)
+                for row in self.conn.execute(
+                        f"SELECT status, finished_at, duration FROM jobs WHERE status IN ({placeholders}) "
+                        "AND finished_at IS NOT NULL", self.FINAL_JOB_STATUSES).fetchall():
+                    self._add_daily_job(row['status'], row['finished_at'], row['duration'])
+                for row in self.conn.execute(
+                        "SELECT step_id, finished_at, duration FROM job_steps "
+                        "WHERE status = 'completed' AND duration IS NOT NULL").fetchall():
+                    self._add_step_latency(row['step_id'], row['finished_at'], row['duration'])
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def count_active(self) -> int:
+        """대기/실행 중인 작업 수"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+
+    def _percentile(self, counts: Dict[int, int], ratio: float) -> Optional[float]:
+        """히스토그램 백분위 (해당 구간 상한값, 마지막 구간은 최대 구간 상한)"""
+        total = sum(counts.values())
+        if not total:
+            return None
+        threshold = total * ratio
+        cumulative = 0
+        for bucket in sorted(counts):
+            cumulative += counts[bucket]
+            if cumulative >= threshold:
+                return float(self.LATENCY_BUCKETS[min(bucket, len(self.LATENCY_BUCKETS) - 1)])
+        return float(self.LATENCY_BUCKETS[-1])
+
+    def get_daily_stats(self, day: str = None) -> Dict[str, Any]:
+        """일별 집계 조회 (상태별 건수, 총/평균 처리 시간, 단계별 p95 소요 시간)"""
+        day = day or self._day(time.time())
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM daily_stats WHERE day = ?", (day,)).fetchone()
+            latency_rows = self.conn.execute(
+                "SELECT step_id, bucket, count FROM daily_step_latency WHERE day = ?", (day,)
+            ).fetchall()
+
+        stats = dict(row) if row else {'day': day, 'completed': 0, 'failed': 0, 'cancelled': 0,
+                                       'interrupted': 0, 'total_duration': 0.0, 'timed_count': 0}
+        stats['average_duration'] = (stats['total_duration'] / stats['timed_count']
+                                     if stats['timed_count'] else None)
+
+        histograms = {}
+        for latency in latency_rows:
+            histograms.setdefault(latency['step_id'], {})[latency['bucket']] = latency['count']
+        stats['step_p95'] = {step_id: self._percentile(counts, 0.95) for step_id, counts in histograms.items()}
+        return stats
+
+    def close(self):
+        """DB 연결 종료"""
+        with self.lock:
+            self.conn.close()
+
+_job_store = None
+_job_store_lock = threading.Lock()
+
+def get_job_store() -> JobStore:
+    """전역 작업 저장소 반환 (최초 호출 시 설정 폴더의 jobs.db 생성)"""
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                _job_store = JobStore(Path(config.app_dir) / "data" / "jobs.db")
+    return _job_store
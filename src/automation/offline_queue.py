@@ -0,0 +1,214 @@
+"""
+오프라인 큐 모듈
+네트워크 장애 시 Airtable 작업을 SQLite(WAL 모드)에 보관하고 항목별로 처리 완료를 기록
+"""
+
+import json
+import uuid
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+class OfflineQueue:
+    """SQLite 기반 내구성 오프라인 큐 클래스
+
+    항목 추가는 행 하나 INSERT(O(1))이며, 처리 결과는 항목별로 ack/nack 합니다.
+    merge_key를 주면 같은 키로 대기 중인 항목에 내용을 병합하고(revision 증가),
+    전송 중에 병합된 항목은 ack해도 삭제하지 않아 병합된 내용으로 다시 전송됩니다.
+    재시도 한도를 넘은 항목은 삭제하지 않고 'dead' 상태로 보관합니다.
+    """
+
+    def __init__(self, db_path: Path, legacy_json_path: Optional[Path] = None):
+        self.logger = logging.getLogger('AirtableSync')
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+
+        # 여러 스레드(동기화 워커 등)에서 공유하므로 잠금으로 직렬화
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS queue (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                action_type TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                retry_count INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                merge_key TEXT,
+                revision INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        # 병합 키가 없던 이전 버전 DB
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(queue)")}
+        if 'merge_key' not in columns:
+            self.conn.execute("ALTER TABLE queue ADD COLUMN merge_key TEXT")
+        if 'revision' not in columns:
+            self.conn.execute("ALTER TABLE queue ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_queue_status_seq ON queue (status, seq)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_queue_merge_key ON queue (merge_key)")
+
+        if legacy_json_path:
+            self._migrate_legacy_json(Path(legacy_json_path))
+
+    def enqueue(self, action_type: str, data: Dict[str, Any], merge_key: str = None) -> str:
+        """작업 추가 후 ID 반환 (merge_key가 같은 대기 항목이 있으면 그 항목에 병합)"""
+        with self.lock:
+            if merge_key:
+                merged_id = self._merge_into_pending(action_type, merge_key, data)
+                if merged_id:
+                    return merged_id
+
+            item_id = f"{action_type}_{uuid.uuid4().hex}"
+            self.conn.execute(
+                "INSERT INTO queue (id, action_type, data, created_at, merge_key) VALUES (?, ?, ?, ?, ?)",
+                (item_id, action_type, json.dumps(data, ensure_ascii=False), datetime.now().isoformat(), merge_key)
+            )
+        return item_id
+
+    def merge_pending(self, action_type: str, merge_key: str, data: Dict[str, Any]) -> Optional[str]:
+        """같은 merge_key로 대기 중인 항목이 있을 때만 병합 (병합한 항목 ID, 없으면 None)"""
+        with self.lock:
+            return self._merge_into_pending(action_type, merge_key, data)
+
+    def _merge_into_pending(self, action_type: str, merge_key: str, data: Dict[str, Any]) -> Optional[str]:
+        """대기 항목에 병합 (잠금 상태에서 호출)"""
+        row = self.conn.execute(
+            "SELECT id, data FROM queue WHERE status = 'pending' AND action_type = ? AND merge_key = ? "
+            "ORDER BY seq DESC LIMIT 1", (action_type, merge_key)
+        ).fetchone()
+        if not row:
+            return None
+        merged = self._merge_data(json.loads(row['data']), data)
+        self.conn.execute(
+            "UPDATE queue SET data = ?, revision = revision + 1 WHERE id = ?",
+            (json.dumps(merged, ensure_ascii=False), row['id'])
+        )
+        return row['id']
+
+    def _merge_data(self, current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        """대기 항목 내용 병합 (딕셔너리 값은 키 단위로 갱신, 나중 값 우선)"""
+        merged = dict(current)
+        for key, value in update.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = {**merged[key], **value}
+            else:
+                merged[key] = value
+        return merged
+
+    def peek(self, limit: int = 50, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """처리 대기 중인 작업을 오래된 순으로 조회 (큐에서 제거하지 않음)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM queue WHERE status = 'pending' AND seq > ? ORDER BY seq LIMIT ?",
+                (after_seq, limit)
+            ).fetchall()
+        return [self._row_to_item(row) for row in rows]
+
+    def ack(self, item_id: str, revision: int = None) -> bool:
+        """처리 완료된 작업 삭제 (revision을 주면 전송 후 병합된 항목은 남겨 다시 전송, 삭제했으면 True)"""
+        with self.lock:
+            if revision is None:
+                cursor = self.conn.execute("DELETE FROM queue WHERE id = ?", (item_id,))
+            else:
+                cursor = self.conn.execute("DELETE FROM queue WHERE id = ? AND revision = ?", (item_id, revision))
+        return cursor.rowcount > 0
+
+    def nack(self, item_id: str, error: str, max_retries: int = 3) -> bool:
+        """처리 실패 기록 (재시도 가능하면 True, 한도 초과로 보관 처리되면 False)"""
+        with self.lock:
+            self.conn.execute(
+                "UPDATE queue SET retry_count = retry_count + 1, last_error = ?, "
+                "status = CASE WHEN retry_count + 1 >= ? THEN 'dead' ELSE 'pending' END WHERE id = ?",
+                (error, max_retries, item_id)
+            )
+            row = self.conn.execute("SELECT status FROM queue WHERE id = ?", (item_id,)).fetchone()
+        return bool(row) and row['status'] == 'pending'
+
+    def size(self) -> int:
+        """처리 대기 중인 작업 수"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM queue WHERE status = 'pending'").fetchone()[0]
+
+    def dead_count(self) -> int:
+        """재시도 한도를 넘어 보관 중인 작업 수"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM queue WHERE status = 'dead'").fetchone()[0]
+
+    def oldest_created_at(self) -> Optional[datetime]:
+        """가장 오래된 대기 작업의 생성 시각"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT created_at FROM queue WHERE status = 'pending' ORDER BY seq LIMIT 1"
+            ).fetchone()
+        return datetime.fromisoformat(row['created_at']) if row else None
+
+    def compact(self, dead_retention_days: int = 30) -> int:
+        """오래된 실패 작업 삭제 및 WAL/DB 파일 정리 (삭제한 작업 수 반환)"""
+        cutoff = (datetime.now() - timedelta(days=dead_retention_days)).isoformat()
+        with self.lock:
+            removed = self.conn.execute(
+                "DELETE FROM queue WHERE status = 'dead' AND created_at < ?", (cutoff,)
+            ).rowcount
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.execute("VACUUM")
+
+        if removed:
+            self.logger.info(f"오프라인 큐 정리: 오래된 실패 작업 {removed}개 삭제")
+        return removed
+
+    def close(self):
+        """DB 연결 종료"""
+        with self.lock:
+            self.conn.close()
+
+    def _row_to_item(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """DB 행을 기존 오프라인 큐 항목 형식으로 변환"""
+        return {
+            'seq': row['seq'],
+            'id': row['id'],
+            'action_type': row['action_type'],
+            'data': json.loads(row['data']),
+            'timestamp': row['created_at'],
+            'retry_count': row['retry_count'],
+            'last_error': row['last_error'],
+            'revision': row['revision']
+        }
+
+    def _migrate_legacy_json(self, legacy_path: Path):
+        """기존 offline_queue.json 항목을 한 번만 가져온 뒤 파일 이름 변경"""
+        if not legacy_path.exists():
+            return
+
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                legacy_items = json.load(f)
+
+            with self.lock:
+                self.conn.execute("BEGIN")
+                for item in legacy_items:
+                    self.conn.execute(
+                        "INSERT INTO queue (id, action_type, data, created_at, retry_count, last_error) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (f"{item['action_type']}_{uuid.uuid4().hex}", item['action_type'],
+                         json.dumps(item['data'], ensure_ascii=False),
+                         item.get('timestamp', datetime.now().isoformat()),
+                         item.get('retry_count', 0), item.get('last_error'))
+                    )
+                self.conn.execute("COMMIT")
+
+            legacy_path.rename(legacy_path.with_suffix('.json.migrated'))
+            self.logger.info(f"기존 오프라인 큐 {len(legacy_items)}개 항목을 SQLite 큐로 이전했습니다")
+
+        except Exception as e:
+            with self.lock:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+            self.logger.error(f"기존 오프라인 큐 이전 실패: {str(e)}")
@@ -0,0 +1,368 @@
+"""
+자동화 파이프라인 모듈
+환자 한 명의 처리 과정을 단계 의존 관계(DAG)로 정의하고,
+의존 단계가 끝난 단계는 동시에 실행 (같은 자원을 쓰는 단계는 순서대로 실행)
+"""
+
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Iterable
+
+from ..config import config
+from .job_engine import AutomationJob, JobCancelled
+from ..utils.tracing import tracer
+
+# 자원 이름 → 잠금 (browser: WebCeph 브라우저, desktop: Dentweb 화면/마우스)
+# 파이프라인 인스턴스와 무관하게 공유하여 다른 환자의 파이프라인이나 OCR 작업과도 겹치지 않게 함
+_resource_locks = {}
+_resource_locks_lock = threading.Lock()
+
+def get_resource_lock(resource: str) -> threading.Lock:
+    """자원별 전역 잠금 반환 (처음 요청 시 생성)"""
+    with _resource_locks_lock:
+        lock = _resource_locks.get(resource)
+        if lock is None:
+            lock = _resource_locks[resource] = threading.Lock()
+        return lock
+
+class PipelineStep:
+    """파이프라인 단계 정의
+
+    func(context)는 완료 메시지를 반환하고 실패 시 예외를 발생시킵니다.
+    when(context)가 False이면 단계를 건너뛰며, 건너뛴 단계도 의존 관계상 완료로 간주합니다.
+    resource가 같은 단계들은 동시에 실행되지 않습니다.
+    """
+
+    def __init__(self, step_id: str, name: str, func: Callable[['PipelineContext'], Optional[str]],
+                 depends_on: Iterable[str] = (), resource: str = None,
+                 when: Callable[['PipelineContext'], bool] = None, description: str = ""):
+        self.id = step_id
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.resource = resource
+        self.when = when
+        self.description = description
+
+class PipelineContext:
+    """단계 간 공유 데이터 (환자 정보, 이미지, 자동화 객체, 단계 결과)"""
+
+    def __init__(self, patient_data: Dict[str, Any] = None, images: Dict[str, Any] = None,
+                 automation=None, airtable=None, ocr_extractor=None):
+        self.patient_data = patient_data or {}
+        self.images = images or {}
+        self.automation = automation
+        self.airtable = airtable
+        self.ocr_extractor = ocr_extractor
+        self.results = {}
+        self.job = None
+
+    def log(self, message: str, level: str = "info"):
+        """실행 중인 작업 로그로 전달"""
+        if self.job:
+            self.job.log(message, level)
+
+class Pipeline:
+    """단계 DAG 실행기
+
+    run()은 작업 엔진의 작업(AutomationJob) 안에서 호출합니다.
+    일시정지/중단은 단계 경계에서 적용되며(실행 중인 단계는 끝까지 진행),
+    완료/건너뛴 단계는 다시 실행하지 않으므로 같은 파이프라인으로 이어서 실행할 수 있습니다.
+    """
+
+    def __init__(self, steps: List[PipelineStep], context: PipelineContext, max_workers: int = 3):
+        self.steps = {step.id: step for step in steps}
+        self.order = [step.id for step in steps]
+        self.context = context
+        self.max_workers = max_workers
+        self.status = {step.id: 'pending' for step in steps}
+        self.messages = {}
+        # 자원 잠금은 모듈 전역이므로 여러 파이프라인(및 OCR 작업)이 같은 브라우저/화면을 동시에 쓰지 않음
+        self.resource_locks = {step.resource: get_resource_lock(step.resource) for step in steps if step.resource}
+
+        for step in steps:
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise Exception(f"알 수 없는 의존 단계: {step.id} → {dependency}")
+
+    def get_steps(self) -> List[PipelineStep]:
+        """정의 순서대로 단계 목록"""
+        return [self.steps[step_id] for step_id in self.order]
+
+    def _collect(self, targets: Iterable[str] = None) -> List[str]:
+        """실행할 단계 (대상 단계와 그 의존 단계, 정의 순서)"""
+        if not targets:
+            return list(self.order)
+
+        needed = set()
+        stack = list(targets)
+        while stack:
+            step_id = stack.pop()
+            if step_id in needed:
+                continue
+            if step_id not in self.steps:
+                raise Exception(f"알 수 없는 단계: {step_id}")
+            needed.add(step_id)
+            stack.extend(self.steps[step_id].depends_on)
+        return [step_id for step_id in self.order if step_id in needed]
+
+    def _is_done(self, step_id: str) -> bool:
+        return self.status[step_id] in ('completed', 'skipped')
+
+    def _recycle_browser(self):
+        """브라우저 단계 경계: 메모리 한도를 넘었으면 재시작 후 세션 복원 (분석 대기처럼 긴 단계 이후 포함)"""
+        automation = self.context.automation
+        if automation is None or not getattr(automation, 'driver', None):
+            return
+        if automation.recycle_browser_if_needed(restore_session=True):
+            self.context.log("♻️ 브라우저 메모리 한도를 넘어 브라우저를 재시작했습니다", "warning")
+
+    def _run_step(self, step: PipelineStep) -> Optional[str]:
+        """단계 실행 (자원 잠금 포함, 풀 스레드에서 실행)"""
+        with tracer.job_context(self.context.job.id):
+            if step.resource:
+                with self.resource_locks[step.resource]:
+                    if step.resource == 'browser':
+                        self._recycle_browser()
+                    with tracer.span(f"pipeline.{step.id}"):
+                        return step.func(self.context)
+            with tracer.span(f"pipeline.{step.id}"):
+                return step.func(self.context)
+
+    def run(self, job: AutomationJob, targets: Iterable[str] = None,
+            progress_range: tuple = (0, 100)) -> Dict[str, Any]:
+        """파이프라인 실행 (실패 시 예외, 완료 시 단계 결과 반환)"""
+        self.context.job = job
+        automation = self.context.automation
+        if automation is not None:
+            # 작업 취소 시 분석 완료/다운로드 대기를 단계 경계까지 기다리지 않고 깨움
+            automation.interrupt_event.clear()
+            job.add_cancel_callback(automation.interrupt)
+        step_ids = self._collect(targets)
+        pending = [step_id for step_id in step_ids if not self._is_done(step_id)]
+        total = len(step_ids)
+        start, end = progress_range
+
+        running = {}
+        error = None
+        cancelled = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='Pipeline') as executor:
+            while pending or running:
+                # 단계 경계: 일시정지 대기 / 중단 확인
+                if error is None and cancelled is None:
+                    try:
+                        job.check_cancelled()
+                    except JobCancelled as e:
+                        cancelled = e
+
+                if error is None and cancelled is None:
+                    for step_id in list(pending):
+                        step = self.steps[step_id]
+                        if not all(self._is_done(dependency) for dependency in step.depends_on):
+                            continue
+
+                        pending.remove(step_id)
+                        if step.when and not step.when(self.context):
+                            self.status[step_id] = 'skipped'
+                            job.step_status(step_id, 'skipped', "건너뜀")
+                            continue
+
+                        self.status[step_id] = 'running'
+                        job.step_status(step_id, 'running')
+                        job.log(f"{step.name} 시작", "info")
+                        running[executor.submit(self._run_step, step)] = step
+
+                if not running:
+                    if pending and error is None and cancelled is None:
+                        # 건너뛴 단계만 남은 것이 아니라면 의존 관계를 만족할 수 없는 상태
+                        error = Exception(f"실행할 수 없는 단계가 남았습니다: {', '.join(pending)}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        message = future.result() or f"{step.name} 완료"
+                        self.status[step.id] = 'completed'
+                        self.messages[step.id] = message
+                        job.step_status(step.id, 'completed', message)
+                        job.log(message, "success")
+                    except Exception as e:
+                        self.status[step.id] = 'failed'
+                        self.messages[step.id] = str(e)
+                        job.step_status(step.id, 'failed', str(e))
+                        job.log(f"{step.name} 실패: {str(e)}", "error")
+                        if error is None:
+                            error = Exception(f"{step.name} 실패: {str(e)}")
+
+                completed = sum(1 for step_id in step_ids if self._is_done(step_id))
+                job.progress(start + int((end - start) * completed / total) if total else end)
+
+        if error:
+            raise error
+        if cancelled:
+            raise cancelled
+
+        return dict(self.context.results)
+
+# ---- 환자 처리 단계 ----
+
+def _extract_patient_info(context: PipelineContext) -> str:
+    """Dentweb 화면 OCR로 환자 정보 추출"""
+    patient_info = context.ocr_extractor.extract_patient_info_from_dentweb()
+    if 'error' in patient_info:
+        raise Exception(patient_info['error'])
+    context.patient_data = patient_info
+    return f"환자 정보 추출 완료: {patient_info.get('name', '')}"
+
+def _launch_browser(context: PipelineContext) -> str:
+    context.automation.initialize_browser()
+    return "브라우저가 성공적으로 실행되었습니다"
+
+def _login(context: PipelineContext) -> str:
+    username, password = config.get_credentials()
+    if not username or not password:
+        raise Exception("WebCeph 로그인 정보가 설정되지 않았습니다. 설정 탭에서 확인해주세요.")
+    context.log(f"🔐 WebCeph 로그인을 시작합니다... (사용자: {username})", "info")
+    context.automation.login(username, password)
+    return "로그인이 완료되었습니다"
+
+def _register_patient(context: PipelineContext) -> str:
+    """신규 환자 생성 → 자동 감지/선택 → 레코드 생성"""
+    automation = context.automation
+    patient_data = context.patient_data
+
+    context.log("🖱️ 신규 환자 입력 버튼을 클릭합니다...", "info")
+    automation.click_new_patient_button()
+    context.log("📝 신규 환자 폼을 자동으로 작성합니다...", "info")
+    automation.fill_patient_form(patient_data)
+
+    context.log("🔍 방금 생성된 신규 환자를 자동으로 감지합니다...", "info")
+    if not automation.detect_and_select_new_patient(patient_data):
+        context.log("⚠️ 신규 환자 자동 선택 실패 - 수동으로 환자를 선택해주세요", "warning")
+        return "환자 등록 완료 (자동 선택 실패)"
+
+    latest_id = automation.get_latest_patient_id()
+    if latest_id:
+        context.results['web_ceph_id'] = latest_id
+        context.log(f"🆔 선택된 환자 ID: {latest_id}", "success")
+
+    if not automation.create_patient_record(patient_data):
+        context.log("⚠️ 레코드 생성 실패 - 수동으로 진행해주세요", "warning")
+        return "환자 등록 완료 (레코드 생성 실패)"
+
+    automation.setup_record_info(patient_data)
+    if not automation.confirm_record_creation():
+        context.log("⚠️ 레코드 생성 확인 실패", "warning")
+    elif not automation.wait_for_record_ready():
+        context.log("⚠️ 이미지 업로드 준비 상태 확인 실패", "warning")
+    return f"환자 '{patient_data.get('name', '')}' 등록 및 레코드 생성 완료"
+
+def _upload_images(context: PipelineContext) -> str:
+    context.automation.upload_images(context.images)
+    return "모든 이미지가 성공적으로 업로드되었습니다"
+
+def _start_analysis(context: PipelineContext) -> str:
+    context.automation.start_analysis()
+    return "분석이 시작되었습니다"
+
+def _wait_analysis(context: PipelineContext) -> str:
+    context.automation.wait_for_analysis_completion()
+    return "분석이 완료되었습니다"
+
+def _download_pdf(context: PipelineContext) -> str:
+    pdf_path = context.automation.download_pdf(context.patient_data)
+    context.results['pdf_path'] = pdf_path
+    return f"PDF 파일이 다운로드되었습니다: {pdf_path}"
+
+def _airtable_worker():
+    """공유 Airtable 동기화 워커 (실행 중이 아니면 시작)"""
+    from .airtable_sync_worker import get_sync_worker
+    worker = get_sync_worker()
+    worker.ensure_running()
+    return worker
+
+def _create_airtable_record(context: PipelineContext) -> str:
+    """Airtable 환자/세션 레코드 저장 요청 (전송은 동기화 워커가 수행하므로 바로 반환)"""
+    # 재실행해도 같은 세션 레코드를 갱신하도록 세션 ID는 한 번만 생성
+    session_data = {
+        'session_id': context.results.setdefault(
+            'session_id', f"SES_{datetime.now().strftime('%Y%m%d')}_{uuid.uuid4().hex[:12].upper()}"),
+        'image_count': sum(1 for path in context.images.values() if path),
+        'operator': config.get('general', 'operator_name', '시스템')
+    }
+    try:
+        _airtable_worker().submit_patient_record(context.patient_data, session_data)
+    except Exception as e:
+        # 레코드 저장 실패로 브라우저 작업을 중단하지 않음
+        context.log(f"⚠️ Airtable 레코드 저장 요청 실패: {str(e)}", "warning")
+        return "Airtable 레코드 저장 보류"
+    return "Airtable 레코드 저장을 전송 대기열에 추가했습니다"
+
+def _sync_airtable(context: PipelineContext) -> str:
+    """분석 결과 저장 요청 (session_id 기준, 레코드 저장이 아직 대기 중이면 같은 작업에 병합)"""
+    analysis_result = {
+        'pdf_path': context.results.get('pdf_path'),
+        'web_ceph_id': context.results.get('web_ceph_id')
+    }
+    _airtable_worker().submit_analysis_result(context.results['session_id'], analysis_result)
+    return "분석 결과 저장을 Airtable 전송 대기열에 추가했습니다"
+
+def _has_images(context: PipelineContext) -> bool:
+    return any(context.images.values())
+
+def _airtable_enabled(context: PipelineContext) -> bool:
+    return bool(context.airtable and context.airtable.api_key and context.airtable.base_id)
+
+def patient_pipeline_steps() -> List[PipelineStep]:
+    """환자 처리 단계 정의
+
+    ocr_extraction ─┬──────────────────────────── airtable_create ─────────────────┐
+    browser_launch → login → patient_register → image_upload → analysis_start →   │
+                     analysis_wait → pdf_download ──────────────────────────── airtable_sync
+    (OCR과 브라우저 실행은 화면을 함께 쓰므로 'desktop' 자원으로 순서대로 실행)
+    """
+    return [
+        PipelineStep('ocr_extraction', "OCR 환자 정보 추출", _extract_patient_info,
+                     resource='desktop', when=lambda ctx: not ctx.patient_data,
+                     description="Dentweb 화면에서 환자 정보를 추출합니다"),
+        PipelineStep('browser_launch', "브라우저 실행", _launch_browser,
+                     resource='desktop', description="Chrome 브라우저를 실행합니다"),
+        PipelineStep('login', "Web Ceph 로그인", _login, depends_on=['browser_launch'],
+                     resource='browser', description="Web Ceph 웹사이트에 로그인합니다"),
+        PipelineStep('patient_register', "환자 등록", _register_patient,
+                     depends_on=['ocr_extraction', 'login'], resource='browser',
+                     description="새 환자 정보를 등록합니다"),
+        PipelineStep('image_upload', "이미지 업로드", _upload_images, depends_on=['patient_register'],
+                     resource='browser', when=_has_images, description="X-ray와 얼굴 사진을 업로드합니다"),
+        PipelineStep('analysis_start', "분석 시작", _start_analysis, depends_on=['image_upload'],
+                     resource='browser', when=_has_images, description="자동 분석을 시작합니다"),
+        PipelineStep('analysis_wait', "분석 대기", _wait_analysis, depends_on=['analysis_start'],
+                     resource='browser', when=_has_images, description="분석 완료까지 대기합니다"),
+        PipelineStep('pdf_download', "PDF 다운로드", _download_pdf, depends_on=['analysis_wait'],
+                     resource='browser', when=_has_images, description="분석 결과를 다운로드합니다"),
+        PipelineStep('airtable_create', "Airtable 레코드 생성", _create_airtable_record,
+                     depends_on=['ocr_extraction'], when=_airtable_enabled,
+                     description="환자 정보를 Airtable에 저장합니다"),
+        PipelineStep('airtable_sync', "Airtable 동기화", _sync_airtable,
+                     depends_on=['pdf_download', 'airtable_create'],
+                     when=lambda ctx: _airtable_enabled(ctx) and bool(ctx.results.get('session_id')),
+                     description="분석 결과를 Airtable에 저장합니다")
+    ]
+
+def build_patient_pipeline(context: PipelineContext) -> Pipeline:
+    """환자 처리 파이프라인 생성 (자동화 객체가 없으면 생성)"""
+    if context.automation is None:
+        from .web_ceph_automation import WebCephAutomation
+        context.automation = WebCephAutomation()
+    if context.airtable is None:
+        from .airtable_sync import get_airtable_sync
+        context.airtable = get_airtable_sync()
+    if context.ocr_extractor is None and not context.patient_data:
+        from .dentweb_automation import DentwebOCRExtractor
+        context.ocr_extractor = DentwebOCRExtractor()
+
+    return Pipeline(patient_pipeline_steps(), context)
@@ -34,6 +34,7 @@ Author: Web Ceph Auto Team
 import os
 import time
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime
 from selenium import webdriver
@@ -45,79 +46,323 @@ from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import (TimeoutException, NoSuchElementException, 
                                        WebDriverException, ElementNotInteractableException)
 from webdriver_manager.chrome import ChromeDriverManager
+from PIL import Image
 
 from ..config import config
+from ..utils.image_transcoder import image_transcoder
+from ..utils.tracing import traced
+from .browser_supervisor import browser_supervisor
 
 class WebCephAutomation:
     """Web Ceph 자동화 클래스"""
-    
+
+    # 이미지 타입별 파일 입력 선택자 및 업로드 가능한 확장자
+    UPLOAD_SELECTORS = {
+        'xray': "//input[@type='file' and contains(@name, 'xray')]",
+        'face': "//input[@type='file' and contains(@name, 'photo')]"
+    }
+    UPLOAD_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+    UPLOAD_SUCCESS_XPATH = "//*[contains(@class, 'upload-success') or contains(@class, 'thumbnail')] | //img[contains(@src, 'thumb')]"
+    UPLOAD_ERROR_XPATH = "//*[contains(@class, 'upload-error') or contains(@class, 'error-message')]"
+
     def __init__(self):
         self.driver = None
         self.wait = None
         self.logger = self._setup_logger()
         self.config = config
         
-        # 설정값 로드
-        self.timeout = int(self.config.get('webceph', 'timeout', '15'))  # 30초 → 15초로 단축
-        self.retry_count = int(self.config.get('webceph', 'retry_count', '3'))
-        self.wait_time = int(self.config.get('automation', 'wait_time', '1'))  # 3초 → 1초로 단축
-        
+        # 브라우저 프로필 (default: 전체 로드, fast: eager 로드 + 불필요한 요청 차단)
+        # 프로필/헤드리스 여부는 실행 중인 브라우저와 맞아야 하므로 생성 시점 값 유지
+        self.browser_profile = self.config.get('browser', 'profile', 'default')
+
+        # 헤드리스 모드 (창 없이 실행, 무인 배치 실행용)
+        self.headless = self.config.get_bool('browser', 'headless', False)
+
+        # 페이지 이동별 소요 시간 기록
+        self.navigation_timings = []
+
+        # 작업 중 브라우저 메모리(RSS) 측정 기록
+        self.memory_samples = []
+
+        # 현재 브라우저에서 로그인했는지 (브라우저 재시작 후 세션 복원용)
+        self.logged_in = False
+
+        # 긴 대기(분석 완료/다운로드) 중단 요청 (작업 취소/앱 종료 시 다른 스레드에서 설정)
+        self.interrupt_event = threading.Event()
+
+    def interrupt(self):
+        """진행 중인 대기 루프 중단 요청 (어느 스레드에서 호출해도 됨)"""
+        self.interrupt_event.set()
+
     def _setup_logger(self):
-        """로거 설정"""
+        """로거 설정 (파일 기록은 로그 파이프라인이 automation.log로 분리)"""
         logger = logging.getLogger('WebCephAutomation')
         logger.setLevel(logging.INFO)
-        
-        if not logger.handlers:
-            # 파일 핸들러
-            log_dir = Path.home() / "AppData" / "Local" / "WebCephAuto" / "logs"
-            log_dir.mkdir(parents=True, exist_ok=True)
-            
-            log_file = log_dir / f"automation_{datetime.now().strftime('%Y%m%d')}.log"
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.INFO)
-            
-            # 포맷터
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
-        
         return logger
-    
+
+    # 대기 시간/재시도 설정은 설정 스냅샷에서 읽어 실행 중 변경도 바로 반영
+    @property
+    def timeout(self) -> int:
+        """요소 대기 시간 (초)"""
+        return self.config.snapshot.webceph_timeout
+
+    @property
+    def retry_count(self) -> int:
+        """재시도 횟수"""
+        return self.config.snapshot.webceph_retry_count
+
+    @property
+    def wait_time(self) -> int:
+        """페이지 이동 후 대기 시간 (초)"""
+        return self.config.snapshot.wait_time
+
+    @property
+    def max_rss_mb(self) -> int:
+        """브라우저 메모리 한도 (초과 시 다음 로그인 전에 브라우저 재시작)"""
+        return self.config.snapshot.max_rss_mb
+
+    def _is_fast_profile(self):
+        """고속 브라우저 프로필 사용 여부"""
+        return self.browser_profile == 'fast'
+
+    def _get_blocked_url_patterns(self):
+        """차단할 URL 패턴 목록 (쉼표 구분 설정값)"""
+        patterns = self.config.get('browser', 'blocked_urls', '') or ''
+        return [pattern.strip() for pattern in patterns.split(',') if pattern.strip()]
+
+    def _get_window_size(self):
+        """헤드리스 모드 창 크기 (설정값 'width,height')"""
+        try:
+            width, height = self.config.get('browser', 'window_size', '1920,1080').split(',')
+            return int(width), int(height)
+        except (ValueError, AttributeError):
+            return 1920, 1080
+
+    def _build_chrome_options(self):
+        """Chrome 옵션 생성 (브라우저 프로필 및 헤드리스 모드 반영)"""
+        chrome_options = Options()
+        if self.headless:
+            # 헤드리스는 최대화할 화면이 없으므로 레이아웃이 바뀌지 않도록 창 크기 고정
+            width, height = self._get_window_size()
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument(f"--window-size={width},{height}")
+        else:
+            chrome_options.add_argument("--start-maximized")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_argument("--disable-web-security")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+
+        # Chrome은 마지막 --disable-features 인자만 적용하므로 한 번에 전달
+        disabled_features = ["VizDisplayCompositor"]
+
+        if self._is_fast_profile():
+            # DOMContentLoaded 시점에 제어 반환 (이미지/폰트 등 하위 리소스 대기 안 함)
+            chrome_options.page_load_strategy = 'eager'
+
+            # 불필요한 Chrome 백그라운드 서비스 비활성화
+            for argument in ("--disable-background-networking",
+                             "--disable-component-update",
+                             "--disable-sync",
+                             "--disable-default-apps",
+                             "--disable-extensions",
+                             "--disable-client-side-phishing-detection",
+                             "--disable-domain-reliability",
+                             "--metrics-recording-only",
+                             "--no-first-run",
+                             "--no-default-browser-check"):
+                chrome_options.add_argument(argument)
+            disabled_features += ["OptimizationHints", "MediaRouter", "Translate", "AutofillServerCommunication"]
+
+        if self.headless:
+            # 메모리 절감: GPU 프로세스 제거, 렌더러 프로세스 수 및 캐시 크기 제한
+            for argument in ("--disable-gpu",
+                             "--renderer-process-limit=2",
+                             "--disk-cache-size=33554432",
+                             "--mute-audio",
+                             "--hide-scrollbars"):
+                chrome_options.add_argument(argument)
+            # 단일 사이트 자동화이므로 사이트별 프로세스 분리 불필요
+            disabled_features += ["IsolateOrigins", "site-per-process", "BackForwardCache"]
+
+        chrome_options.add_argument(f"--disable-features={','.join(disabled_features)}")
+
+        # 다운로드 설정
+        pdf_folder = self._get_pdf_folder()
+
+        prefs = {
+            "download.default_directory": pdf_folder,
+            "download.prompt_for_download": False,
+            "download.directory_upgrade": True,
+            "plugins.always_open_pdf_externally": True,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_settings.popups": 0
+        }
+        chrome_options.add_experimental_option("prefs", prefs)
+
+        return chrome_options
+
+    def _apply_request_blocking(self):
+        """CDP Network.setBlockedURLs로 분석/광고/폰트 등 불필요한 요청 차단"""
+        patterns = self._get_blocked_url_patterns()
+        if not patterns:
+            return
+
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            self.logger.info(f"요청 차단 패턴 {len(patterns)}개 적용: {', '.join(patterns)}")
+        except Exception as e:
+            # 차단 실패는 치명적이지 않음 - 전체 로드로 계속 진행
+            self.logger.warning(f"요청 차단 설정 실패 (전체 로드로 진행): {str(e)}")
+
+    def _enable_headless_downloads(self):
+        """헤드리스 모드에서 PDF 다운로드 허용 (CDP Page.setDownloadBehavior)"""
+        try:
+            self.driver.execute_cdp_cmd('Page.setDownloadBehavior', {
+                'behavior': 'allow',
+                'downloadPath': self._get_pdf_folder()
+            })
+            self.logger.info("헤드리스 다운로드 경로 설정 완료")
+        except Exception as e:
+            self.logger.warning(f"헤드리스 다운로드 설정 실패 (기본 설정으로 진행): {str(e)}")
+
+    def _get_pdf_folder(self):
+        """PDF 다운로드 폴더 (없으면 생성)"""
+        pdf_folder = self.config.get('paths', 'pdf_folder')
+        if not pdf_folder:
+            pdf_folder = str(Path.home() / "Documents" / "WebCephAuto" / "Results")
+        Path(pdf_folder).mkdir(parents=True, exist_ok=True)
+        return pdf_folder
+
+    def get_browser_memory_usage(self):
+        """ChromeDriver 및 하위 Chrome 프로세스 전체 RSS (MB)"""
+        if not self.driver:
+            return None
+        return browser_supervisor.get_rss_mb(self.driver)
+
+    def recycle_browser_if_needed(self, restore_session=False):
+        """브라우저 메모리가 한도를 넘으면 재시작 (재시작했으면 True)
+
+        restore_session이 True이면 로그인 상태였던 경우 다시 로그인하고 보고 있던 페이지로 돌아갑니다
+        (파이프라인 단계 경계에서 호출).
+        """
+        if not self.driver or self.max_rss_mb <= 0:
+            return False
+
+        rss_mb = self.get_browser_memory_usage()
+        if rss_mb is None or rss_mb <= self.max_rss_mb:
+            return False
+
+        restore_url = None
+        was_logged_in = self.logged_in
+        if restore_session:
+            try:
+                restore_url = self.driver.current_url
+            except Exception:
+                restore_url = None
+
+        self.logger.warning(f"♻️ 브라우저 메모리 {rss_mb:.1f}MB가 한도 {self.max_rss_mb}MB를 초과하여 재시작합니다")
+        self.close_browser()
+        self.initialize_browser()
+
+        if restore_session and was_logged_in:
+            username, password = self.config.get_credentials()
+            if not username or not password:
+                raise Exception("브라우저 재시작 후 다시 로그인할 수 없습니다 (로그인 정보 없음)")
+            self.login(username, password)
+            if restore_url:
+                self.logger.info(f"♻️ 재시작 전 페이지로 돌아갑니다: {restore_url}")
+                self._navigate(restore_url)
+        return True
+
+    def _record_memory(self, stage):
+        """작업 단계별 브라우저 메모리 기록"""
+        rss_mb = self.get_browser_memory_usage()
+        if rss_mb is None:
+            return
+
+        self.memory_samples.append({'stage': stage, 'rss_mb': rss_mb, 'timestamp': datetime.now().isoformat()})
+        self.logger.info(f"🧠 브라우저 메모리 ({stage}): {rss_mb:.1f}MB")
+
+    def get_memory_report(self):
+        """작업별 브라우저 메모리 사용 보고"""
+        if not self.memory_samples:
+            return None
+
+        values = [sample['rss_mb'] for sample in self.memory_samples]
+        return {
+            'mode': 'headless' if self.headless else 'windowed',
+            'profile': self.browser_profile,
+            'peak_mb': max(values),
+            'average_mb': sum(values) / len(values),
+            'final_mb': values[-1],
+            'samples': list(self.memory_samples)
+        }
+
+    def _navigate(self, url=None):
+        """페이지 이동 또는 새로고침 (소요 시간 기록)
+
+        Args:
+            url: 이동할 URL (None이면 현재 페이지 새로고침)
+        """
+        action = 'refresh' if url is None else 'get'
+        target = url if url is not None else self.driver.current_url
+        started = time.perf_counter()
+        success = False
+
+        try:
+            if url is None:
+                self.driver.refresh()
+            else:
+                self.driver.get(url)
+            success = True
+        finally:
+            duration = time.perf_counter() - started
+            self.navigation_timings.append({
+                'action': action,
+                'url': target,
+                'duration': duration,
+                'profile': self.browser_profile,
+                'success': success,
+                'timestamp': datetime.now().isoformat()
+            })
+            self.logger.info(f"⏱️ 페이지 로드 ({action}, {self.browser_profile}) {duration:.2f}초: {target}"
+                             + ("" if success else " - 실패"))
+
+    def get_navigation_summary(self):
+        """페이지 이동 소요 시간 요약 (프로필별 절감 효과 확인용)"""
+        summary = {}
+        for timing in self.navigation_timings:
+            entry = summary.setdefault(timing['action'], {'count': 0, 'failed': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1
+            entry['total'] += timing['duration']
+            entry['max'] = max(entry['max'], timing['duration'])
+            if not timing['success']:
+                entry['failed'] += 1
+
+        for entry in summary.values():
+            entry['average'] = entry['total'] / entry['count'] if entry['count'] else 0.0
+
+        return {
+            'profile': self.browser_profile,
+            'navigations': len(self.navigation_timings),
+            'by_action': summary
+        }
+
+    @traced("webceph.launch")
     def initialize_browser(self):
         """브라우저 초기화 (안정성 향상 버전)"""
         try:
-            self.logger.info("브라우저를 초기화합니다...")
-            
+            self.logger.info(f"브라우저를 초기화합니다... (프로필: {self.browser_profile}, "
+                             f"{'헤드리스' if self.headless else '일반'} 모드)")
+            self.memory_samples = []
+
             # Chrome 옵션 설정 (안정성 및 호환성 향상)
-            chrome_options = Options()
-            chrome_options.add_argument("--start-maximized")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_argument("--disable-web-security")
-            chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # 다운로드 설정
-            pdf_folder = self.config.get('paths', 'pdf_folder')
-            if not pdf_folder:
-                # 기본 다운로드 폴더 설정
-                pdf_folder = str(Path.home() / "Documents" / "WebCephAuto" / "Results")
-                Path(pdf_folder).mkdir(parents=True, exist_ok=True)
-                
-            prefs = {
-                "download.default_directory": pdf_folder,
-                "download.prompt_for_download": False,
-                "download.directory_upgrade": True,
-                "plugins.always_open_pdf_externally": True,
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.default_content_settings.popups": 0
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
-            
+            chrome_options = self._build_chrome_options()
+
             # ChromeDriver 자동 다운로드 및 설정 (안정성 향상)
             try:
                 self.logger.info("Chrome 브라우저 버전을 확인하고 호환 ChromeDriver를 다운로드합니다...")
@@ -187,19 +432,32 @@ class WebCephAutomation:
             # 브라우저 실행
             self.logger.info("Chrome 브라우저 시작 중...")
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            browser_supervisor.register(self.driver)
             
             # 브라우저 설정
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             self.driver.implicitly_wait(10)
-            
+
             # WebDriverWait 설정
             self.wait = WebDriverWait(self.driver, self.timeout)
-            
-            # 초기화 검증
+
+            # 고속 프로필: 불필요한 요청 차단
+            if self._is_fast_profile():
+                self._apply_request_blocking()
+
+            # 헤드리스 모드: 다운로드 허용
+            if self.headless:
+                self._enable_headless_downloads()
+
+            # 초기화 검증 (고속 프로필은 외부 페이지 로드 없이 드라이버 응답만 확인)
             self.logger.info("브라우저 초기화 검증 중...")
-            self.driver.get("https://www.google.com")
-            time.sleep(0.5)  # 2초 → 0.5초로 단축
-            
+            if self._is_fast_profile():
+                self._navigate("about:blank")
+            else:
+                self._navigate("https://www.google.com")
+                time.sleep(0.5)  # 2초 → 0.5초로 단축
+
+            self._record_memory('초기화')
             self.logger.info("브라우저가 성공적으로 초기화되었습니다")
             return True
             
@@ -209,24 +467,26 @@ class WebCephAutomation:
             
             # 정리 작업
             if hasattr(self, 'driver') and self.driver:
-                try:
-                    self.driver.quit()
-                except:
-                    pass
+                browser_supervisor.terminate(self.driver)
                 self.driver = None
-                
+                self.wait = None
+
             raise Exception(error_msg)
     
+    @traced("webceph.login")
     def login(self, username, password):
         """Web Ceph 로그인 - 순차적 단계별 진행"""
         try:
             self.logger.info("🚀 Web Ceph 자동 로그인을 시작합니다...")
-            
+
+            # 메모리 한도를 넘은 브라우저는 새 세션 시작 전에 재시작
+            self.recycle_browser_if_needed()
+
             # Web Ceph 메인 페이지로 이동
             webceph_url = self.config.get('webceph', 'url', 'https://www.webceph.com')
             self.logger.info(f"🌐 Web Ceph 접속: {webceph_url}")
             
-            self.driver.get(webceph_url)
+            self._navigate(webceph_url)
             time.sleep(self.wait_time)
             
             # 1단계: 로그인 링크 찾기 및 클릭
@@ -247,6 +507,7 @@ class WebCephAutomation:
             login_success = self._click_login_button()
             
             if login_success:
+                self.logged_in = True
                 self.logger.info("✅ 로그인이 완료되었습니다!")
                 return True
             else:
@@ -466,6 +727,7 @@ class WebCephAutomation:
             self.logger.error(f"❌ 로그인 버튼 클릭 실패: {str(e)}")
             return False
     
+    @traced("webceph.register.open_form")
     def click_new_patient_button(self):
         """신규 환자 입력 버튼 클릭"""
         try:
@@ -510,6 +772,7 @@ class WebCephAutomation:
             self.logger.error(f"신규 환자 버튼 클릭 실패: {str(e)}")
             raise
     
+    @traced("webceph.register.fill_form")
     def fill_patient_form(self, patient_data):
         """신규 환자 폼 작성"""
         try:
@@ -883,6 +1146,7 @@ class WebCephAutomation:
             self.logger.error(f"만들기 버튼 클릭 실패: {str(e)}")
             return False
 
+    @traced("webceph.register.select_patient")
     def detect_and_select_new_patient(self, patient_data):
         """신규 생성된 환자 ID를 감지하고 선택"""
         try:
@@ -890,11 +1154,11 @@ class WebCephAutomation:
             
             # 환자 목록 페이지로 이동 (메인 대시보드나 환자 목록)
             dashboard_url = f"{self.config.get('webceph', 'url')}/dashboard"
-            self.driver.get(dashboard_url)
+            self._navigate(dashboard_url)
             time.sleep(1)  # 3초 → 1초로 단축
             
             # 페이지 새로고침으로 최신 목록 로드
-            self.driver.refresh()
+            self._navigate()
             time.sleep(1)  # 3초 → 1초로 단축
             
             # 새로 생성된 환자 정보로 검색할 키워드들
@@ -1135,6 +1399,7 @@ class WebCephAutomation:
             self.logger.warning(f"로그인 성공 확인 중 오류: {str(e)}")
             return False
     
+    @traced("webceph.register")
     def register_patient(self, patient_data):
         """환자 등록"""
         try:
@@ -1143,7 +1408,7 @@ class WebCephAutomation:
             # 새 환자 등록 페이지로 이동
             # 실제 Web Ceph의 환자 등록 URL을 사용해야 함
             new_patient_url = f"{self.config.get('webceph', 'url')}/patients/new"
-            self.driver.get(new_patient_url)
+            self._navigate(new_patient_url)
             time.sleep(self.wait_time)
             
             # 환자 정보 입력
@@ -1258,61 +1523,135 @@ class WebCephAutomation:
             except NoSuchElementException:
                 pass
     
+    @traced("webceph.upload")
     def upload_images(self, images):
-        """이미지 업로드"""
+        """이미지 업로드 (사전 검증 후 두 이미지를 한 번에 첨부)"""
         try:
             self.logger.info("이미지 업로드를 시작합니다...")
-            
-            # X-ray 이미지 업로드
-            if images.get('xray'):
-                self._upload_single_image(images['xray'], 'xray')
-            
-            # 얼굴 사진 업로드
-            if images.get('face'):
-                self._upload_single_image(images['face'], 'face')
-            
-            self.logger.info("모든 이미지가 성공적으로 업로드되었습니다")
+
+            # 1. 업로드 해상도로 축소/재인코딩 (캐시 재사용) 후 모든 파일 검증 (거부될 파일은 즉시 실패)
+            uploads = [(image_type, image_transcoder.transcode(images[image_type]))
+                       for image_type in ('xray', 'face') if images.get(image_type)]
+            if not uploads:
+                self.logger.warning("업로드할 이미지가 없습니다")
+                return True
+
+            for image_type, image_path in uploads:
+                self._validate_image(image_path, image_type)
+
+            # 2. 기존 완료 표시 개수/오류 표시 기록 후 파일 첨부
+            markers_before = len(self.driver.find_elements(By.XPATH, self.UPLOAD_SUCCESS_XPATH))
+            errors_before = self._upload_error_ids()
+            file_inputs = self._find_upload_inputs([image_type for image_type, _ in uploads])
+            for image_type, image_path in uploads:
+                self._attach_file(file_inputs[image_type], image_path, image_type)
+
+            # 3. 모든 이미지의 완료 표시를 한 번에 대기
+            self._wait_for_upload_markers(markers_before + len(uploads), errors_before)
+
+            self._record_memory('이미지 업로드')
+            self.logger.info(f"모든 이미지({len(uploads)}개)가 성공적으로 업로드되었습니다")
             return True
             
         except Exception as e:
             self.logger.error(f"이미지 업로드 실패: {str(e)}")
             raise
+
+    def _validate_image(self, image_path, image_type):
+        """업로드 전 이미지 검증 (존재, 크기, 형식, 디코딩 가능 여부)"""
+        path = Path(image_path)
+        if not path.is_file():
+            raise Exception(f"{image_type} 이미지 파일이 없습니다: {image_path}")
+
+        if path.suffix.lower() not in self.UPLOAD_EXTENSIONS:
+            raise Exception(f"{image_type} 이미지 형식을 지원하지 않습니다: {path.suffix}")
+
+        size_mb = path.stat().st_size / (1024 * 1024)
+        max_upload_mb = self.config.snapshot.max_upload_mb
+        if size_mb == 0:
+            raise Exception(f"{image_type} 이미지 파일이 비어 있습니다: {path.name}")
+        if size_mb > max_upload_mb:
+            raise Exception(f"{image_type} 이미지가 너무 큽니다: {size_mb:.1f}MB (최대 {max_upload_mb}MB)")
+
+        try:
+            with Image.open(path) as image:
+                image.verify()
+        except Exception as e:
+            raise Exception(f"{image_type} 이미지를 읽을 수 없습니다 ({path.name}): {str(e)}")
+
+    def _find_upload_inputs(self, image_types):
+        """이미지 타입별 파일 입력 요소 찾기 (페이지에 모두 있으면 대기 없이 반환)"""
+        file_inputs = {}
+        for image_type in image_types:
+            elements = self.driver.find_elements(By.XPATH, self.UPLOAD_SELECTORS[image_type])
+            if elements:
+                file_inputs[image_type] = elements[0]
+
+        # 아직 렌더링되지 않은 입력만 대기
+        for image_type in image_types:
+            if image_type not in file_inputs:
+                file_inputs[image_type] = self.wait.until(
+                    EC.presence_of_element_located((By.XPATH, self.UPLOAD_SELECTORS[image_type]))
+                )
+
+        return file_inputs
+
+    def _attach_file(self, file_input, image_path, image_type):
+        """파일 입력 요소에 파일 첨부 및 첨부 여부 확인"""
+        resolved_path = Path(image_path).resolve()
+        file_input.send_keys(str(resolved_path))
+
+        # 파일이 실제로 입력 요소에 첨부되었는지 확인 (헤드리스/일반 모드 동일 검증)
+        attached_name = self.driver.execute_script(
+            "return arguments[0].files.length ? arguments[0].files[0].name : null;", file_input
+        )
+        if attached_name != resolved_path.name:
+            raise Exception(f"{image_type} 파일이 업로드 입력에 첨부되지 않았습니다: {resolved_path.name}")
+
+        self.logger.info(f"{image_type} 이미지 첨부: {resolved_path.name}")
+
+    def _upload_error_ids(self):
+        """현재 페이지에 있는 오류 표시 요소 ID (첨부 전 기준값, 이후 새로 생긴 오류만 업로드 실패로 판단)"""
+        return {element.id for element in self.driver.find_elements(By.XPATH, self.UPLOAD_ERROR_XPATH)}
+
+    def _wait_for_upload_markers(self, expected_count, errors_before=frozenset()):
+        """업로드 완료 표시가 기대 개수만큼 나타날 때까지 대기 (첨부 후 새 오류 표시 시 즉시 실패)"""
+        def upload_state(driver):
+            errors = [element.text.strip() for element in driver.find_elements(By.XPATH, self.UPLOAD_ERROR_XPATH)
+                      if element.id not in errors_before and element.is_displayed()]
+            if errors:
+                return ('error', errors[0])
+            if len(driver.find_elements(By.XPATH, self.UPLOAD_SUCCESS_XPATH)) >= expected_count:
+                return ('done', None)
+            return False
+
+        try:
+            state, message = self.wait.until(upload_state)
+        except TimeoutException:
+            raise Exception("이미지 업로드 완료 표시를 확인할 수 없습니다")
+
+        if state == 'error':
+            raise Exception(f"WebCeph가 이미지를 거부했습니다: {message or '알 수 없는 오류'}")
     
     def _upload_single_image(self, image_path, image_type):
         """단일 이미지 업로드"""
         try:
-            # 이미지 타입에 따른 업로드 버튼 찾기
-            if image_type == 'xray':
-                upload_selector = "//input[@type='file' and contains(@name, 'xray')]"
-            else:
-                upload_selector = "//input[@type='file' and contains(@name, 'photo')]"
-            
-            # 파일 입력 요소 찾기
-            file_input = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, upload_selector))
-            )
-            
-            # 파일 경로 입력
-            file_input.send_keys(str(Path(image_path).resolve()))
-            
-            # 업로드 완료 대기
-            time.sleep(0.5)  # 2초 → 0.5초로 단축
-            
-            # 업로드 성공 확인 (썸네일이나 성공 표시 확인)
-            self.wait.until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.CLASS_NAME, "upload-success")),
-                    EC.presence_of_element_located((By.CLASS_NAME, "thumbnail")),
-                    EC.presence_of_element_located((By.XPATH, "//img[contains(@src, 'thumb')]"))
-                )
-            )
-            
+            image_path = image_transcoder.transcode(image_path)
+            self._validate_image(image_path, image_type)
+
+            markers_before = len(self.driver.find_elements(By.XPATH, self.UPLOAD_SUCCESS_XPATH))
+            errors_before = self._upload_error_ids()
+            file_input = self._find_upload_inputs([image_type])[image_type]
+            self._attach_file(file_input, image_path, image_type)
+            self._wait_for_upload_markers(markers_before + 1, errors_before)
+
             self.logger.info(f"{image_type} 이미지가 성공적으로 업로드되었습니다")
             
         except Exception as e:
             self.logger.error(f"{image_type} 이미지 업로드 실패: {str(e)}")
             raise
     
+    @traced("webceph.analysis_start")
     def start_analysis(self):
         """분석 시작"""
         try:
@@ -1346,6 +1685,7 @@ class WebCephAutomation:
             self.logger.error(f"분석 시작 실패: {str(e)}")
             raise
     
+    @traced("webceph.analysis_wait")
     def wait_for_analysis_completion(self, max_wait_minutes=10):
         """분석 완료 대기"""
         try:
@@ -1364,6 +1704,7 @@ class WebCephAutomation:
                     )
                     
                     if completion_indicator:
+                        self._record_memory('분석 완료')
                         self.logger.info("분석이 완료되었습니다")
                         return True
                     
@@ -1389,7 +1730,8 @@ class WebCephAutomation:
                 except Exception as e:
                     self.logger.warning(f"분석 상태 확인 중 오류: {str(e)}")
                 
-                time.sleep(check_interval)
+                if self.interrupt_event.wait(check_interval):
+                    raise Exception("분석 완료 대기가 중단되었습니다")
             
             raise Exception(f"분석이 {max_wait_minutes}분 내에 완료되지 않았습니다")
             
@@ -1397,30 +1739,26 @@ class WebCephAutomation:
             self.logger.error(f"분석 대기 실패: {str(e)}")
             raise
     
+    @traced("webceph.download")
     def download_pdf(self, patient_data):
         """PDF 다운로드"""
         try:
             self.logger.info("분석 결과 PDF를 다운로드합니다...")
             
+            pdf_folder = Path(self._get_pdf_folder())
+            started_at = time.time()
+
             # PDF 다운로드 버튼 찾기 및 클릭
             download_button = self.wait.until(
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Download') or contains(text(), '다운로드')] | //a[contains(text(), 'PDF')]"))
             )
             download_button.click()
             
-            # 다운로드 완료 대기
-            time.sleep(2)  # 5초 → 2초로 단축
-            
-            # 다운로드된 파일 확인 및 이름 변경
-            pdf_folder = Path(self.config.get('paths', 'pdf_folder'))
-            if not pdf_folder.exists():
-                pdf_folder.mkdir(parents=True, exist_ok=True)
-            
-            # 가장 최근 다운로드된 PDF 파일 찾기
-            pdf_files = list(pdf_folder.glob("*.pdf"))
-            if pdf_files:
-                latest_pdf = max(pdf_files, key=os.path.getctime)
-                
+            # 다운로드 완료 대기 (클릭 이후 생성되고 .crdownload가 사라진 PDF)
+            latest_pdf = self._wait_for_download(pdf_folder, started_at)
+            if latest_pdf:
+                self._record_memory('PDF 다운로드')
+
                 # 새 파일명 생성
                 patient_name = patient_data['name']
                 reg_num = patient_data['registration_number']
@@ -1440,14 +1778,73 @@ class WebCephAutomation:
             self.logger.error(f"PDF 다운로드 실패: {str(e)}")
             raise
     
+    def _wait_for_download(self, pdf_folder, started_at, timeout=None):
+        """다운로드 완료 대기 후 새로 받은 PDF 경로 반환 (없으면 None)"""
+        deadline = time.time() + (timeout or self.timeout)
+
+        def modified_since_start(path):
+            try:
+                return os.path.getmtime(path) >= started_at - 1
+            except OSError:
+                # 확인 사이에 이름이 바뀌거나 삭제된 파일
+                return False
+
+        while time.time() < deadline:
+            # 이전에 중단된 다운로드가 남긴 .crdownload는 무시
+            in_progress = [part for part in pdf_folder.glob("*.crdownload") if modified_since_start(part)]
+            new_pdfs = [pdf for pdf in pdf_folder.glob("*.pdf") if modified_since_start(pdf)]
+
+            if new_pdfs and not in_progress:
+                latest_pdf = max(new_pdfs, key=os.path.getmtime)
+                # 파일 크기가 0이면 아직 기록 중
+                if latest_pdf.stat().st_size > 0:
+                    return latest_pdf
+
+            if self.interrupt_event.wait(0.2):
+                self.logger.warning("다운로드 대기가 중단되었습니다")
+                break
+
+        return None
+
     def close_browser(self):
         """브라우저 종료"""
         try:
             if self.driver:
-                self.driver.quit()
+                # 세션 동안의 페이지 로드 시간 요약
+                if self.navigation_timings:
+                    summary = self.get_navigation_summary()
+                    for action, entry in summary['by_action'].items():
+                        self.logger.info(
+                            f"페이지 로드 요약 ({summary['profile']}, {action}): {entry['count']}회, "
+                            f"평균 {entry['average']:.2f}초, 최대 {entry['max']:.2f}초, 실패 {entry['failed']}회"
+                        )
+
+                # 작업 동안의 브라우저 메모리 사용 보고
+                self._record_memory('종료 직전')
+                memory_report = self.get_memory_report()
+                if memory_report:
+                    self.logger.info(
+                        f"메모리 사용 보고 ({memory_report['mode']}, {memory_report['profile']}): "
+                        f"최대 {memory_report['peak_mb']:.1f}MB, 평균 {memory_report['average_mb']:.1f}MB"
+                    )
+
+                # 정상 종료 후 남은 Chrome 프로세스까지 정리
+                browser_supervisor.terminate(self.driver)
+                self.driver = None
+                self.wait = None
+                self.logged_in = False
                 self.logger.info("브라우저가 정상적으로 종료되었습니다")
         except Exception as e:
             self.logger.error(f"브라우저 종료 중 오류: {str(e)}")
+
+    def __enter__(self):
+        """with 문 진입"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """with 문 종료 시 브라우저 프로세스 종료 보장"""
+        self.close_browser()
+        return False
     
     def process_patient(self, patient_data, images):
         """환자 전체 프로세스 실행"""
@@ -1490,6 +1887,7 @@ class WebCephAutomation:
             return {
                 'success': True,
                 'pdf_path': pdf_path,
+                'memory_report': self.get_memory_report(),
                 'message': '모든 작업이 성공적으로 완료되었습니다'
             }
             
@@ -1498,6 +1896,7 @@ class WebCephAutomation:
             return {
                 'success': False,
                 'pdf_path': None,
+                'memory_report': self.get_memory_report(),
                 'message': str(e)
             }
         finally:
@@ -1565,6 +1964,7 @@ class WebCephAutomation:
             return {
                 'success': True,
                 'pdf_path': pdf_path,
+                'memory_report': self.get_memory_report(),
                 'message': '신규 환자 생성 및 분석이 성공적으로 완료되었습니다',
                 'patient_created': True
             }
@@ -1574,6 +1974,7 @@ class WebCephAutomation:
             return {
                 'success': False,
                 'pdf_path': None,
+                'memory_report': self.get_memory_report(),
                 'message': str(e),
                 'patient_created': False
             }
@@ -1613,7 +2014,7 @@ class WebCephAutomation:
             
             while time.time() - start_time < timeout_seconds:
                 # 페이지 새로고침
-                self.driver.refresh()
+                self._navigate()
                 time.sleep(0.5)  # 2초 → 0.5초로 단축
                 
                 # 첫 번째 환자 확인
@@ -1670,11 +2071,11 @@ class WebCephAutomation:
             
             # 환자 목록 페이지로 이동
             dashboard_url = f"{self.config.get('webceph', 'url')}/dashboard"
-            self.driver.get(dashboard_url)
+            self._navigate(dashboard_url)
             time.sleep(1)  # 3초 → 1초로 단축
             
             # 페이지 새로고침으로 최신 목록 로드
-            self.driver.refresh()
+            self._navigate()
             time.sleep(0.5)  # 2초 → 0.5초로 단축
             
             # 첫 번째 환자의 정보 추출 시도
@@ -1709,8 +2110,10 @@ class WebCephAutomation:
     
     def __del__(self):
         """소멸자"""
-        self.close_browser() 
+        if getattr(self, 'driver', None):
+            self.close_browser()
 
+    @traced("webceph.register.create_record")
     def create_patient_record(self, patient_data=None):
         """선택된 환자의 새로운 레코드 생성"""
         try:
@@ -1778,6 +2181,7 @@ class WebCephAutomation:
             self.logger.error(f"레코드 생성 실패: {str(e)}")
             return False
 
+    @traced("webceph.register.setup_record")
     def setup_record_info(self, patient_data=None):
         """레코드 정보 설정 (날짜, 타입 등)"""
         try:
@@ -1927,6 +2331,7 @@ class WebCephAutomation:
         except Exception as e:
             self.logger.warning(f"레코드 제목/메모 설정 실패: {str(e)}")
 
+    @traced("webceph.register.confirm_record")
     def confirm_record_creation(self):
         """레코드 생성 확인"""
         try:
@@ -1,24 +1,95 @@
 """
 애플리케이션 설정 관리 모듈
+전역 config는 처음 사용할 때 생성되므로 import만으로는 파일/디렉토리를 건드리지 않음
 """
 
 import os
 import json
+import time
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any
-from cryptography.fernet import Fernet
+from typing import Dict, Any, Callable
 import configparser
 
+class ConfigSnapshot:
+    """자주 읽는 설정값의 읽기 전용 스냅샷
+
+    설정이 저장되거나 파일이 바뀔 때마다 새 스냅샷으로 교체되므로,
+    반복 경로에서는 configparser 조회/정수 변환 없이 속성만 읽으면 됩니다.
+    """
+    
+    __slots__ = (
+        'version', 'webceph_url', 'webceph_timeout', 'webceph_retry_count', 'max_upload_mb',
+        'wait_time', 'batch_size', 'browser_profile', 'headless', 'max_rss_mb',
+        'upstage_api_url', 'upstage_timeout', 'airtable_base_id', 'airtable_table_name',
+        'image_folder', 'pdf_folder', 'backup_folder'
+    )
+    
+    version: int
+    webceph_url: str
+    webceph_timeout: int
+    webceph_retry_count: int
+    max_upload_mb: int
+    wait_time: int
+    batch_size: int
+    browser_profile: str
+    headless: bool
+    max_rss_mb: int
+    upstage_api_url: str
+    upstage_timeout: int
+    airtable_base_id: str
+    airtable_table_name: str
+    image_folder: str
+    pdf_folder: str
+    backup_folder: str
+    
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("설정 스냅샷은 변경할 수 없습니다")
+    
+    def __delattr__(self, name):
+        raise AttributeError("설정 스냅샷은 변경할 수 없습니다")
+    
+    def __repr__(self):
+        return f"ConfigSnapshot(version={self.version})"
+    
+    @classmethod
+    def from_config(cls, config: 'Config', version: int) -> 'ConfigSnapshot':
+        """현재 설정으로 스냅샷 생성 (기본값은 각 사용처의 기존 기본값과 동일)"""
+        return cls(
+            version=version,
+            webceph_url=config.get('webceph', 'url', 'https://www.webceph.com'),
+            webceph_timeout=config.get_int('webceph', 'timeout', 15),
+            webceph_retry_count=config.get_int('webceph', 'retry_count', 3),
+            max_upload_mb=config.get_int('webceph', 'max_upload_mb', 20),
+            wait_time=config.get_int('automation', 'wait_time', 1),
+            batch_size=config.get_int('automation', 'batch_size', 5),
+            browser_profile=config.get('browser', 'profile', 'default'),
+            headless=config.get_bool('browser', 'headless', False),
+            max_rss_mb=config.get_int('browser', 'max_rss_mb', 1500),
+            upstage_api_url=config.get('upstage', 'api_url', 'https://api.upstage.ai/v1/document-ai/ocr'),
+            upstage_timeout=config.get_int('upstage', 'timeout', 30),
+            airtable_base_id=config.get('airtable', 'base_id', ''),
+            airtable_table_name=config.get('airtable', 'table_name', 'Patients'),
+            image_folder=config.get('paths', 'image_folder', ''),
+            pdf_folder=config.get('paths', 'pdf_folder', ''),
+            backup_folder=config.get('paths', 'backup_folder', '')
+        )
+
 class Config:
     """애플리케이션 설정 관리 클래스"""
     
-    def __init__(self):
-        self.app_dir = Path.home() / "AppData" / "Local" / "WebCephAuto"
+    def __init__(self, app_dir: Path = None):
+        self.app_dir = Path(app_dir) if app_dir else Path.home() / "AppData" / "Local" / "WebCephAuto"
         self.config_file = self.app_dir / "config.ini"
         self.key_file = self.app_dir / "key.key"
         
         # 디렉토리 생성
-        self.app_dir.mkdir(exist_ok=True)
+        self.app_dir.mkdir(parents=True, exist_ok=True)
         
         # 암호화 키 생성 또는 로드
         self._init_encryption()
@@ -28,7 +99,8 @@ class Config:
             'general': {
                 'auto_login': 'false',
                 'language': 'ko',
-                'theme': 'light'
+                'theme': 'light',
+                'log_max_lines': '2000'
             },
             'paths': {
                 'image_folder': str(Path.home() / "Documents" / "WebCephAuto" / "Images"),
@@ -38,7 +110,22 @@ class Config:
             'webceph': {
                 'url': 'https://www.webceph.com',
                 'timeout': '30',
-                'retry_count': '3'
+                'retry_count': '3',
+                'max_upload_mb': '20'
+            },
+            'browser': {
+                'profile': 'default',
+                'headless': 'false',
+                'window_size': '1920,1080',
+                'max_rss_mb': '1500',
+                'blocked_urls': '*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*,'
+                                '*facebook.net*,*hotjar.com*,*fonts.googleapis.com*,*fonts.gstatic.com*'
+            },
+            'transcode': {
+                'enabled': 'true',
+                'max_dimension': '2048',
+                'jpeg_quality': '90',
+                'cache_days': '30'
             },
             'automation': {
                 'auto_start': 'false',
@@ -57,11 +144,32 @@ class Config:
             }
         }
         
+        # 일괄 저장 상태 (batch() 안에서는 set()이 파일을 쓰지 않음)
+        self._batch_lock = threading.RLock()
+        self._batch_depth = 0
+        self._dirty = False
+        
+        # 설정 스냅샷 및 변경 구독자
+        self._snapshot = None
+        self._subscribers = []
+        self._file_stat = None
+        
         self.config = configparser.ConfigParser()
         self._load_config()
+        
+        # 복호화된 비밀값 캐시 ((section, key) -> (암호문, 평문))
+        # 암호문이 바뀌면(저장/파일 재로드) 자동으로 다시 복호화하며, 유휴 시간이 지나면 타이머가 전체 삭제
+        self._secret_lock = threading.RLock()
+        self._secret_cache = {}
+        self._secret_last_access = 0.0
+        self._secret_timer = None
+        self.secret_cache_idle = self.get_int('security', 'secret_cache_idle_seconds', 0)
     
     def _init_encryption(self):
         """암호화 키 초기화"""
+        # cryptography는 로딩 비용이 커서 설정을 처음 사용할 때 import
+        from cryptography.fernet import Fernet
+        
         if self.key_file.exists():
             with open(self.key_file, 'rb') as f:
                 self.key = f.read()
@@ -72,10 +180,22 @@ class Config:
         
         self.cipher = Fernet(self.key)
     
+    def _read_config_file(self) -> configparser.ConfigParser:
+        """설정 파일 읽기 (기존 설치 파일에 없는 기본 설정 키는 메모리에서 채움)"""
+        parser = configparser.ConfigParser()
+        parser.read(self.config_file, encoding='utf-8')
+        for section, settings in self.default_settings.items():
+            if not parser.has_section(section):
+                parser.add_section(section)
+            for key, value in settings.items():
+                if not parser.has_option(section, key):
+                    parser.set(section, key, value)
+        return parser
+    
     def _load_config(self):
         """설정 파일 로드"""
         if self.config_file.exists():
-            self.config.read(self.config_file, encoding='utf-8')
+            self.config = self._read_config_file()
         else:
             # 기본 설정으로 초기화
             for section, settings in self.default_settings.items():
@@ -83,11 +203,99 @@ class Config:
                 for key, value in settings.items():
                     self.config.set(section, key, value)
             self.save_config()
+        
+        self._file_stat = self._get_file_stat()
+        self._publish_snapshot()
+    
+    def _get_file_stat(self):
+        """설정 파일 변경 감지용 (수정 시각, 크기)"""
+        try:
+            stat = self.config_file.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """현재 설정 스냅샷"""
+        return self._snapshot
+    
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None]):
+        """설정 변경 시 새 스냅샷을 받을 콜백 등록"""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[ConfigSnapshot], None]):
+        """설정 변경 콜백 해제"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+    
+    def _publish_snapshot(self):
+        """새 스냅샷 생성 후 구독자에게 알림"""
+        version = self._snapshot.version + 1 if self._snapshot else 1
+        self._snapshot = ConfigSnapshot.from_config(self, version)
+        for callback in list(self._subscribers):
+            try:
+                callback(self._snapshot)
+            except Exception as e:
+                print(f"설정 변경 알림 실패: {e}")
+    
+    def reload_if_changed(self) -> bool:
+        """설정 파일이 외부에서 바뀌었으면 다시 읽고 스냅샷 갱신 (자체 저장은 무시)"""
+        with self._batch_lock:
+            file_stat = self._get_file_stat()
+            if file_stat is None or file_stat == self._file_stat:
+                return False
+            
+            self.config = self._read_config_file()
+            self._file_stat = file_stat
+            self._publish_snapshot()
+            return True
     
     def save_config(self):
-        """설정 파일 저장"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
+        """설정 파일 저장 (batch() 안에서는 종료 시 한 번만 저장)"""
+        with self._batch_lock:
+            if self._batch_depth > 0:
+                self._dirty = True
+                return
+            self._write_config_file()
+            self._dirty = False
+            self._file_stat = self._get_file_stat()
+            if self._snapshot is not None:
+                self._publish_snapshot()
+    
+    def _write_config_file(self):
+        """임시 파일에 기록 후 교체 (저장 중 중단되어도 기존 파일 유지)"""
+        temp_file = self.config_file.with_suffix('.ini.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
             self.config.write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.config_file)
+    
+    @contextmanager
+    def batch(self):
+        """여러 설정 변경을 모아 한 번에 저장 (중첩 가능, 예외 발생 시 변경 취소)
+
+        with config.batch():
+            config.set('webceph', 'timeout', '30')
+            config.set('webceph', 'retry_count', '3')
+        """
+        with self._batch_lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    # 바깥 batch에서 실패하면 파일 내용으로 되돌림
+                    self.config = self._read_config_file()
+                    self._dirty = False
+                    self._publish_snapshot()
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self.save_config()
     
     def get(self, section: str, key: str, fallback: str = None) -> str:
         """설정 값 가져오기"""
@@ -121,13 +329,59 @@ class Config:
         """데이터 복호화"""
         return self.cipher.decrypt(encrypted_data.encode()).decode()
     
+    def _decrypt_cached(self, section: str, key: str, encrypted_data: str) -> str:
+        """캐시를 사용한 복호화 (같은 암호문이면 Fernet 복호화 생략)"""
+        with self._secret_lock:
+            self._secret_last_access = time.monotonic()
+            
+            cached = self._secret_cache.get((section, key))
+            if cached and cached[0] == encrypted_data:
+                return cached[1]
+            
+            decrypted = self.decrypt_data(encrypted_data)
+            self._secret_cache[(section, key)] = (encrypted_data, decrypted)
+            self._arm_secret_timer(self.secret_cache_idle)
+            return decrypted
+    
+    def _arm_secret_timer(self, delay: float):
+        """유휴 삭제 타이머 시작 (이미 대기 중이면 그대로 사용)"""
+        if self.secret_cache_idle <= 0 or self._secret_timer is not None:
+            return
+        self._secret_timer = threading.Timer(delay, self._expire_secret_cache)
+        self._secret_timer.daemon = True
+        self._secret_timer.start()
+    
+    def _expire_secret_cache(self):
+        """타이머 만료 시 유휴 시간이 지났으면 캐시 삭제, 그 사이 사용했으면 남은 시간만큼 다시 대기"""
+        with self._secret_lock:
+            self._secret_timer = None
+            remaining = self._secret_last_access + self.secret_cache_idle - time.monotonic()
+            if remaining > 0 and self._secret_cache:
+                self._arm_secret_timer(remaining)
+            else:
+                self._secret_cache.clear()
+    
+    def clear_secret_cache(self, section: str = None):
+        """복호화 캐시 삭제 (section을 주면 해당 섹션만)"""
+        with self._secret_lock:
+            if section is None:
+                self._secret_cache.clear()
+                if self._secret_timer is not None:
+                    self._secret_timer.cancel()
+                    self._secret_timer = None
+            else:
+                for cache_key in [k for k in self._secret_cache if k[0] == section]:
+                    del self._secret_cache[cache_key]
+    
     def save_credentials(self, username: str, password: str):
         """로그인 정보 암호화 저장"""
         encrypted_username = self.encrypt_data(username)
         encrypted_password = self.encrypt_data(password)
         
-        self.set('credentials', 'username', encrypted_username)
-        self.set('credentials', 'password', encrypted_password)
+        with self.batch():
+            self.set('credentials', 'username', encrypted_username)
+            self.set('credentials', 'password', encrypted_password)
+        self.clear_secret_cache('credentials')
     
     def get_credentials(self) -> tuple:
         """저장된 로그인 정보 가져오기"""
@@ -136,8 +390,8 @@ class Config:
             encrypted_password = self.get('credentials', 'password')
             
             if encrypted_username and encrypted_password:
-                username = self.decrypt_data(encrypted_username)
-                password = self.decrypt_data(encrypted_password)
+                username = self._decrypt_cached('credentials', 'username', encrypted_username)
+                password = self._decrypt_cached('credentials', 'password', encrypted_password)
                 return username, password
         except Exception:
             pass
@@ -147,13 +401,14 @@ class Config:
         """Airtable API 키 암호화 저장"""
         encrypted_key = self.encrypt_data(api_key)
         self.set('airtable', 'api_key', encrypted_key)
+        self.clear_secret_cache('airtable')
     
     def get_airtable_api_key(self) -> str:
         """Airtable API 키 가져오기"""
         try:
             encrypted_key = self.get('airtable', 'api_key')
             if encrypted_key:
-                return self.decrypt_data(encrypted_key)
+                return self._decrypt_cached('airtable', 'api_key', encrypted_key)
         except Exception:
             pass
         return None
@@ -168,13 +423,14 @@ class Config:
             if self.config.has_option('upstage', 'api_key'):
                 self.config.remove_option('upstage', 'api_key')
                 self.save_config()
+        self.clear_secret_cache('upstage')
     
     def get_upstage_api_key(self) -> str:
         """Upstage API 키 가져오기"""
         try:
             encrypted_key = self.get('upstage', 'api_key', '')
             if encrypted_key:
-                decrypted_key = self.decrypt_data(encrypted_key)
+                decrypted_key = self._decrypt_cached('upstage', 'api_key', encrypted_key)
                 return decrypted_key if decrypted_key else ''
         except Exception as e:
             print(f"API 키 복호화 실패: {e}")
@@ -191,5 +447,40 @@ class Config:
         for dir_path in dirs:
             Path(dir_path).mkdir(parents=True, exist_ok=True)
 
-# 전역 설정 인스턴스
-config = Config() 
\ No newline at end of file
+class LazyConfig:
+    """처음 사용할 때 Config를 생성하는 전역 설정 프록시 (Config와 같은 API)"""
+    
+    def __init__(self):
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_app_dir', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+    
+    def configure(self, app_dir: Path = None):
+        """설정 디렉토리 지정 (테스트에서 임시 폴더 사용 등, 다음 사용 시 새로 로드)"""
+        with self._lock:
+            object.__setattr__(self, '_app_dir', app_dir)
+            object.__setattr__(self, '_instance', None)
+    
+    def _get_instance(self) -> Config:
+        """Config 인스턴스 반환 (최초 호출 시 생성)"""
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = Config(self._app_dir)
+                    object.__setattr__(self, '_instance', instance)
+        return instance
+    
+    def __getattr__(self, name):
+        return getattr(self._get_instance(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._get_instance(), name, value)
+
+# 전역 설정 인스턴스 (지연 생성)
+config = LazyConfig()
+
+def configure(app_dir: Path = None):
+    """전역 설정 디렉토리 지정"""
+    config.configure(app_dir) 
\ No newline at end of file
@@ -12,13 +12,17 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                            QListWidgetItem, QSplitter, QMessageBox, 
                            QTabWidget, QFileDialog, QLineEdit, QComboBox,
                            QCheckBox, QSpinBox, QFormLayout, QDialog,
-                           QDialogButtonBox, QPlainTextEdit)
+                           QDialogButtonBox)
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QThread, QMutex, QPropertyAnimation, QEasingCurve
 from PyQt5.QtGui import QFont, QMovie, QPixmap, QColor, QPalette, QIcon
 
 from .styles import COLORS
+from .log_view import LogView
 from ..utils.font_loader import font_loader
 from ..automation.dentweb_automation import DentwebAutomationWorker
+from ..automation.job_engine import AutomationJob, JobCancelled, get_job_engine
+from ..automation.job_store import get_job_store
+from ..automation.pipeline import PipelineContext, build_patient_pipeline
 from ..automation.web_ceph_automation import WebCephAutomation
 from ..config import config
 
@@ -34,6 +38,19 @@ class AutomationFlowWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.automation_worker = None
+        self.pipeline = None
+        
+        # 브라우저 자동화 작업 엔진 (GUI 스레드 밖에서 실행, 다른 화면과 공유하므로 이 화면의 작업만 표시)
+        self.job_engine = get_job_engine()
+        self.job_ids = set()
+        self.job_engine.log_message.connect(self.on_job_log)
+        self.job_engine.progress_changed.connect(self.on_job_progress)
+        self.job_engine.step_status_changed.connect(self.on_job_step_status)
+        self.job_engine.queue_changed.connect(self.on_queue_changed)
+        
+        # 연속 처리 모드: 환자 N의 WebCeph 처리 중 환자 N+1의 OCR을 진행 (대기열 크기 제한)
+        self.pipelined_mode = config.get_bool('automation', 'pipelined_mode', False)
+        self.queue_limit = config.get_int('automation', 'pipeline_queue_size', 3)
         self.current_step = 0
         self.total_steps = 3
         
@@ -147,7 +164,32 @@ class AutomationFlowWidget(QWidget):
         # 단계별 버튼
         self.create_step_buttons(execution_layout)
         
+        # 연속 처리 모드
+        self.create_pipeline_mode_section(execution_layout)
+        
         parent_layout.addWidget(execution_group)
+    
+    def create_pipeline_mode_section(self, parent_layout):
+        """연속 처리 모드 영역 생성"""
+        mode_layout = QHBoxLayout()
+        
+        self.pipelined_checkbox = QCheckBox("연속 처리 (WebCeph 처리 중 다음 환자 OCR 진행)")
+        self.pipelined_checkbox.setChecked(self.pipelined_mode)
+        self.pipelined_checkbox.toggled.connect(self.on_pipelined_mode_toggled)
+        
+        self.queue_label = QLabel(f"대기열: 0/{self.queue_limit}")
+        self.queue_label.setObjectName("progressStatus")
+        
+        retry_button = QPushButton("🔁 실패 작업 재시도")
+        retry_button.setObjectName("ghostButton")
+        retry_button.clicked.connect(self.retry_failed_jobs)
+        
+        mode_layout.addWidget(self.pipelined_checkbox)
+        mode_layout.addStretch()
+        mode_layout.addWidget(self.queue_label)
+        mode_layout.addWidget(retry_button)
+        
+        parent_layout.addLayout(mode_layout)
         
     def create_progress_section(self, parent_layout):
         """진행률 섹션 생성"""
@@ -250,15 +292,15 @@ class AutomationFlowWidget(QWidget):
         save_log_btn.setObjectName("ghostButton")
         save_log_btn.clicked.connect(self.save_log)
         
+        # 로그 텍스트 (최대 줄 수 제한, 일괄 갱신)
+        self.log_text = LogView()
+        self.log_text.setObjectName("logText")
+        self.log_text.setMinimumHeight(200)
+        
         log_controls.addWidget(clear_log_btn)
         log_controls.addWidget(save_log_btn)
         log_controls.addStretch()
-        
-        # 로그 텍스트
-        self.log_text = QPlainTextEdit()
-        self.log_text.setObjectName("logText")
-        self.log_text.setMinimumHeight(200)
-        self.log_text.setReadOnly(True)
+        log_controls.addWidget(self.log_text.create_filter_combo())
         
         # 초기 로그 메시지
         self.add_log("프로그램이 시작되었습니다.", "info")
@@ -481,6 +523,15 @@ class AutomationFlowWidget(QWidget):
                 button_text = step_ui['button'].text()
                 break
         
+        # 연속 처리 모드에서는 OCR만 직접 실행 (WebCeph/PDF 단계는 대기열에서 자동 진행)
+        if self.pipelined_mode and step_id != 'ocr_extraction':
+            QMessageBox.information(
+                self,
+                "연속 처리 모드",
+                "연속 처리 모드에서는 OCR 완료 시 WebCeph 등록부터 PDF 전송까지 자동으로 진행됩니다."
+            )
+            return
+        
         if button_text in ["재실행", "재시도"]:
             self.add_log(f"단계 재실행 시작: {step_id}", "info")
             # 재실행의 경우 상태를 pending으로 초기화
@@ -541,6 +592,18 @@ class AutomationFlowWidget(QWidget):
             # 설정 확인
             if not self.check_settings():
                 return
+            
+            # 대기열이 가득 차면 WebCeph 단계가 따라잡을 때까지 다음 환자 캡처 보류
+            # (실행 중인 환자도 포함해서 세어 처리되지 않은 환자가 queue_limit명을 넘지 않게 함)
+            if self.pipelined_mode and self.job_engine.active_count() >= self.queue_limit:
+                QMessageBox.warning(
+                    self,
+                    "대기열 가득 참",
+                    f"WebCeph 처리 대기 중인 환자가 {self.queue_limit}명입니다.\n"
+                    "앞선 환자의 처리가 끝난 뒤 다시 실행해주세요."
+                )
+                self.update_step_status('ocr_extraction', 'pending', "대기 중")
+                return
                 
             self.update_step_status('ocr_extraction', 'running', "실행 중...")
             self.add_log("OCR 실행 및 사진 복사를 시작합니다...", "info")
@@ -629,219 +692,80 @@ class AutomationFlowWidget(QWidget):
             self.add_log(f"WebCeph 분석 실패: {str(e)}", "error")
     
     def start_real_webceph_automation(self):
-        """실제 WebCeph 자동화 시작"""
+        """실제 WebCeph 자동화 시작 (파이프라인의 브라우저 실행 ~ 분석 시작 단계)"""
         try:
-            # WebCeph 자동화 워커 생성
-            from ..automation.web_ceph_automation import WebCephAutomation
-            
-            # 이전 단계에서 추출된 환자 데이터 사용
-            patient_data = self.extracted_patient_data if self.extracted_patient_data else {
-                'name': '',
-                'birth_date': '',
-                'registration_number': '',
-                'gender': 'M'
-            }
-            
-            # 이미지 데이터 (현재는 빈 값, 추후 이미지 캡처 기능 추가 예정)
-            images = self.extracted_images if self.extracted_images else {
-                'xray': None,
-                'face': None
-            }
+            # 이전 단계에서 추출된 환자 데이터 사용 (없으면 파이프라인의 OCR 단계에서 추출)
+            patient_data = self.extracted_patient_data
+            images = self.extracted_images
             
             # 환자 데이터 상태 확인 및 로그
             if patient_data.get('name'):
                 self.add_log(f"📋 추출된 환자 데이터를 사용합니다: {patient_data.get('name')}", "info")
             else:
-                self.add_log("⚠️ 추출된 환자 데이터가 없습니다. 수동 입력이 필요할 수 있습니다.", "warning")
+                self.add_log("⚠️ 추출된 환자 데이터가 없습니다. Dentweb 화면에서 먼저 추출합니다.", "warning")
+            if not any(images.values()):
+                self.add_log("⚠️ 캡처된 이미지가 없어 업로드/분석 단계는 건너뜁니다.", "warning")
             
             self.add_log("🚀 Chrome 브라우저를 실행합니다...", "info")
             
-            # WebCeph 자동화 클래스 인스턴스 생성
-            self.webceph_automation = WebCephAutomation()
+            # 브라우저 조작은 작업 엔진의 워커 스레드에서 실행 (UI 멈춤 방지)
+            def run_job(job):
+                # 이전 실행에서 열어 둔 브라우저 정리 후 새 파이프라인 생성
+                self._cleanup_browser(job.log)
+                self.pipeline = build_patient_pipeline(PipelineContext(patient_data, images))
+                self.webceph_automation = self.pipeline.context.automation
+                return self.run_pipeline(job, ['analysis_start', 'airtable_create'], (33, 66))
             
-            # 백그라운드에서 WebCeph 자동화 실행
-            QTimer.singleShot(1000, lambda: self.run_webceph_process(patient_data, images))
+            self.submit_job(AutomationJob("WebCeph 등록 및 업로드", run_job, step_id='webceph_analysis',
+                                          patient_data=patient_data))
             
         except Exception as e:
             self.add_log(f"❌ WebCeph 자동화 시작 실패: {str(e)}", "error")
             self.update_step_status('webceph_analysis', 'failed', "실패")
     
-    def run_webceph_process(self, patient_data, images):
-        """WebCeph 프로세스 실행 - 단계별 진행"""
+    def run_pipeline(self, job, targets, progress_range):
+        """파이프라인 대상 단계 실행 (작업 엔진 워커 스레드에서 실행)"""
         try:
-            # 브라우저 초기화
-            self.add_log("🌐 Chrome 브라우저를 초기화합니다...", "info")
-            self.webceph_automation.initialize_browser()
-            
-            # 로그인 정보 확인
-            username, password = config.get_credentials()
-            if not username or not password:
-                raise Exception("WebCeph 로그인 정보가 설정되지 않았습니다. 설정 탭에서 확인해주세요.")
-            
-            # 1-3단계: 순차적 WebCeph 로그인 및 신규 환자 클릭
-            self.add_log(f"🔐 WebCeph 로그인을 시작합니다... (사용자: {username})", "info")
-            self.webceph_automation.login(username, password)
-            
-            # 신규 환자 전체 프로세스 실행 (신규 ID 자동 감지 포함)
-            self.add_log("🆕 신규 환자 생성 및 자동 감지를 시작합니다...", "info")
-            
-            # 환자 데이터 확인 및 출력
-            if patient_data:
-                self.add_log("📋 OCR에서 추출된 환자 정보:", "info")
-                if patient_data.get('name'):
-                    self.add_log(f"  • 환자명: {patient_data.get('name')}", "success")
-                if patient_data.get('birth_date'):
-                    self.add_log(f"  • 생년월일: {patient_data.get('birth_date')}", "success")
-                if patient_data.get('registration_number'):
-                    self.add_log(f"  • 등록번호: {patient_data.get('registration_number')}", "success")
-                if patient_data.get('chart_no'):
-                    self.add_log(f"  • 차트번호: {patient_data.get('chart_no')}", "success")
-                if patient_data.get('gender'):
-                    self.add_log(f"  • 성별: {patient_data.get('gender')}", "success")
-                
-                # 신규 환자 버튼 클릭
-                self.add_log("🖱️ 신규 환자 입력 버튼을 클릭합니다...", "info")
-                self.webceph_automation.click_new_patient_button()
-                
-                # 신규 환자 폼 자동 작성
-                self.add_log("📝 신규 환자 폼을 자동으로 작성합니다...", "info")
-                self.webceph_automation.fill_patient_form(patient_data)
-                
-                # 신규 생성된 환자 자동 감지, 선택 및 레코드 생성
-                self.add_log("🔍 방금 생성된 신규 환자를 자동으로 감지하고 레코드를 생성합니다...", "info")
-                if self.webceph_automation.detect_and_select_new_patient(patient_data):
-                    self.add_log("✅ 신규 생성 환자 자동 선택 성공!", "success")
-                    
-                    # 최신 환자 ID 표시
-                    latest_id = self.webceph_automation.get_latest_patient_id()
-                    if latest_id:
-                        self.add_log(f"🆔 선택된 환자 ID: {latest_id}", "success")
-                    
-                    # 레코드 생성
-                    self.add_log("📋 환자 레코드를 생성합니다...", "info")
-                    if self.webceph_automation.create_patient_record(patient_data):
-                        self.add_log("✅ 레코드 생성 버튼 클릭 성공!", "success")
-                        
-                        # 레코드 정보 설정
-                        self.add_log("📝 레코드 정보를 설정합니다...", "info")
-                        self.webceph_automation.setup_record_info(patient_data)
-                        
-                        # 레코드 생성 확인
-                        self.add_log("✅ 레코드 생성을 확인합니다...", "info")
-                        if self.webceph_automation.confirm_record_creation():
-                            self.add_log("🎉 레코드 생성이 완료되었습니다!", "success")
-                            
-                            # 이미지 업로드 준비 상태 확인
-                            if self.webceph_automation.wait_for_record_ready():
-                                self.add_log("📸 이미지 업로드 준비 완료!", "success")
-                            else:
-                                self.add_log("⚠️ 이미지 업로드 준비 상태 확인 실패", "warning")
-                        else:
-                            self.add_log("⚠️ 레코드 생성 확인 실패", "warning")
-                    else:
-                        self.add_log("⚠️ 레코드 생성 실패 - 수동으로 진행해주세요", "warning")
-                else:
-                    self.add_log("⚠️ 신규 환자 자동 선택 실패 - 수동으로 환자를 선택해주세요", "warning")
-                
-            else:
-                self.add_log("📋 추출된 환자 정보가 없습니다", "warning")
-                self.add_log("🧪 테스트용 환자 데이터를 사용합니다", "info")
-                
-                # 테스트용 환자 데이터
-                test_patient_data = {
-                    'name': '김테스트',
-                    'first_name': '테스트',
-                    'last_name': '김',
-                    'birth_date': '1990-01-01',
-                    'chart_no': 'TEST001',
-                    'gender': 'M'
-                }
-                
-                # 신규 환자 버튼 클릭
-                self.add_log("🖱️ 신규 환자 입력 버튼을 클릭합니다...", "info")
-                self.webceph_automation.click_new_patient_button()
-                
-                self.add_log("📝 테스트 환자 폼을 작성합니다...", "info")
-                self.webceph_automation.fill_patient_form(test_patient_data)
-                
-                # 테스트 환자도 자동 감지 및 레코드 생성 시도
-                self.add_log("🔍 테스트 환자 자동 감지 및 레코드 생성을 시도합니다...", "info")
-                if self.webceph_automation.detect_and_select_new_patient(test_patient_data):
-                    self.add_log("✅ 테스트 환자 선택 성공!", "success")
-                    
-                    # 테스트 환자 레코드 생성
-                    self.add_log("📋 테스트 환자 레코드를 생성합니다...", "info")
-                    if self.webceph_automation.create_patient_record(test_patient_data):
-                        self.add_log("✅ 테스트 환자 레코드 생성 성공!", "success")
-                        self.webceph_automation.setup_record_info(test_patient_data)
-                        self.webceph_automation.confirm_record_creation()
-                        self.webceph_automation.wait_for_record_ready()
-                    else:
-                        self.add_log("⚠️ 테스트 환자 레코드 생성 실패", "warning")
-                else:
-                    self.add_log("⚠️ 테스트 환자 자동 선택 실패", "warning")
-            
-            # 성공 완료
-            self.add_log("✅ WebCeph 신규 환자 등록 및 선택이 완료되었습니다!", "success")
-            self.add_log("🎉 다음 단계: 이미지 업로드 및 분석 시작", "info")
-            
-            # 완료 처리
-            QTimer.singleShot(2000, self.complete_webceph_analysis)
-            
+            results = self.pipeline.run(job, targets, progress_range)
+            return {'patient_data': self.pipeline.context.patient_data, **results}
+        except JobCancelled:
+            raise
         except Exception as e:
-            self.add_log(f"❌ WebCeph 프로세스 오류: {str(e)}", "error")
-            self.update_step_status('webceph_analysis', 'failed', "실패")
-            self._cleanup_browser()
+            job.log(f"❌ WebCeph 프로세스 오류: {str(e)}", "error")
+            self._cleanup_browser(job.log)
+            raise
     
-    def _cleanup_browser(self):
-        """브라우저 정리"""
+    def _cleanup_browser(self, log=None):
+        """브라우저 정리 (워커 스레드에서는 job.log를 전달)"""
+        log = log or self.add_log
         try:
             if hasattr(self, 'webceph_automation') and self.webceph_automation.driver:
-                self.webceph_automation.driver.quit()
-                self.add_log("🧹 브라우저가 정리되었습니다", "info")
+                self.webceph_automation.close_browser()
+                log("🧹 브라우저가 정리되었습니다", "info")
         except Exception as e:
-            self.add_log(f"브라우저 정리 중 오류: {str(e)}", "warning")
+            log(f"브라우저 정리 중 오류: {str(e)}", "warning")
             
     def execute_pdf_download(self):
-        """PDF 전송하기"""
+        """PDF 전송하기 (파이프라인의 분석 대기 ~ Airtable 동기화 단계)"""
         try:
+            if self.pipeline is None:
+                QMessageBox.warning(self, "경고", "WebCeph 등록 및 업로드를 먼저 실행해주세요.")
+                return
                 
-            self.update_step_status('pdf_download', 'running', "실행 중...")
             self.add_log("PDF 전송을 시작합니다...", "info")
             
-            # PDF 전송 시뮬레이션
-            QTimer.singleShot(1500, lambda: self.simulate_pdf_download())
+            def run_job(job):
+                result = self.run_pipeline(job, ['airtable_sync'], (66, 100))
+                self._cleanup_browser(job.log)
+                job.log("모든 자동화 프로세스가 완료되었습니다! 🎉", "success")
+                return result
+            
+            self.submit_job(AutomationJob("PDF 전송", run_job, step_id='pdf_download',
+                                          patient_data=self.pipeline.context.patient_data))
             
         except Exception as e:
             self.update_step_status('pdf_download', 'failed', "실패")
             self.add_log(f"PDF 전송 실패: {str(e)}", "error")
-            
-    def simulate_webceph_analysis(self):
-        """WebCeph 분석 시뮬레이션"""
-        self.add_log("WebCeph에 로그인 중...", "info")
-        QTimer.singleShot(1000, lambda: self.add_log("환자 정보 등록 중...", "info"))
-        QTimer.singleShot(2000, lambda: self.add_log("이미지 업로드 중...", "info"))
-        QTimer.singleShot(3500, lambda: self.add_log("분석 시작...", "info"))
-        QTimer.singleShot(5000, lambda: self.complete_webceph_analysis())
-        
-    def complete_webceph_analysis(self):
-        """WebCeph 분석 완료"""
-        self.update_step_status('webceph_analysis', 'completed', "완료")
-        self.add_log("WebCeph 분석이 완료되었습니다.", "success")
-        self.update_progress(66)
-        
-    def simulate_pdf_download(self):
-        """PDF 다운로드 시뮬레이션"""
-        self.add_log("분석 결과 PDF 다운로드 중...", "info")
-        QTimer.singleShot(1000, lambda: self.add_log("Make.com Webhook으로 전송 중...", "info"))
-        QTimer.singleShot(2000, lambda: self.complete_pdf_download())
-        
-    def complete_pdf_download(self):
-        """PDF 다운로드 완료"""
-        self.update_step_status('pdf_download', 'completed', "완료")
-        self.add_log("PDF 전송이 완료되었습니다.", "success")
-        self.update_progress(100)
-        self.add_log("모든 자동화 프로세스가 완료되었습니다! 🎉", "success")
         
     def on_patient_info_extracted(self, patient_info):
         """환자 정보 추출 완료 처리"""
@@ -864,9 +788,81 @@ class AutomationFlowWidget(QWidget):
             self.add_log("💡 WebCeph 단계는 수동으로 진행해야 할 수 있습니다", "info")
         else:
             self.add_log("🎉 OCR 실행 및 환자 정보 추출이 완료되었습니다!", "success")
-            self.add_log("➡️ 다음 단계: WebCeph 등록 및 업로드", "info")
+            if not self.pipelined_mode:
+                self.add_log("➡️ 다음 단계: WebCeph 등록 및 업로드", "info")
+        
+        if self.pipelined_mode:
+            self.enqueue_patient(patient_info, dict(self.extracted_images))
+        else:
+            self.update_progress(33)
+    
+    def enqueue_patient(self, patient_data, images):
+        """연속 처리 모드: 환자 전체 처리(WebCeph 등록 ~ Airtable 동기화)를 대기열에 추가"""
+        name = patient_data.get('name') or "이름 없음"
+        
+        # 환자마다 별도 파이프라인/브라우저 사용 (작업 엔진이 제출 순서대로 하나씩 실행)
+        def run_job(job):
+            pipeline = build_patient_pipeline(PipelineContext(patient_data, images))
+            job.log(f"🚀 환자 '{name}' WebCeph 처리를 시작합니다", "info")
+            try:
+                results = pipeline.run(job)
+                job.log(f"🎉 환자 '{name}' 처리가 완료되었습니다", "success")
+                return {'patient_data': pipeline.context.patient_data, **results}
+            finally:
+                pipeline.context.automation.close_browser()
+        
+        self.submit_job(AutomationJob(f"환자 '{name}' 처리", run_job, patient_data=patient_data))
+        self.add_log(f"📥 환자 '{name}'을(를) 처리 대기열에 추가했습니다 "
+                     f"(대기 {self.job_engine.active_count()}/{self.queue_limit})", "info")
+        self.add_log("➡️ 다음 환자의 OCR을 바로 실행할 수 있습니다", "info")
+    
+    def retry_failed_jobs(self):
+        """실패/취소/중단된 환자 작업을 작업 저장소에서 찾아 다시 대기열에 추가 (재시작 후에도 가능)"""
+        try:
+            active = {job.patient_data.get('registration_number') for job in self.job_engine.get_jobs()
+                      if job.status in ('queued', 'running') and job.patient_data}
+            jobs = [job for job in get_job_store().get_retryable_jobs()
+                    if job['patient_data'].get('name') and job['registration_number'] not in active]
+        except Exception as e:
+            self.add_log(f"재시도 대상 조회 실패: {str(e)}", "error")
+            return
         
-        self.update_progress(33)
+        if not jobs:
+            QMessageBox.information(self, "재시도", "다시 처리할 실패 작업이 없습니다.")
+            return
+        
+        capacity = max(self.queue_limit - self.job_engine.active_count(), 0)
+        if capacity == 0:
+            QMessageBox.warning(self, "대기열 가득 참",
+                                f"처리 중인 환자가 {self.queue_limit}명입니다.\n앞선 환자의 처리가 끝난 뒤 다시 실행해주세요.")
+            return
+        
+        retry_jobs = jobs[:capacity]
+        names = ", ".join(job['patient_data']['name'] for job in retry_jobs)
+        reply = QMessageBox.question(
+            self,
+            "실패 작업 재시도",
+            f"실패/중단된 환자 {len(jobs)}명 중 {len(retry_jobs)}명을 다시 처리합니다.\n\n{names}",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+        if reply != QMessageBox.Yes:
+            return
+        
+        for job in retry_jobs:
+            self.add_log(f"🔁 이전 작업 재시도: {job['name']} ({job['error'] or job['status']})", "info")
+            self.enqueue_patient(job['patient_data'], {})
+    
+    def on_pipelined_mode_toggled(self, checked):
+        """연속 처리 모드 변경"""
+        self.pipelined_mode = checked
+        config.set('automation', 'pipelined_mode', str(checked).lower())
+        state = "켜짐" if checked else "꺼짐"
+        self.add_log(f"연속 처리 모드: {state}", "info")
+    
+    def on_queue_changed(self, active_count):
+        """처리 대기열 표시 업데이트 (대기 + 실행 중)"""
+        self.queue_label.setText(f"대기열: {active_count}/{self.queue_limit}")
         
     def on_automation_error(self, error_message):
         """자동화 오류 처리"""
@@ -879,6 +875,10 @@ class AutomationFlowWidget(QWidget):
         
     def update_step_status(self, step_id, status, status_text):
         """단계 상태 업데이트"""
+        # 파이프라인에서 건너뛴 세부 단계(예: 이미 추출된 환자의 OCR)는 화면 단계 상태를 바꾸지 않음
+        if status == 'skipped':
+            return
+        
         # automation_steps 업데이트
         for step in self.automation_steps:
             if step['id'] == step_id:
@@ -891,7 +891,7 @@ class AutomationFlowWidget(QWidget):
                 step_ui['status'].setText(status_text)
                 
                 # 상태에 따른 스타일 적용
-                if status == 'running':
+                if status in ('running', 'queued'):
                     step_ui['status'].setStyleSheet(f"color: {COLORS['primary_500']}; font-weight: 600;")
                     step_ui['button'].setEnabled(False)
                 elif status == 'completed':
@@ -909,6 +909,40 @@ class AutomationFlowWidget(QWidget):
                     step_ui['button'].setEnabled(True)
                 break
                 
+    def submit_job(self, job):
+        """이 화면의 작업으로 기록한 뒤 작업 엔진에 제출"""
+        self.job_ids.add(job.id)
+        return self.job_engine.submit(job)
+    
+    def on_job_log(self, job_id, message, level):
+        """작업 엔진 로그 표시"""
+        if job_id in self.job_ids:
+            self.add_log(message, level)
+    
+    def on_job_progress(self, job_id, value):
+        """작업 엔진 진행률 표시"""
+        if job_id in self.job_ids:
+            self.update_progress(value)
+    
+    def on_job_step_status(self, job_id, step_id, status, status_text):
+        """작업 엔진 단계 상태 표시"""
+        if job_id in self.job_ids:
+            self.update_step_status(step_id, status, status_text)
+    
+    def is_busy(self):
+        """자동화 작업이 실행 중인지 확인"""
+        return (self.job_engine.is_busy() or
+                bool(self.automation_worker and self.automation_worker.isRunning()))
+    
+    def shutdown(self):
+        """작업 엔진 종료 및 브라우저 정리 (창 닫기 시 호출)"""
+        if self.job_engine.stop():
+            self._cleanup_browser()
+        else:
+            # 작업이 아직 브라우저를 쓰고 있으므로 GUI 스레드에서 드라이버를 종료하지 않음
+            # (남은 Chrome 프로세스는 종료 시 browser_supervisor가 정리)
+            self.add_log("실행 중인 작업이 끝나지 않아 브라우저 정리를 종료 처리에 맡깁니다", "warning")
+    
     def update_progress(self, value):
         """진행률 업데이트"""
         self.progress_bar.setValue(value)
@@ -920,25 +954,8 @@ class AutomationFlowWidget(QWidget):
             self.progress_status.setText(f"{value}% 진행")
             
     def add_log(self, message, level="info"):
-        """로그 추가"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # 레벨에 따른 아이콘
-        level_icons = {
-            "info": "ℹ️",
-            "success": "✅",
-            "warning": "⚠️",
-            "error": "❌"
-        }
-        
-        icon = level_icons.get(level, "ℹ️")
-        log_entry = f"[{timestamp}] {icon} {message}"
-        
-        self.log_text.appendPlainText(log_entry)
-        
-        # 자동 스크롤
-        scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        """로그 추가 (화면 반영은 LogView가 모아서 처리)"""
+        self.log_text.add_entry(message, level)
         
     def clear_log(self):
         """로그 지우기"""
@@ -955,7 +972,7 @@ class AutomationFlowWidget(QWidget):
             log_file = log_dir / f"automation_log_{timestamp}.txt"
             
             with open(log_file, 'w', encoding='utf-8') as f:
-                f.write(self.log_text.toPlainText())
+                f.write(self.log_text.to_text())
                 
             self.add_log(f"로그가 저장되었습니다: {log_file.name}", "success")
             
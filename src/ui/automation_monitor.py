@@ -4,190 +4,21 @@ Use Case 문서의 자동화 프로세스를 실시간으로 모니터링하고
 """
 
 import time
-from datetime import datetime
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                            QLabel, QPushButton, QProgressBar, QTextEdit,
                            QFrame, QScrollArea, QGroupBox, QListWidget,
                            QListWidgetItem, QSplitter, QMessageBox, 
                            QTabWidget)
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QThread, QMutex
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QMovie, QPixmap, QColor
 
 from .styles import COLORS
+from .log_view import LogView
 from ..utils.font_loader import font_loader
-from ..automation.web_ceph_automation import WebCephAutomation
+from ..automation.job_engine import AutomationJob, get_job_engine
+from ..automation.pipeline import PipelineContext, build_patient_pipeline, patient_pipeline_steps
 from ..config import config
 
-class AutomationWorker(QThread):
-    """자동화 작업을 실행하는 워커 스레드"""
-    
-    # 시그널 정의
-    step_started = pyqtSignal(str, str)  # step_name, description
-    step_completed = pyqtSignal(str, bool, str)  # step_name, success, message
-    progress_updated = pyqtSignal(int)  # percentage
-    log_message = pyqtSignal(str, str)  # message, level (info, warning, error)
-    automation_finished = pyqtSignal(bool, str)  # success, final_message
-    
-    def __init__(self, patient_data, images):
-        super().__init__()
-        self.patient_data = patient_data
-        self.images = images
-        self.automation = WebCephAutomation()
-        self.is_paused = False
-        self.should_stop = False
-        self.mutex = QMutex()
-    
-    def run(self):
-        """자동화 프로세스 실행"""
-        try:
-            self.log_message.emit("자동화 프로세스를 시작합니다...", "info")
-            
-            steps = [
-                ("browser_launch", "브라우저 실행", self.launch_browser),
-                ("login", "Web Ceph 로그인", self.login_webceph),
-                ("patient_register", "환자 등록", self.register_patient),
-                ("image_upload", "이미지 업로드", self.upload_images),
-                ("analysis_start", "분석 시작", self.start_analysis),
-                ("analysis_wait", "분석 대기", self.wait_analysis),
-                ("pdf_download", "PDF 다운로드", self.download_pdf),
-                ("airtable_sync", "Airtable 동기화", self.sync_airtable)
-            ]
-            
-            total_steps = len(steps)
-            
-            for i, (step_id, step_name, step_func) in enumerate(steps):
-                if self.should_stop:
-                    break
-                
-                # 일시정지 체크
-                while self.is_paused and not self.should_stop:
-                    self.msleep(100)
-                
-                if self.should_stop:
-                    break
-                
-                # 단계 시작
-                self.step_started.emit(step_id, step_name)
-                
-                try:
-                    # 단계 실행
-                    success, message = step_func()
-                    
-                    # 결과 처리
-                    self.step_completed.emit(step_id, success, message)
-                    
-                    if not success:
-                        self.automation_finished.emit(False, f"{step_name} 실패: {message}")
-                        return
-                    
-                    # 진행률 업데이트
-                    progress = int(((i + 1) / total_steps) * 100)
-                    self.progress_updated.emit(progress)
-                    
-                except Exception as e:
-                    error_msg = f"{step_name} 중 오류 발생: {str(e)}"
-                    self.step_completed.emit(step_id, False, error_msg)
-                    self.automation_finished.emit(False, error_msg)
-                    return
-            
-            if not self.should_stop:
-                self.automation_finished.emit(True, "모든 작업이 성공적으로 완료되었습니다!")
-                
-        except Exception as e:
-            self.automation_finished.emit(False, f"예상치 못한 오류가 발생했습니다: {str(e)}")
-    
-    def launch_browser(self):
-        """브라우저 실행"""
-        self.log_message.emit("Chrome 브라우저를 실행합니다...", "info")
-        self.msleep(2000)  # 시뮬레이션
-        return True, "브라우저가 성공적으로 실행되었습니다"
-    
-    def login_webceph(self):
-        """Web Ceph 로그인"""
-        self.log_message.emit("Web Ceph에 로그인합니다...", "info")
-        self.msleep(3000)  # 시뮬레이션
-        return True, "로그인이 완료되었습니다"
-    
-    def register_patient(self):
-        """환자 등록"""
-        patient = self.patient_data
-        self.log_message.emit(f"환자 '{patient['name']}'을(를) 등록합니다...", "info")
-        self.msleep(2500)  # 시뮬레이션
-        return True, f"환자 {patient['name']}이(가) 성공적으로 등록되었습니다"
-    
-    def upload_images(self):
-        """이미지 업로드"""
-        self.log_message.emit("X-ray 이미지를 업로드합니다...", "info")
-        self.msleep(4000)  # 시뮬레이션
-        
-        self.log_message.emit("얼굴 사진을 업로드합니다...", "info")
-        self.msleep(3000)  # 시뮬레이션
-        
-        return True, "모든 이미지가 성공적으로 업로드되었습니다"
-    
-    def start_analysis(self):
-        """분석 시작"""
-        self.log_message.emit("분석을 시작합니다...", "info")
-        self.msleep(1500)  # 시뮬레이션
-        return True, "분석이 시작되었습니다"
-    
-    def wait_analysis(self):
-        """분석 대기"""
-        self.log_message.emit("분석이 진행 중입니다. 완료까지 대기합니다...", "info")
-        
-        # 분석 대기 시뮬레이션 (30초)
-        for i in range(30):
-            if self.should_stop:
-                return False, "작업이 중단되었습니다"
-            
-            while self.is_paused and not self.should_stop:
-                self.msleep(100)
-            
-            self.msleep(1000)
-            
-            if i % 5 == 0:
-                self.log_message.emit(f"분석 진행 중... ({i+1}/30초)", "info")
-        
-        return True, "분석이 완료되었습니다"
-    
-    def download_pdf(self):
-        """PDF 다운로드"""
-        self.log_message.emit("분석 결과 PDF를 다운로드합니다...", "info")
-        self.msleep(3000)  # 시뮬레이션
-        
-        # 파일명 생성
-        patient_name = self.patient_data['name']
-        reg_num = self.patient_data['registration_number']
-        date_str = datetime.now().strftime("%Y%m%d")
-        filename = f"{patient_name}_{reg_num}_{date_str}.pdf"
-        
-        return True, f"PDF 파일이 다운로드되었습니다: {filename}"
-    
-    def sync_airtable(self):
-        """Airtable 동기화"""
-        self.log_message.emit("Airtable에 결과를 동기화합니다...", "info")
-        self.msleep(2000)  # 시뮬레이션
-        return True, "Airtable 동기화가 완료되었습니다"
-    
-    def pause(self):
-        """작업 일시정지"""
-        self.mutex.lock()
-        self.is_paused = True
-        self.mutex.unlock()
-    
-    def resume(self):
-        """작업 재개"""
-        self.mutex.lock()
-        self.is_paused = False
-        self.mutex.unlock()
-    
-    def stop(self):
-        """작업 중단"""
-        self.mutex.lock()
-        self.should_stop = True
-        self.is_paused = False
-        self.mutex.unlock()
-
 class StepIndicatorWidget(QFrame):
     """단계 표시 위젯"""
     
@@ -317,43 +148,28 @@ class LogWidget(QFrame):
         clear_btn.setProperty("class", "ghost")
         clear_btn.clicked.connect(self.clear_log)
         
+        # 로그 텍스트 (최대 줄 수 제한, 일괄 갱신)
+        self.log_text = LogView(colors={
+            'timestamp': COLORS['gray_500'],
+            'info': COLORS['gray_700'],
+            'success': COLORS['success_500'],
+            'warning': COLORS['warning_500'],
+            'error': COLORS['error_500']
+        })
+        self.log_text.setFont(font_loader.get_font('Regular', 11))
+        self.log_text.setMaximumHeight(200)
+        
         header_layout.addWidget(title_label)
         header_layout.addStretch()
+        header_layout.addWidget(self.log_text.create_filter_combo())
         header_layout.addWidget(clear_btn)
         
-        # 로그 텍스트
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setFont(font_loader.get_font('Regular', 11))
-        self.log_text.setMaximumHeight(200)
-        
         layout.addLayout(header_layout)
         layout.addWidget(self.log_text)
     
     def add_log(self, message, level="info"):
-        """로그 메시지 추가"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        if level == "error":
-            color = COLORS['error_500']
-            prefix = "❌"
-        elif level == "warning":
-            color = COLORS['warning_500']
-            prefix = "⚠️"
-        elif level == "success":
-            color = COLORS['success_500']
-            prefix = "✅"
-        else:
-            color = COLORS['gray_700']
-            prefix = "ℹ️"
-        
-        formatted_message = f'<span style="color: {COLORS["gray_500"]}">[{timestamp}]</span> <span style="color: {color}">{prefix} {message}</span>'
-        
-        self.log_text.append(formatted_message)
-        
-        # 자동 스크롤
-        scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        """로그 메시지 추가 (화면 반영은 LogView가 모아서 처리)"""
+        self.log_text.add_entry(message, level)
     
     def clear_log(self):
         """로그 지우기"""
@@ -364,10 +180,19 @@ class AutomationMonitorWidget(QWidget):
     
     def __init__(self):
         super().__init__()
-        self.automation_worker = None
+        self.current_job = None
+        self.pipeline = None
         self.step_widgets = {}
         self.is_running = False
         
+        # 파이프라인은 공유 작업 엔진에서 실행하고 이 위젯은 자기 작업의 시그널로 상태만 표시
+        self.job_engine = get_job_engine()
+        self.job_engine.step_status_changed.connect(self.on_step_status_changed)
+        self.job_engine.progress_changed.connect(self.on_progress_updated)
+        self.job_engine.log_message.connect(self.on_log_message)
+        self.job_engine.job_finished.connect(self.on_job_finished)
+        self.job_engine.job_failed.connect(self.on_job_failed)
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -440,7 +265,7 @@ class AutomationMonitorWidget(QWidget):
         self.overall_progress.setMinimumHeight(8)
         self.overall_progress.setValue(0)
         
-        self.progress_label = QLabel("0/8 단계 완료")
+        self.progress_label = QLabel("0% 완료")
         self.progress_label.setFont(font_loader.get_font('Regular', 12))
         self.progress_label.setStyleSheet(f"color: {COLORS['gray_500']};")
         
@@ -473,22 +298,21 @@ class AutomationMonitorWidget(QWidget):
         
         parent.addWidget(progress_widget)
     
-    def create_step_widgets(self):
-        """단계 위젯들 생성"""
-        steps = [
-            ("browser_launch", "브라우저 실행", "Chrome 브라우저를 실행합니다"),
-            ("login", "Web Ceph 로그인", "Web Ceph 웹사이트에 로그인합니다"),
-            ("patient_register", "환자 등록", "새 환자 정보를 등록합니다"),
-            ("image_upload", "이미지 업로드", "X-ray와 얼굴 사진을 업로드합니다"),
-            ("analysis_start", "분석 시작", "자동 분석을 시작합니다"),
-            ("analysis_wait", "분석 대기", "분석 완료까지 대기합니다"),
-            ("pdf_download", "PDF 다운로드", "분석 결과를 다운로드합니다"),
-            ("airtable_sync", "Airtable 동기화", "결과를 Airtable에 저장합니다")
-        ]
-        
-        for step_id, step_name, description in steps:
-            step_widget = StepIndicatorWidget(step_id, step_name, description)
-            self.step_widgets[step_id] = step_widget
+    def create_step_widgets(self, steps=None):
+        """단계 위젯들 생성 (파이프라인 단계 정의 기준)"""
+        # 기존 위젯 제거
+        while self.steps_layout.count():
+            item = self.steps_layout.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+        self.step_widgets = {}
+        
+        if steps is None:
+            steps = patient_pipeline_steps()
+        
+        for step in steps:
+            step_widget = StepIndicatorWidget(step.id, step.name, step.description)
+            self.step_widgets[step.id] = step_widget
             self.steps_layout.addWidget(step_widget)
         
         self.steps_layout.addStretch()
@@ -540,21 +364,22 @@ class AutomationMonitorWidget(QWidget):
             QMessageBox.warning(self, "경고", "이미 실행 중인 작업이 있습니다.")
             return
         
-        # 초기화
+        # 파이프라인 생성 및 단계 표시 초기화
+        self.pipeline = build_patient_pipeline(PipelineContext(patient_data, images))
+        self.create_step_widgets(self.pipeline.get_steps())
         self.reset_progress()
         
-        # 워커 스레드 생성
-        self.automation_worker = AutomationWorker(patient_data, images)
+        pipeline = self.pipeline
         
-        # 시그널 연결
-        self.automation_worker.step_started.connect(self.on_step_started)
-        self.automation_worker.step_completed.connect(self.on_step_completed)
-        self.automation_worker.progress_updated.connect(self.on_progress_updated)
-        self.automation_worker.log_message.connect(self.on_log_message)
-        self.automation_worker.automation_finished.connect(self.on_automation_finished)
+        def run_pipeline(job):
+            try:
+                return pipeline.run(job)
+            finally:
+                pipeline.context.automation.close_browser()
         
-        # 시작
-        self.automation_worker.start()
+        self.current_job = AutomationJob(f"환자 '{patient_data['name']}' 처리", run_pipeline,
+                                         patient_data=patient_data)
+        self.job_engine.submit(self.current_job)
         self.is_running = True
         
         # UI 상태 업데이트
@@ -568,36 +393,48 @@ class AutomationMonitorWidget(QWidget):
     def reset_progress(self):
         """진행 상황 초기화"""
         self.overall_progress.setValue(0)
-        self.progress_label.setText("0/8 단계 완료")
+        self.progress_label.setText(f"0/{len(self.step_widgets)} 단계 완료")
         
         for step_widget in self.step_widgets.values():
             step_widget.set_status("pending")
     
-    def on_step_started(self, step_id, step_name):
-        """단계 시작 처리"""
-        if step_id in self.step_widgets:
-            self.step_widgets[step_id].set_status("active", "진행 중...")
+    def on_step_status_changed(self, job_id, step_id, status, message):
+        """단계 상태 변경 처리 (파이프라인 → 단계 위젯)"""
+        if not self.current_job or job_id != self.current_job.id or step_id not in self.step_widgets:
+            return
         
-        self.log_widget.add_log(f"{step_name} 시작", "info")
-    
-    def on_step_completed(self, step_id, success, message):
-        """단계 완료 처리"""
-        if step_id in self.step_widgets:
-            status = "completed" if success else "failed"
+        if status == 'running':
+            self.step_widgets[step_id].set_status("active", "진행 중...")
+        elif status == 'skipped':
+            self.step_widgets[step_id].set_status("completed", message)
+        elif status in ('completed', 'failed'):
             self.step_widgets[step_id].set_status(status, message)
-        
-        level = "success" if success else "error"
-        self.log_widget.add_log(message, level)
     
-    def on_progress_updated(self, percentage):
+    def on_progress_updated(self, job_id, percentage):
         """진행률 업데이트"""
+        if not self.current_job or job_id != self.current_job.id:
+            return
         self.overall_progress.setValue(percentage)
-        completed_steps = int((percentage / 100) * 8)
-        self.progress_label.setText(f"{completed_steps}/8 단계 완료 ({percentage}%)")
+        completed_steps = sum(1 for status in self.pipeline.status.values() if status in ('completed', 'skipped'))
+        self.progress_label.setText(f"{completed_steps}/{len(self.step_widgets)} 단계 완료 ({percentage}%)")
     
-    def on_log_message(self, message, level):
+    def on_log_message(self, job_id, message, level):
         """로그 메시지 처리"""
-        self.log_widget.add_log(message, level)
+        if self.current_job and job_id == self.current_job.id:
+            self.log_widget.add_log(message, level)
+    
+    def on_job_finished(self, job_id, result):
+        """파이프라인 완료 처리"""
+        if self.current_job and job_id == self.current_job.id:
+            self.on_automation_finished(True, "모든 작업이 성공적으로 완료되었습니다!")
+    
+    def on_job_failed(self, job_id, error_message):
+        """파이프라인 실패/중단 처리"""
+        if self.current_job and job_id == self.current_job.id and self.is_running:
+            if self.current_job.status == 'cancelled':
+                self.on_automation_stopped()
+            else:
+                self.on_automation_finished(False, error_message)
     
     def on_automation_finished(self, success, message):
         """자동화 완료 처리"""
@@ -622,22 +459,22 @@ class AutomationMonitorWidget(QWidget):
             QMessageBox.warning(self, "실패", message)
     
     def pause_automation(self):
-        """자동화 일시정지"""
-        if self.automation_worker and self.is_running:
+        """자동화 일시정지 (진행 중인 단계가 끝난 뒤 멈춤)"""
+        if self.current_job and self.is_running:
             if self.pause_btn.text() == "⏸️ 일시정지":
-                self.automation_worker.pause()
+                self.current_job.pause()
                 self.pause_btn.setText("▶️ 재개")
                 self.status_label.setText("일시정지됨")
-                self.log_widget.add_log("자동화가 일시정지되었습니다", "warning")
+                self.log_widget.add_log("현재 단계가 끝나면 자동화가 일시정지됩니다", "warning")
             else:
-                self.automation_worker.resume()
+                self.current_job.resume()
                 self.pause_btn.setText("⏸️ 일시정지")
                 self.status_label.setText("진행 중...")
                 self.log_widget.add_log("자동화가 재개되었습니다", "info")
     
     def stop_automation(self):
         """자동화 중단"""
-        if self.automation_worker and self.is_running:
+        if self.current_job and self.is_running:
             reply = QMessageBox.question(
                 self,
                 "중단 확인",
@@ -647,16 +484,23 @@ class AutomationMonitorWidget(QWidget):
             )
             
             if reply == QMessageBox.Yes:
-                self.automation_worker.stop()
-                self.automation_worker.wait(3000)  # 3초 대기
-                
-                self.is_running = False
-                self.status_label.setText("중단됨")
+                # 진행 중인 단계가 끝나면 중단 (완료 시 on_automation_stopped 호출)
+                self.current_job.cancel()
+                self.status_label.setText("중단 중...")
                 self.pause_btn.setEnabled(False)
                 self.stop_btn.setEnabled(False)
-                self.restart_btn.setEnabled(True)
-                
-                self.log_widget.add_log("사용자에 의해 자동화가 중단되었습니다", "warning")
+                self.log_widget.add_log("현재 단계가 끝나면 자동화를 중단합니다", "warning")
+    
+    def on_automation_stopped(self):
+        """자동화 중단 완료 처리"""
+        self.is_running = False
+        self.status_label.setText("중단됨")
+        self.pause_btn.setText("⏸️ 일시정지")
+        self.pause_btn.setEnabled(False)
+        self.stop_btn.setEnabled(False)
+        self.restart_btn.setEnabled(True)
+        
+        self.log_widget.add_log("사용자에 의해 자동화가 중단되었습니다", "warning")
     
     def restart_automation(self):
         """자동화 재시작"""
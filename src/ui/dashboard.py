@@ -3,6 +3,7 @@
 오늘의 처리 현황, 빠른 실행 버튼, 최근 활동 목록을 표시하는 메인 대시보드
 """
 
+from datetime import datetime
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                            QLabel, QPushButton, QFrame, QScrollArea,
                            QTableWidget, QTableWidgetItem, QHeaderView,
@@ -13,6 +14,8 @@ from PyQt5.QtGui import QPixmap, QPainter, QColor
 from .styles import COLORS
 from ..utils.font_loader import font_loader
 from ..config import config
+from ..automation.job_store import get_job_store
+from ..utils.tracing import tracer
 
 class StatCardWidget(QFrame):
     """통계 카드 위젯"""
@@ -212,22 +215,28 @@ class RecentActivityWidget(QFrame):
         self.activity_table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.activity_table.setMaximumHeight(200)
         
-        # 샘플 데이터 추가
-        self.load_sample_data()
-    
-    def load_sample_data(self):
-        """샘플 데이터 로드"""
-        sample_data = [
-            ("10:30", "홍길동", "X-ray 분석 완료", "✅ 성공"),
-            ("10:15", "김철수", "얼굴 사진 업로드", "🔄 진행중"),
-            ("09:45", "이영희", "PDF 다운로드", "✅ 성공"),
-            ("09:30", "박민수", "환자 등록", "❌ 실패"),
-            ("09:15", "최지영", "일괄 처리 시작", "✅ 성공")
+    STATUS_LABELS = {
+        'queued': "🔄 진행중",
+        'running': "🔄 진행중",
+        'completed': "✅ 성공",
+        'failed': "❌ 실패",
+        'cancelled': "⏹️ 취소",
+        'interrupted': "⚠️ 중단"
+    }
+    
+    def load_activities(self, jobs):
+        """작업 저장소의 최근 작업 표시"""
+        activities = [
+            (datetime.fromtimestamp(job['created_at']).strftime('%H:%M'),
+             job['patient_name'] or "-",
+             job['name'],
+             self.STATUS_LABELS.get(job['status'], job['status']))
+            for job in jobs
         ]
         
-        self.activity_table.setRowCount(len(sample_data))
+        self.activity_table.setRowCount(len(activities))
         
-        for row, (time, patient, task, status) in enumerate(sample_data):
+        for row, (time, patient, task, status) in enumerate(activities):
             self.activity_table.setItem(row, 0, QTableWidgetItem(time))
             self.activity_table.setItem(row, 1, QTableWidgetItem(patient))
             self.activity_table.setItem(row, 2, QTableWidgetItem(task))
@@ -246,6 +255,54 @@ class RecentActivityWidget(QFrame):
         """스타일 설정"""
         pass
 
+class StepLatencyWidget(QFrame):
+    """단계별 소요 시간 위젯 (최근 측정값 기준 p50/p95)"""
+    
+    def __init__(self):
+        super().__init__()
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """UI 설정"""
+        self.setProperty("class", "card")
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+        layout.setSpacing(16)
+        
+        title_label = QLabel("단계별 소요 시간")
+        title_label.setFont(font_loader.get_font('SemiBold', 16))
+        title_label.setStyleSheet(f"color: {COLORS['gray_800']};")
+        title_label.setToolTip(f"상세 기록: {tracer.trace_file}")
+        
+        self.latency_table = QTableWidget()
+        self.latency_table.setColumnCount(4)
+        self.latency_table.setHorizontalHeaderLabels(["단계", "횟수", "p50 (초)", "p95 (초)"])
+        header = self.latency_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, 4):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        self.latency_table.setAlternatingRowColors(True)
+        self.latency_table.setMaximumHeight(200)
+        
+        layout.addWidget(title_label)
+        layout.addWidget(self.latency_table)
+    
+    def load_summary(self, summary):
+        """span 요약 표시 (p95가 큰 단계부터)"""
+        rows = sorted(summary.items(), key=lambda item: item[1]['p95'], reverse=True)
+        self.latency_table.setRowCount(len(rows))
+        
+        for row, (name, stats) in enumerate(rows):
+            self.latency_table.setItem(row, 0, QTableWidgetItem(name))
+            self.latency_table.setItem(row, 1, QTableWidgetItem(str(stats['count'])))
+            self.latency_table.setItem(row, 2, QTableWidgetItem(f"{stats['p50'] / 1000:.1f}"))
+            self.latency_table.setItem(row, 3, QTableWidgetItem(f"{stats['p95'] / 1000:.1f}"))
+            
+            # 1분 목표를 넘는 단계 강조
+            if stats['p95'] >= 60000:
+                self.latency_table.item(row, 3).setForeground(QColor(COLORS['error_500']))
+
 class DashboardWidget(QWidget):
     """대시보드 메인 위젯"""
     
@@ -276,6 +333,10 @@ class DashboardWidget(QWidget):
         # 빠른 실행 및 최근 활동 섹션
         self.create_action_section(main_layout)
         
+        # 단계별 소요 시간 섹션
+        self.step_latency_widget = StepLatencyWidget()
+        main_layout.addWidget(self.step_latency_widget)
+        
         # 시스템 상태 섹션
         self.create_system_status(main_layout)
         
@@ -309,28 +370,43 @@ class DashboardWidget(QWidget):
         stats_layout = QGridLayout()
         stats_layout.setSpacing(16)
         
-        # 통계 카드들 생성
+        # 통계 카드들 생성 (작업 저장소 집계는 환자가 아니라 자동화 작업 단위)
         self.stats_cards['completed'] = StatCardWidget(
-            "처리 완료", 0, "건", "✅", "success"
+            "완료된 작업", 0, "건", "✅", "success"
         )
         
         self.stats_cards['processing'] = StatCardWidget(
-            "처리 중", 0, "건", "🔄", "info"
+            "대기/실행 중 작업", 0, "건", "🔄", "info"
         )
         
         self.stats_cards['failed'] = StatCardWidget(
-            "실패", 0, "건", "❌", "error"
+            "실패한 작업", 0, "건", "❌", "error"
         )
         
         self.stats_cards['total_time'] = StatCardWidget(
-            "총 처리 시간", 0, "분", "⏱️", "primary"
+            "총 작업 시간", 0, "분", "⏱️", "primary"
+        )
+        
+        self.stats_cards['average_time'] = StatCardWidget(
+            "작업당 평균 시간", 0, "초", "⏳", "primary"
+        )
+        
+        self.stats_cards['step_p95'] = StatCardWidget(
+            "최장 단계 p95", 0, "초", "📈", "info"
         )
         
-        # 그리드에 배치 (2x2)
+        job_hint = ("WebCeph 자동화 작업 기준입니다.\n"
+                    "단계별로 실행하면 환자 1명이 작업 2건(등록/업로드, PDF 전송)이며, OCR은 포함되지 않습니다.")
+        for key in ('completed', 'processing', 'failed', 'total_time', 'average_time'):
+            self.stats_cards[key].setToolTip(job_hint)
+        
+        # 그리드에 배치 (2x3)
         stats_layout.addWidget(self.stats_cards['completed'], 0, 0)
         stats_layout.addWidget(self.stats_cards['processing'], 0, 1)
-        stats_layout.addWidget(self.stats_cards['failed'], 1, 0)
-        stats_layout.addWidget(self.stats_cards['total_time'], 1, 1)
+        stats_layout.addWidget(self.stats_cards['failed'], 0, 2)
+        stats_layout.addWidget(self.stats_cards['total_time'], 1, 0)
+        stats_layout.addWidget(self.stats_cards['average_time'], 1, 1)
+        stats_layout.addWidget(self.stats_cards['step_p95'], 1, 2)
         
         layout.addLayout(stats_layout)
     
@@ -474,37 +550,36 @@ class DashboardWidget(QWidget):
     
     def load_initial_data(self):
         """초기 데이터 로드"""
-        # 샘플 데이터로 초기화
-        self.stats_cards['completed'].update_value(24)
-        self.stats_cards['processing'].update_value(3)
-        self.stats_cards['failed'].update_value(1)
-        self.stats_cards['total_time'].update_value(125)
+        self.refresh_data()
     
     def refresh_data(self):
-        """데이터 새로고침"""
-        # 실제 구현에서는 데이터베이스나 로그 파일에서 데이터 조회
-        # 현재는 시뮬레이션을 위한 랜덤 값
-        import random
-        
-        # 통계 업데이트 (약간의 변화)
-        current_completed = int(self.stats_cards['completed'].value_label.text())
-        if random.random() > 0.7:  # 30% 확률로 업데이트
-            self.stats_cards['completed'].update_value(current_completed + random.randint(0, 2))
-        
-        current_processing = int(self.stats_cards['processing'].value_label.text())
-        if random.random() > 0.8:  # 20% 확률로 업데이트
-            self.stats_cards['processing'].update_value(max(0, current_processing + random.randint(-1, 1)))
+        """데이터 새로고침 (작업 저장소의 일별 집계를 읽으므로 이력 크기와 무관)"""
+        try:
+            store = get_job_store()
+            stats = store.get_daily_stats()
+            self.update_stats(self._format_stats(stats, store.count_active()))
+            self.recent_activity_widget.load_activities(store.list_jobs(limit=10))
+            self.step_latency_widget.load_summary(tracer.summary())
+        except Exception as e:
+            print(f"대시보드 데이터 조회 오류: {e}")
     
-
+    def _format_stats(self, stats, processing):
+        """일별 작업 집계를 카드 표시 값으로 변환 (환자 수가 아닌 작업 건수)"""
+        average = stats['average_duration']
+        slowest_p95 = max(stats['step_p95'].values(), default=None)
+        return {
+            'completed': stats['completed'],
+            'processing': processing,
+            'failed': stats['failed'] + stats['interrupted'],
+            'total_time': round(stats['total_duration'] / 60),
+            'average_time': round(average) if average is not None else "-",
+            'step_p95': round(slowest_p95) if slowest_p95 is not None else "-"
+        }
     
     def get_today_stats(self):
         """오늘의 통계 데이터 반환"""
-        return {
-            'completed': int(self.stats_cards['completed'].value_label.text()),
-            'processing': int(self.stats_cards['processing'].value_label.text()),
-            'failed': int(self.stats_cards['failed'].value_label.text()),
-            'total_time': int(self.stats_cards['total_time'].value_label.text())
-        }
+        store = get_job_store()
+        return self._format_stats(store.get_daily_stats(), store.count_active())
     
     def update_stats(self, stats_data):
         """통계 데이터 업데이트"""
@@ -514,22 +589,8 @@ class DashboardWidget(QWidget):
     
     def update_daily_stats(self):
         """일일 통계 업데이트"""
-        try:
-            # 실제 구현에서는 데이터베이스나 로그에서 통계를 가져옴
-            # 현재는 간단한 증가로 시뮬레이션
-            current_completed = int(self.stats_cards['completed'].value_label.text())
-            self.stats_cards['completed'].update_value(current_completed + 1)
-            
-            # 최근 활동에 새 항목 추가
-            current_time = QDateTime.currentDateTime().toString('HH:mm')
-            self.add_recent_activity(
-                current_time,
-                "자동화 환자",
-                "자동화 프로세스 완료",
-                "✅ 성공"
-            )
-        except Exception as e:
-            print(f"일일 통계 업데이트 오류: {e}")
+        # 작업 종료 시 작업 저장소의 집계가 이미 갱신되어 있으므로 다시 읽기만 함
+        self.refresh_data()
     
     def add_recent_activity(self, time, patient, task, status):
         """최근 활동에 새 항목 추가"""
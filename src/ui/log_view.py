@@ -0,0 +1,160 @@
+"""
+로그 뷰 위젯
+최근 로그만 링 버퍼로 보관하고, 여러 스레드에서 들어온 로그를 약 50ms마다 한 번에 화면에 반영
+레벨 필터는 문서를 다시 만들지 않고 줄(블록) 표시 여부만 바꿈
+"""
+
+import threading
+from collections import deque
+from datetime import datetime
+from PyQt5.QtWidgets import QPlainTextEdit, QComboBox
+from PyQt5.QtCore import pyqtSignal, QTimer
+from PyQt5.QtGui import QColor, QTextCursor, QTextCharFormat
+
+from ..config import config
+
+# 레벨별 아이콘과 필터 순위 (success는 info와 같은 순위)
+LEVEL_ICONS = {
+    "info": "ℹ️",
+    "success": "✅",
+    "warning": "⚠️",
+    "error": "❌"
+}
+LEVEL_RANKS = {"info": 0, "success": 0, "warning": 1, "error": 2}
+
+# 블록 안 줄바꿈 (insertText의 "\n"은 새 블록이 되어 필터/최대 줄 수가 항목 단위로 동작하지 않음)
+LINE_SEPARATOR = "\u2028"
+
+# 필터 선택 항목 (표시 이름, 최소 순위)
+LEVEL_FILTERS = [("전체", 0), ("경고 이상", 1), ("오류만", 2)]
+
+class LogView(QPlainTextEdit):
+    """최대 항목 수가 제한된 일괄 갱신 로그 뷰 (항목 하나가 블록 하나)
+
+    add_entry()는 어느 스레드에서 호출해도 되며 버퍼에 쌓기만 합니다.
+    화면 반영은 GUI 스레드의 타이머(flush_interval)에서 한 번의 편집으로 처리하고,
+    사용자가 스크롤을 올려 둔 경우에는 맨 아래로 이동하지 않습니다.
+    """
+
+    flush_requested = pyqtSignal()
+
+    def __init__(self, max_lines: int = None, colors: dict = None, flush_interval: int = 50, parent=None):
+        super().__init__(parent)
+        self.max_lines = max_lines or config.get_int('general', 'log_max_lines', 2000)
+        self.colors = colors
+        self.min_rank = 0
+        self.lock = threading.Lock()
+        self.entries = deque(maxlen=self.max_lines)
+        self.pending = deque(maxlen=self.max_lines)
+        self.flush_scheduled = False
+
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(self.max_lines)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(flush_interval)
+        self.flush_timer.timeout.connect(self.flush)
+        # 작업 스레드에서 emit해도 GUI 스레드에서 타이머가 시작되도록 시그널로 연결
+        self.flush_requested.connect(self._start_flush_timer)
+
+    def add_entry(self, message: str, level: str = "info"):
+        """로그 추가 (화면 반영은 다음 flush에서)"""
+        entry = (datetime.now().strftime("%H:%M:%S"), f"{LEVEL_ICONS.get(level, 'ℹ️')} {message}", level)
+        with self.lock:
+            self.entries.append(entry)
+            self.pending.append(entry)
+            schedule = not self.flush_scheduled
+            self.flush_scheduled = True
+        if schedule:
+            self.flush_requested.emit()
+
+    def _start_flush_timer(self):
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def _format(self, color_key: str) -> QTextCharFormat:
+        text_format = QTextCharFormat()
+        if self.colors and color_key in self.colors:
+            text_format.setForeground(QColor(self.colors[color_key]))
+        return text_format
+
+    def flush(self):
+        """대기 중인 로그를 한 번의 편집으로 문서에 추가"""
+        with self.lock:
+            batch = list(self.pending)
+            self.pending.clear()
+            self.flush_scheduled = False
+        if not batch:
+            return
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        time_format = self._format('timestamp')
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        hidden = False
+        first = self.document().isEmpty()
+        for timestamp, text, level in batch:
+            if not first:
+                cursor.insertBlock()
+            first = False
+            cursor.insertText(f"[{timestamp}] ", time_format)
+            # 여러 줄 메시지(예: 오류 추적)도 한 블록으로 넣어 레벨 필터에서 함께 숨기고 보이도록 함
+            cursor.insertText(text.replace("\r\n", "\n").replace("\n", LINE_SEPARATOR), self._format(level))
+            rank = LEVEL_RANKS.get(level, 0)
+            block = cursor.block()
+            block.setUserState(rank)
+            block.setVisible(rank >= self.min_rank)
+            hidden = hidden or rank < self.min_rank
+        cursor.endEditBlock()
+        if hidden:
+            # 숨긴 줄이 높이를 차지하지 않도록 추가한 구간만 다시 배치
+            # (최대 줄 수 초과로 앞부분이 잘려 위치가 바뀌므로 마지막 블록부터 역산)
+            document = self.document()
+            block = document.lastBlock()
+            for _ in range(min(len(batch), document.blockCount()) - 1):
+                block = block.previous()
+            document.markContentsDirty(block.position(), document.characterCount() - block.position())
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def set_min_level(self, rank: int):
+        """최소 레벨 이상만 표시 (기존 줄은 표시 여부만 변경)"""
+        if rank == self.min_rank:
+            return
+        self.min_rank = rank
+
+        document = self.document()
+        block = document.firstBlock()
+        while block.isValid():
+            block.setVisible(max(block.userState(), 0) >= rank)
+            block = block.next()
+        document.markContentsDirty(0, document.characterCount())
+        self.viewport().update()
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+
+    def create_filter_combo(self) -> QComboBox:
+        """레벨 필터 선택 상자 생성"""
+        combo = QComboBox()
+        for label, rank in LEVEL_FILTERS:
+            combo.addItem(label, rank)
+        combo.currentIndexChanged.connect(lambda index: self.set_min_level(combo.itemData(index)))
+        return combo
+
+    def to_text(self) -> str:
+        """보관 중인 로그 전체 (필터와 무관)"""
+        with self.lock:
+            entries = list(self.entries)
+        return "\n".join(f"[{timestamp}] {text}" for timestamp, text, _ in entries)
+
+    def clear(self):
+        """버퍼와 화면 모두 지우기"""
+        with self.lock:
+            self.entries.clear()
+            self.pending.clear()
+        super().clear()
@@ -385,11 +385,12 @@ class LoginWindow(QDialog):
         if success:
             # 자동 로그인 설정 저장
             if self.auto_login_checkbox.isChecked():
-                config.save_credentials(
-                    self.username_input.text().strip(),
-                    self.password_input.text().strip()
-                )
-                config.set('general', 'auto_login', 'true')
+                with config.batch():
+                    config.save_credentials(
+                        self.username_input.text().strip(),
+                        self.password_input.text().strip()
+                    )
+                    config.set('general', 'auto_login', 'true')
             else:
                 config.set('general', 'auto_login', 'false')
             
@@ -20,6 +20,8 @@ from .automation_flow import AutomationFlowWidget  # 새로 추가
 from .settings_window import SettingsWidget
 from ..utils.font_loader import font_loader
 from ..config import config
+from ..automation.airtable_sync_worker import get_sync_worker, stop_sync_worker
+from ..utils.metrics import metrics
 
 class MainWindow(QMainWindow):
     """메인 윈도우 클래스"""
@@ -30,11 +32,13 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.settings_window = None
+        self.airtable_sync_worker = None
         self.init_ui()
         self.setup_menu()
         self.setup_status_bar()
         self.setup_system_tray()
         self.load_window_state()
+        self.start_airtable_sync()
         
     def init_ui(self):
         """UI 초기화"""
@@ -215,6 +219,10 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel("준비")
         self.status_bar.addWidget(self.status_label)
         
+        # Airtable 동기화 상태
+        self.sync_label = QLabel("")
+        self.status_bar.addPermanentWidget(self.sync_label)
+
         # 연결 상태
         self.connection_label = QLabel("연결 확인 중...")
         self.status_bar.addPermanentWidget(self.connection_label)
@@ -500,6 +508,39 @@ class MainWindow(QMainWindow):
         except:
             self.connection_label.setText("🔴 연결 실패")
             
+    def start_airtable_sync(self):
+        """Airtable 백그라운드 동기화 워커 시작 (API 키와 Base ID가 설정된 경우)"""
+        try:
+            if not config.get_airtable_api_key() or not config.get('airtable', 'base_id', ''):
+                return
+
+            # 파이프라인 단계도 같은 워커로 전송 요청을 넣음
+            self.airtable_sync_worker = get_sync_worker()
+            self.airtable_sync_worker.stats_updated.connect(self.on_sync_stats_updated)
+            self.airtable_sync_worker.ensure_running()
+
+            # 상태 표시줄과 같은 통계를 메트릭으로도 제공
+            queue = self.airtable_sync_worker.queue
+            metrics.register_gauge('autoceph_offline_queue_depth', "Airtable 오프라인 큐 대기 건수", queue.size)
+            metrics.register_gauge('autoceph_airtable_sync_lag_seconds', "가장 오래된 미전송 작업의 대기 시간 (초)",
+                                   lambda: self.airtable_sync_worker.get_stats()['lag_seconds'])
+        except Exception as e:
+            self.sync_label.setText("🔴 Airtable 동기화 오류")
+            print(f"Airtable 동기화 워커 시작 실패: {e}")
+
+    def on_sync_stats_updated(self, stats):
+        """Airtable 동기화 상태 표시"""
+        if stats['circuit_state'] == 'open':
+            text = f"🔴 Airtable 연결 장애 (대기 {stats['depth']}건)"
+        elif stats['depth']:
+            text = f"🟡 Airtable 동기화 중 {stats['depth']}건 (지연 {stats['lag_seconds']:.0f}초, {stats['throughput_per_min']}건/분)"
+        else:
+            text = "🟢 Airtable 동기화됨"
+
+        if stats['dead']:
+            text += f" · 실패 {stats['dead']}건"
+        self.sync_label.setText(text)
+
     def load_window_state(self):
         """창 상태 로드"""
         try:
@@ -523,25 +564,22 @@ class MainWindow(QMainWindow):
     def save_window_state(self):
         """창 상태 저장"""
         try:
-            # 창 크기와 위치 저장
-            config.set('window', 'width', str(self.width()))
-            config.set('window', 'height', str(self.height()))
-            config.set('window', 'x', str(self.x()))
-            config.set('window', 'y', str(self.y()))
-            
-            # 현재 활성 탭 저장
-            config.set('window', 'last_tab', str(self.tab_widget.currentIndex()))
-            
-            config.save()
+            with config.batch():
+                # 창 크기와 위치 저장
+                config.set('window', 'width', str(self.width()))
+                config.set('window', 'height', str(self.height()))
+                config.set('window', 'x', str(self.x()))
+                config.set('window', 'y', str(self.y()))
+                
+                # 현재 활성 탭 저장
+                config.set('window', 'last_tab', str(self.tab_widget.currentIndex()))
         except:
             pass
             
     def closeEvent(self, event):
         """창 닫기 이벤트 처리"""
         # 자동화가 실행 중인지 확인
-        if (hasattr(self, 'automation_flow_widget') and 
-            self.automation_flow_widget.automation_worker and 
-            self.automation_flow_widget.automation_worker.isRunning()):
+        if hasattr(self, 'automation_flow_widget') and self.automation_flow_widget.is_busy():
             
             reply = QMessageBox.question(
                 self,
@@ -557,6 +595,13 @@ class MainWindow(QMainWindow):
                 
         # 창 상태 저장
         self.save_window_state()
+
+        # 자동화 작업 엔진 종료 (실행 중 작업은 단계 경계에서 중단) 및 브라우저 정리
+        if hasattr(self, 'automation_flow_widget'):
+            self.automation_flow_widget.shutdown()
+
+        # Airtable 동기화 워커 종료 (파이프라인이 시작한 경우 포함, 진행 중인 요청 완료 대기)
+        stop_sync_worker(5000)
         
         # 시그널 발생
         self.window_closing.emit()
@@ -246,8 +246,8 @@ class AccountSettingsTab(QWidget):
         self.upstage_api_url.setText(upstage_api_url)
     
     def save_settings(self):
-        """설정 저장"""
-        try:
+        """설정 저장 (예외는 저장 전체를 취소하도록 호출한 쪽으로 전달)"""
+        with config.batch():
             # Web Ceph 설정
             config.save_credentials(
                 self.webceph_username.text().strip(),
@@ -267,11 +267,6 @@ class AccountSettingsTab(QWidget):
                 config.save_upstage_api_key(self.upstage_api_key.text().strip())
             
             config.set('upstage', 'api_url', self.upstage_api_url.text().strip())
-            
-            return True
-        except Exception as e:
-            QMessageBox.warning(self, "오류", f"설정 저장 중 오류가 발생했습니다: {str(e)}")
-            return False
     
     def test_webceph_connection(self):
         """Web Ceph 연결 테스트"""
@@ -565,15 +560,11 @@ class PathSettingsTab(QWidget):
         self.backup_folder_input.setText(config.get('paths', 'backup_folder'))
     
     def save_settings(self):
-        """설정 저장"""
-        try:
+        """설정 저장 (예외는 저장 전체를 취소하도록 호출한 쪽으로 전달)"""
+        with config.batch():
             config.set('paths', 'image_folder', self.image_folder_input.text().strip())
             config.set('paths', 'pdf_folder', self.pdf_folder_input.text().strip())
             config.set('paths', 'backup_folder', self.backup_folder_input.text().strip())
-            return True
-        except Exception as e:
-            QMessageBox.warning(self, "오류", f"설정 저장 중 오류가 발생했습니다: {str(e)}")
-            return False
 
 class AutomationSettingsTab(QWidget):
     """자동화 설정 탭"""
@@ -591,7 +582,10 @@ class AutomationSettingsTab(QWidget):
         
         # 자동화 옵션
         self.create_automation_group(layout)
-        
+
+        # 브라우저 옵션
+        self.create_browser_group(layout)
+
         layout.addStretch()
     
     def create_automation_group(self, layout):
@@ -659,9 +653,68 @@ class AutomationSettingsTab(QWidget):
         
         group_layout.addWidget(desc_label)
         group_layout.addLayout(form_layout)
-        
+
         layout.addWidget(group)
-    
+
+    def create_browser_group(self, layout):
+        """브라우저 설정 그룹"""
+        group = QGroupBox("브라우저 옵션")
+        group.setFont(font_loader.get_font('SemiBold', 14))
+        group_layout = QVBoxLayout(group)
+        group_layout.setSpacing(16)
+
+        # 설명
+        desc_label = QLabel("WebCeph 자동화에 사용할 Chrome 브라우저의 로드 방식을 설정합니다.")
+        desc_label.setFont(font_loader.get_font('Regular', 12))
+        desc_label.setStyleSheet(f"color: {COLORS['gray_600']};")
+        desc_label.setWordWrap(True)
+
+        # 폼 레이아웃
+        form_layout = QGridLayout()
+        form_layout.setSpacing(12)
+
+        # 브라우저 프로필
+        profile_label = QLabel("브라우저 프로필:")
+        profile_label.setFont(font_loader.get_font('Medium', 12))
+        self.browser_profile_combo = QComboBox()
+        self.browser_profile_combo.setFont(font_loader.get_font('Regular', 12))
+        self.browser_profile_combo.addItem("기본 (모든 리소스 로드)", "default")
+        self.browser_profile_combo.addItem("고속 (eager 로드 + 불필요한 요청 차단)", "fast")
+
+        # 차단 URL 패턴
+        blocked_label = QLabel("차단 URL 패턴:")
+        blocked_label.setFont(font_loader.get_font('Medium', 12))
+        self.blocked_urls_input = QLineEdit()
+        self.blocked_urls_input.setFont(font_loader.get_font('Regular', 12))
+        self.blocked_urls_input.setPlaceholderText("*google-analytics.com*,*fonts.gstatic.com* (쉼표로 구분)")
+
+        form_layout.addWidget(profile_label, 0, 0)
+        form_layout.addWidget(self.browser_profile_combo, 0, 1)
+        form_layout.addWidget(blocked_label, 1, 0)
+        form_layout.addWidget(self.blocked_urls_input, 1, 1)
+
+        # 헤드리스 모드
+        self.headless_checkbox = QCheckBox("헤드리스 모드 (브라우저 창 없이 실행, 무인 실행 시 메모리 절감)")
+        self.headless_checkbox.setFont(font_loader.get_font('Regular', 12))
+        form_layout.addWidget(self.headless_checkbox, 2, 0, 1, 2)
+
+        # 브라우저 메모리 한도
+        max_rss_label = QLabel("메모리 한도 (MB):")
+        max_rss_label.setFont(font_loader.get_font('Medium', 12))
+        self.max_rss_spinbox = QSpinBox()
+        self.max_rss_spinbox.setRange(0, 8000)
+        self.max_rss_spinbox.setSingleStep(100)
+        self.max_rss_spinbox.setSuffix(" MB")
+        self.max_rss_spinbox.setSpecialValueText("제한 없음")
+        self.max_rss_spinbox.setFont(font_loader.get_font('Regular', 12))
+        form_layout.addWidget(max_rss_label, 3, 0)
+        form_layout.addWidget(self.max_rss_spinbox, 3, 1)
+
+        group_layout.addWidget(desc_label)
+        group_layout.addLayout(form_layout)
+
+        layout.addWidget(group)
+
     def load_settings(self):
         """설정 로드"""
         self.timeout_spinbox.setValue(int(config.get('webceph', 'timeout', '30')))
@@ -671,19 +724,26 @@ class AutomationSettingsTab(QWidget):
         
         auto_start = config.get_bool('automation', 'auto_start', False)
         self.auto_start_checkbox.setChecked(auto_start)
-    
+
+        # 브라우저 설정
+        profile_index = self.browser_profile_combo.findData(config.get('browser', 'profile', 'default'))
+        self.browser_profile_combo.setCurrentIndex(max(profile_index, 0))
+        self.blocked_urls_input.setText(config.get('browser', 'blocked_urls', ''))
+        self.headless_checkbox.setChecked(config.get_bool('browser', 'headless', False))
+        self.max_rss_spinbox.setValue(config.get_int('browser', 'max_rss_mb', 1500))
+
     def save_settings(self):
-        """설정 저장"""
-        try:
+        """설정 저장 (예외는 저장 전체를 취소하도록 호출한 쪽으로 전달)"""
+        with config.batch():
             config.set('webceph', 'timeout', str(self.timeout_spinbox.value()))
             config.set('webceph', 'retry_count', str(self.retry_spinbox.value()))
             config.set('automation', 'wait_time', str(self.wait_spinbox.value()))
             config.set('automation', 'batch_size', str(self.batch_spinbox.value()))
             config.set('automation', 'auto_start', 'true' if self.auto_start_checkbox.isChecked() else 'false')
-            return True
-        except Exception as e:
-            QMessageBox.warning(self, "오류", f"설정 저장 중 오류가 발생했습니다: {str(e)}")
-            return False
+            config.set('browser', 'profile', self.browser_profile_combo.currentData())
+            config.set('browser', 'blocked_urls', self.blocked_urls_input.text().strip())
+            config.set('browser', 'headless', 'true' if self.headless_checkbox.isChecked() else 'false')
+            config.set('browser', 'max_rss_mb', str(self.max_rss_spinbox.value()))
 
 class SettingsWidget(QWidget):
     """설정 메인 위젯"""
@@ -782,21 +842,21 @@ class SettingsWidget(QWidget):
     def save_all_settings(self):
         """모든 설정 저장"""
         try:
-            # 각 탭의 설정 저장
-            success = True
-            success &= self.account_tab.save_settings()
-            success &= self.path_tab.save_settings()
-            success &= self.automation_tab.save_settings()
-            
-            if success:
-                # 필요한 디렉토리 생성
-                config.create_directories()
-                
-                QMessageBox.information(self, "저장 완료", "모든 설정이 성공적으로 저장되었습니다.")
-                self.settings_saved.emit()
-            
+            # 각 탭의 설정 저장 (설정 파일은 마지막에 한 번만 기록, 하나라도 실패하면 전체 취소)
+            with config.batch():
+                self.account_tab.save_settings()
+                self.path_tab.save_settings()
+                self.automation_tab.save_settings()
         except Exception as e:
+            # 대화상자는 batch가 끝나(잠금이 풀린) 뒤에 표시
             QMessageBox.critical(self, "저장 실패", f"설정 저장 중 오류가 발생했습니다:\n{str(e)}")
+            return
+
+        # 필요한 디렉토리 생성
+        config.create_directories()
+
+        QMessageBox.information(self, "저장 완료", "모든 설정이 성공적으로 저장되었습니다.")
+        self.settings_saved.emit()
     
     def cancel_changes(self):
         """변경 사항 취소"""
@@ -0,0 +1,78 @@
+"""
+설정 파일 감시 모듈
+config.ini가 외부에서 변경되면 다시 읽어 새 설정 스냅샷을 구독자에게 전달
+"""
+
+import logging
+import threading
+from pathlib import Path
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+from ..config import config
+
+class ConfigWatcher(FileSystemEventHandler):
+    """config.ini 변경 감시 클래스
+
+    편집기 저장 시 이벤트가 여러 번 발생하므로 마지막 이벤트 후 debounce 초 동안
+    추가 변경이 없을 때 한 번만 다시 읽습니다. 앱이 직접 저장한 변경은 Config가 무시합니다.
+    """
+
+    def __init__(self, debounce: float = 0.5):
+        super().__init__()
+        self.logger = logging.getLogger('ConfigWatcher')
+        self.debounce = debounce
+        self.observer = None
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """감시 시작"""
+        if self.observer:
+            return
+
+        self.observer = Observer()
+        self.observer.schedule(self, str(config.app_dir), recursive=False)
+        self.observer.daemon = True
+        self.observer.start()
+        self.logger.info(f"설정 파일 감시 시작: {config.config_file}")
+
+    def stop(self):
+        """감시 중지"""
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+
+        if self.observer:
+            self.observer.stop()
+            self.observer.join(timeout=2)
+            self.observer = None
+
+    def on_any_event(self, event):
+        """config.ini 관련 이벤트만 처리 (임시 파일 교체로 인한 이동 이벤트 포함)"""
+        if event.is_directory:
+            return
+
+        config_name = Path(config.config_file).name
+        paths = (event.src_path, getattr(event, 'dest_path', None))
+        if not any(path and Path(path).name == config_name for path in paths):
+            return
+
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.debounce, self._reload)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def _reload(self):
+        """변경된 설정 다시 읽기"""
+        try:
+            if config.reload_if_changed():
+                self.logger.info(f"설정 파일 변경 적용 (버전 {config.snapshot.version})")
+        except Exception as e:
+            self.logger.error(f"설정 파일 다시 읽기 실패: {str(e)}")
+
+# 전역 설정 감시 인스턴스
+config_watcher = ConfigWatcher()
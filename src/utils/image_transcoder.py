@@ -0,0 +1,133 @@
+"""
+이미지 트랜스코딩 모듈
+업로드 전 X-ray/얼굴 사진을 WebCeph가 사용하는 해상도로 축소하고 재인코딩
+결과는 원본 SHA-256 기준으로 디스크에 캐시하여 재실행/재시도 시 재사용
+"""
+
+import os
+import time
+import hashlib
+import logging
+from pathlib import Path
+from PIL import Image, ImageOps
+
+from ..config import config
+
+class ImageTranscoder:
+    """업로드 전 이미지 축소/재인코딩 클래스"""
+
+    def __init__(self):
+        self.logger = logging.getLogger('ImageTranscoder')
+        self.cache_pruned = False
+
+    @property
+    def cache_dir(self):
+        """변환 캐시 폴더 (설정 폴더 기준, 사용할 때 결정)"""
+        return Path(config.app_dir) / "transcode_cache"
+
+    def _hash_file(self, path):
+        """파일 SHA-256 해시"""
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def transcode(self, image_path):
+        """업로드용 이미지 경로 반환 (변환 불가/불필요 시 원본 경로)"""
+        if not config.get_bool('transcode', 'enabled', True):
+            return str(image_path)
+
+        source = Path(image_path)
+        if not source.is_file():
+            return str(image_path)
+
+        max_dimension = config.get_int('transcode', 'max_dimension', 2048)
+        quality = config.get_int('transcode', 'jpeg_quality', 90)
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._prune_cache()
+
+            # 같은 원본이라도 변환 설정이 바뀌면 다른 캐시 항목 사용
+            cache_key = f"{self._hash_file(source)}_{max_dimension}_q{quality}"
+            cached_path = self.cache_dir / f"{cache_key}.jpg"
+            passthrough_marker = self.cache_dir / f"{cache_key}.orig"
+
+            if cached_path.exists():
+                # 사용 시각 갱신 (오래된 항목만 정리되도록)
+                os.utime(cached_path)
+                self.logger.info(f"변환 캐시 사용: {source.name}")
+                return str(cached_path)
+            if passthrough_marker.exists():
+                return str(source)
+
+            source_size = source.stat().st_size
+            started = time.perf_counter()
+
+            with Image.open(source) as image:
+                original_dimensions = image.size
+                image = ImageOps.exif_transpose(image)
+                image = self._to_jpeg_mode(image)
+                image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+                # 임시 파일에 저장 후 교체 (중단 시 불완전한 캐시 방지)
+                temp_path = cached_path.with_suffix('.tmp')
+                image.save(temp_path, 'JPEG', quality=quality, optimize=True)
+                output_dimensions = image.size
+
+            output_size = temp_path.stat().st_size
+            if output_size >= source_size:
+                # 재인코딩 이득이 없으면 원본 업로드 (다음 실행에서도 변환 생략)
+                temp_path.unlink()
+                passthrough_marker.touch()
+                self.logger.info(f"변환 생략 (원본이 더 작음): {source.name}")
+                return str(source)
+
+            os.replace(temp_path, cached_path)
+
+            saved = source_size - output_size
+            self.logger.info(
+                f"이미지 변환: {source.name} {original_dimensions[0]}x{original_dimensions[1]} → "
+                f"{output_dimensions[0]}x{output_dimensions[1]}, {source_size / 1024:.0f}KB → "
+                f"{output_size / 1024:.0f}KB ({saved / 1024:.0f}KB 절감, {saved / source_size:.0%}), "
+                f"{time.perf_counter() - started:.2f}초"
+            )
+            return str(cached_path)
+
+        except Exception as e:
+            # 변환 실패는 치명적이지 않음 - 원본으로 업로드 (검증은 업로드 단계에서 수행)
+            self.logger.warning(f"이미지 변환 실패 (원본 사용): {source.name} - {str(e)}")
+            return str(source)
+
+    def _to_jpeg_mode(self, image):
+        """JPEG 저장 가능한 색상 모드로 변환 (흑백 X-ray는 흑백 유지)"""
+        if image.mode in ('L', 'RGB'):
+            return image
+        if image.mode in ('I;16', 'I;16B', 'I;16L', 'I'):
+            # 16비트 흑백 X-ray: 8비트로 스케일링
+            return image.point(lambda value: value * (1 / 256)).convert('L')
+        return image.convert('RGB')
+
+    def _prune_cache(self):
+        """오래된 캐시 항목 정리 (인스턴스당 1회)"""
+        if self.cache_pruned:
+            return
+        self.cache_pruned = True
+
+        max_age = config.get_int('transcode', 'cache_days', 30) * 24 * 3600
+        cutoff = time.time() - max_age
+        removed = 0
+        for cached_file in self.cache_dir.iterdir():
+            try:
+                if cached_file.stat().st_mtime < cutoff:
+                    cached_file.unlink()
+                    removed += 1
+            except OSError:
+                continue
+
+        if removed:
+            self.logger.info(f"오래된 변환 캐시 {removed}개를 삭제했습니다")
+
+# 전역 이미지 트랜스코더 인스턴스
+image_transcoder = ImageTranscoder()
@@ -0,0 +1,185 @@
+"""
+로그 파이프라인 모듈
+로그 레코드는 호출한 스레드에서 큐에 넣기만 하고, 포맷/파일 기록/콘솔 출력은 별도 스레드(QueueListener)에서 처리
+로그 파일은 날짜가 바뀌거나 크기 제한을 넘으면 교체 후 gzip으로 압축
+"""
+
+import sys
+import gzip
+import queue
+import atexit
+import shutil
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+class ThreadQueueHandler(QueueHandler):
+    """같은 프로세스 안의 리스너로 레코드를 그대로 전달하는 QueueHandler
+
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷하므로,
+    포맷을 리스너 스레드로 미루기 위해 레코드를 복사/포맷하지 않고 넘깁니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class CompressingFileHandler(logging.FileHandler):
+    """일별/크기 제한 교체 + gzip 압축 파일 핸들러
+
+    교체된 파일은 '<이름>_<날짜>_<번호>.log.gz'로 저장하고 backup_count개를 넘는 오래된 파일은 삭제합니다.
+    리스너 스레드에서만 호출되므로 압축 시간이 자동화 스레드를 막지 않습니다.
+    """
+
+    def __init__(self, filename: Path, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 30):
+        self.path = Path(filename)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        super().__init__(self.path, encoding='utf-8')
+        self.current_day = self._file_day()
+
+    def _file_day(self) -> str:
+        """현재 로그 파일의 날짜 (이전 실행에서 남은 파일이면 마지막 수정일)"""
+        if self.path.exists() and self.path.stat().st_size:
+            return datetime.fromtimestamp(self.path.stat().st_mtime).strftime('%Y%m%d')
+        return datetime.now().strftime('%Y%m%d')
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self._should_rollover():
+                self._rollover()
+        except Exception:
+            self.handleError(record)
+        super().emit(record)
+
+    def _should_rollover(self) -> bool:
+        if datetime.now().strftime('%Y%m%d') != self.current_day:
+            return True
+        return bool(self.max_bytes and self.stream and self.stream.tell() >= self.max_bytes)
+
+    def _rollover(self):
+        """현재 파일 압축 보관 후 새 파일 시작"""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if self.path.exists() and self.path.stat().st_size:
+            index = 1
+            while True:
+                target = self.path.with_name(f"{self.path.stem}_{self.current_day}_{index}.log.gz")
+                if not target.exists():
+                    break
+                index += 1
+            with open(self.path, 'rb') as source, gzip.open(target, 'wb') as destination:
+                shutil.copyfileobj(source, destination)
+            self.path.unlink()
+            self._remove_old_backups()
+
+        self.current_day = datetime.now().strftime('%Y%m%d')
+        self.stream = self._open()
+
+    def _backup_order(self, backup: Path):
+        """보관 파일 정렬 키 (날짜, 번호)"""
+        day, _, index = backup.name[len(self.path.stem) + 1:-len('.log.gz')].partition('_')
+        return (day, int(index) if index.isdigit() else 0)
+
+    def _remove_old_backups(self):
+        backups = sorted(self.path.parent.glob(f"{self.path.stem}_*.log.gz"), key=self._backup_order)
+        for old_backup in backups[:-self.backup_count] if self.backup_count else []:
+            try:
+                old_backup.unlink()
+            except OSError:
+                pass
+
+class LoggerNameFilter(logging.Filter):
+    """지정한 로거(및 하위 로거) 레코드만 통과"""
+
+    def __init__(self, *names: str):
+        super().__init__()
+        self.names = names
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return any(record.name == name or record.name.startswith(name + '.') for name in self.names)
+
+class LogPipeline:
+    """비동기 로그 파이프라인 (루트 로거 → 큐 → 리스너 스레드 → 파일/콘솔)"""
+
+    # 모듈별 로그 파일 (전체 로그는 app.log)
+    MODULE_FILES = {
+        'automation': ('WebCephAutomation', 'BrowserSupervisor', 'JobEngine'),
+        'airtable': ('AirtableSync',),
+        'dentweb': ('DentwebOCR',)
+    }
+
+    def __init__(self):
+        self.queue = None
+        self.listener = None
+        self.extra_listeners = []
+        self.exit_hook_registered = False
+        self.lock = threading.Lock()
+
+    def _register_exit_hook(self):
+        """종료 시 남은 로그 기록 (잠금 안에서 호출)"""
+        if not self.exit_hook_registered:
+            atexit.register(self.stop)
+            self.exit_hook_registered = True
+
+    def start(self, log_dir: Path, level: int = logging.INFO, console: bool = True,
+              max_bytes: int = 10 * 1024 * 1024, backup_count: int = 30):
+        """파이프라인 시작 (이미 시작했으면 무시)"""
+        with self.lock:
+            if self.listener:
+                return
+
+            formatter = logging.Formatter(LOG_FORMAT)
+            handlers = [CompressingFileHandler(Path(log_dir) / "app.log", max_bytes, backup_count)]
+            for file_name, logger_names in self.MODULE_FILES.items():
+                handler = CompressingFileHandler(Path(log_dir) / f"{file_name}.log", max_bytes, backup_count)
+                handler.addFilter(LoggerNameFilter(*logger_names))
+                handlers.append(handler)
+            if console:
+                handlers.append(logging.StreamHandler(sys.stdout))
+            for handler in handlers:
+                handler.setFormatter(formatter)
+
+            self.queue = queue.SimpleQueue()
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(ThreadQueueHandler(self.queue))
+            root.setLevel(level)
+
+            self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+            self.listener.start()
+            self._register_exit_hook()
+
+    def attach(self, logger: logging.Logger, handler: logging.Handler):
+        """전파하지 않는 전용 로거(추적 파일 등)도 호출 스레드에서는 큐에 넣기만 하고 별도 스레드에서 기록
+
+        파이프라인 시작 여부와 관계없이 사용할 수 있으며, stop()에서 함께 정리합니다.
+        """
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        with self.lock:
+            listener.start()
+            self.extra_listeners.append(listener)
+            self._register_exit_hook()
+        logger.addHandler(ThreadQueueHandler(log_queue))
+
+    def stop(self):
+        """남은 로그를 모두 기록하고 리스너 종료"""
+        with self.lock:
+            listeners = self.extra_listeners + ([self.listener] if self.listener else [])
+            self.extra_listeners = []
+            self.listener = None
+            for listener in listeners:
+                listener.stop()
+                for handler in listener.handlers:
+                    handler.close()
+
+# 전역 로그 파이프라인 인스턴스
+log_pipeline = LogPipeline()
@@ -0,0 +1,194 @@
+"""
+메트릭 모듈
+추적(span/이벤트) 기록과 상태 조회 함수를 Prometheus 텍스트 형식으로 집계하여
+localhost HTTP 엔드포인트(/metrics)로 제공 (설정에서 켠 경우에만 실행)
+"""
+
+import bisect
+import logging
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Callable, Tuple
+
+from ..config import config
+from .tracing import tracer
+
+class MetricsRegistry:
+    """카운터/히스토그램/게이지 저장소
+
+    카운터와 히스토그램은 추적 수신 함수(on_record)에서 증가시키고,
+    게이지는 조회 함수를 등록해 두었다가 수집 요청 시에만 호출합니다.
+    """
+
+    # 소요 시간 히스토그램 구간 (초)
+    BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+    def __init__(self):
+        self.logger = logging.getLogger('Metrics')
+        self.lock = threading.Lock()
+        self.metadata = {}
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+
+    def _describe(self, name: str, metric_type: str, help_text: str):
+        self.metadata.setdefault(name, (metric_type, help_text))
+
+    def inc(self, name: str, help_text: str, labels: Tuple[Tuple[str, str], ...] = (), value: float = 1):
+        """카운터 증가"""
+        with self.lock:
+            self._describe(name, 'counter', help_text)
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + value
+
+    def observe(self, name: str, help_text: str, value: float, labels: Tuple[Tuple[str, str], ...] = ()):
+        """히스토그램 관측값 추가"""
+        with self.lock:
+            self._describe(name, 'histogram', help_text)
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[(name, labels)] = {
+                    'buckets': [0] * len(self.BUCKETS), 'sum': 0.0, 'count': 0}
+            index = bisect.bisect_left(self.BUCKETS, value)
+            if index < len(self.BUCKETS):
+                histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def register_gauge(self, name: str, help_text: str, func: Callable[[], Any]):
+        """게이지 조회 함수 등록 (숫자 또는 {레이블 튜플: 값} 반환)"""
+        with self.lock:
+            self._describe(name, 'gauge', help_text)
+            self.gauges[name] = func
+
+    def on_record(self, record: Dict[str, Any]):
+        """추적 기록 → 메트릭 변환 (기록한 스레드에서 호출)"""
+        name = record['name']
+
+        if record['kind'] == 'event':
+            self.inc('autoceph_events_total', "추적 이벤트 수 (예: upstage.rate_limited)",
+                     (('event', name),))
+            return
+
+        seconds = record['duration_ms'] / 1000
+        self.observe('autoceph_span_duration_seconds', "단계(span)별 소요 시간", seconds, (('span', name),))
+
+        if name == 'job':
+            if record['status'] == 'ok':
+                status = 'completed'
+            elif record['error_type'] == 'JobCancelled':
+                status = 'cancelled'
+            else:
+                status = 'failed'
+            self.inc('autoceph_jobs_total', "처리한 자동화 작업 수", (('status', status),))
+        elif name == 'ocr.extract_patient_info':
+            self.observe('autoceph_ocr_duration_seconds', "Dentweb OCR 환자 정보 추출 소요 시간", seconds)
+
+        if name.startswith('pipeline.') and record['status'] == 'error' and record['error_type'] != 'JobCancelled':
+            self.inc('autoceph_step_failures_total', "파이프라인 단계 실패 수",
+                     (('step', name[len('pipeline.'):]),))
+
+    def _format_labels(self, labels: Tuple[Tuple[str, str], ...]) -> str:
+        if not labels:
+            return ""
+        escaped = [(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                   for key, value in labels]
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 출력"""
+        with self.lock:
+            metadata = dict(self.metadata)
+            counters = dict(self.counters)
+            histograms = {key: {'buckets': list(value['buckets']), 'sum': value['sum'], 'count': value['count']}
+                          for key, value in self.histograms.items()}
+            gauges = dict(self.gauges)
+
+        samples = {name: [] for name in metadata}
+        for (name, labels), value in counters.items():
+            samples[name].append(f"{name}{self._format_labels(labels)} {value}")
+
+        for (name, labels), histogram in histograms.items():
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS, histogram['buckets']):
+                cumulative += count
+                samples[name].append(f"{name}_bucket{self._format_labels(labels + (('le', bound),))} {cumulative}")
+            samples[name].append(f"{name}_bucket{self._format_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+            samples[name].append(f"{name}_sum{self._format_labels(labels)} {histogram['sum']}")
+            samples[name].append(f"{name}_count{self._format_labels(labels)} {histogram['count']}")
+
+        for name, func in gauges.items():
+            try:
+                value = func()
+            except Exception as e:
+                self.logger.warning(f"게이지 조회 실패 ({name}): {str(e)}")
+                continue
+            if value is None:
+                continue
+            if isinstance(value, dict):
+                for labels, labeled_value in value.items():
+                    samples[name].append(f"{name}{self._format_labels(labels)} {float(labeled_value)}")
+            else:
+                samples[name].append(f"{name} {float(value)}")
+
+        lines = []
+        for name in sorted(samples):
+            if not samples[name]:
+                continue
+            metric_type, help_text = metadata[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples[name])
+        return "\n".join(lines) + "\n"
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """/metrics 요청 처리"""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        body = metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 수집 요청마다 로그가 쌓이지 않도록 무시
+        pass
+
+class MetricsServer:
+    """메트릭 HTTP 서버 (백그라운드 스레드, localhost 전용)"""
+
+    def __init__(self):
+        self.logger = logging.getLogger('Metrics')
+        self.server = None
+        self.thread = None
+
+    def start(self) -> bool:
+        """설정에서 켠 경우 서버 시작 (metrics.enabled, metrics.port)"""
+        if self.server or not config.get_bool('metrics', 'enabled', False):
+            return False
+
+        port = config.get_int('metrics', 'port', 9464)
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), MetricsRequestHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='MetricsServer', daemon=True)
+        self.thread.start()
+        self.logger.info(f"메트릭 엔드포인트 시작: http://127.0.0.1:{port}/metrics")
+        return True
+
+    def stop(self):
+        """서버 종료"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            self.thread = None
+
+# 전역 메트릭 인스턴스 (추적 기록을 항상 집계하므로 서버를 켜면 시작 이후 전체 값이 보임)
+metrics = MetricsRegistry()
+tracer.add_listener(metrics.on_record)
+metrics_server = MetricsServer()
@@ -0,0 +1,184 @@
+"""
+단계 소요 시간 추적 모듈
+OCR/WebCeph/Airtable 단계를 span으로 측정하여 작업 ID와 함께 NDJSON 추적 파일에 기록하고
+단계별 p50/p95를 화면에 표시할 수 있도록 최근 측정값을 보관
+"""
+
+import json
+import time
+import uuid
+import logging
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional
+
+from ..config import config
+from .log_pipeline import log_pipeline
+
+class Tracer:
+    """span 추적 클래스
+
+    작업 ID와 상위 span은 스레드별로 관리합니다. 파이프라인 풀 스레드처럼 다른 스레드에서 실행하는
+    단계는 job_context()로 작업 ID를 다시 지정해야 같은 작업으로 묶입니다.
+    추적 파일은 로그처럼 크기 기준으로 교체되며 한 줄이 span/이벤트 하나(JSON)입니다.
+    add_listener()로 등록한 함수는 기록마다 호출됩니다 (메트릭 집계 등).
+    """
+
+    def __init__(self, max_bytes: int = 5 * 1024 * 1024, backup_count: int = 5, window: int = 500):
+        self.logger = logging.getLogger('Tracer')
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.window = window
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.durations = {}
+        self.listeners = []
+        self.trace_logger = None
+
+    @property
+    def trace_file(self) -> Path:
+        return Path(config.app_dir) / "logs" / "trace.ndjson"
+
+    def _get_trace_logger(self) -> logging.Logger:
+        """추적 파일 기록기 (최초 사용 시 생성, 일반 로그로 전파하지 않음)
+
+        파일 기록은 로그 파이프라인의 리스너 스레드에서 처리하므로 span을 닫는 스레드는 큐에 넣기만 합니다.
+        """
+        if self.trace_logger is None:
+            with self.lock:
+                if self.trace_logger is None:
+                    self.trace_file.parent.mkdir(parents=True, exist_ok=True)
+                    handler = RotatingFileHandler(self.trace_file, maxBytes=self.max_bytes,
+                                                  backupCount=self.backup_count, encoding='utf-8')
+                    handler.setFormatter(logging.Formatter('%(message)s'))
+                    trace_logger = logging.getLogger('Tracer.spans')
+                    trace_logger.setLevel(logging.INFO)
+                    trace_logger.propagate = False
+                    log_pipeline.attach(trace_logger, handler)
+                    self.trace_logger = trace_logger
+        return self.trace_logger
+
+    def _stack(self) -> list:
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """span/이벤트 기록 수신 함수 등록 (기록한 스레드에서 호출되므로 짧게 처리)"""
+        with self.lock:
+            self.listeners.append(callback)
+
+    def current_job_id(self) -> Optional[str]:
+        """현재 스레드의 작업 ID"""
+        return getattr(self.local, 'job_id', None)
+
+    @contextmanager
+    def job_context(self, job_id: str):
+        """블록 안의 span에 작업 ID 지정"""
+        previous = self.current_job_id()
+        self.local.job_id = job_id
+        try:
+            yield
+        finally:
+            self.local.job_id = previous
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """소요 시간 측정 (예외 발생 시 error 상태로 기록 후 다시 발생)"""
+        stack = self._stack()
+        span_id = uuid.uuid4().hex[:16]
+        parent_id = stack[-1] if stack else None
+        stack.append(span_id)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        status, error, error_type = 'ok', None, None
+        try:
+            yield
+        except BaseException as e:
+            status, error, error_type = 'error', str(e), type(e).__name__
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            stack.pop()
+            self._finish({
+                'kind': 'span',
+                'ts': datetime.fromtimestamp(started_at).isoformat(timespec='milliseconds'),
+                'job_id': self.current_job_id(),
+                'span_id': span_id,
+                'parent_id': parent_id,
+                'name': name,
+                'duration_ms': round(duration_ms, 1),
+                'status': status,
+                'error': error,
+                'error_type': error_type,
+                'thread': threading.current_thread().name,
+                **({'attributes': attributes} if attributes else {})
+            })
+
+    def event(self, name: str, **attributes):
+        """시점 이벤트 기록 (예: API 요청 한도 초과)"""
+        self._write({
+            'kind': 'event',
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'job_id': self.current_job_id(),
+            'name': name,
+            'thread': threading.current_thread().name,
+            **({'attributes': attributes} if attributes else {})
+        })
+
+    def _finish(self, record: Dict[str, Any]):
+        """span 기록 및 최근 측정값 보관"""
+        with self.lock:
+            durations = self.durations.get(record['name'])
+            if durations is None:
+                durations = self.durations[record['name']] = deque(maxlen=self.window)
+            durations.append(record['duration_ms'])
+        self._write(record)
+
+    def _write(self, record: Dict[str, Any]):
+        """추적 파일 기록 및 수신 함수 호출 (실패해도 자동화에 영향을 주지 않도록 로그만 남김)"""
+        for listener in list(self.listeners):
+            try:
+                listener(record)
+            except Exception as e:
+                self.logger.error(f"추적 수신 함수 오류: {str(e)}")
+
+        try:
+            self._get_trace_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+        except Exception as e:
+            self.logger.error(f"추적 기록 실패: {str(e)}")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """span 이름별 최근 측정값 요약 (건수, p50/p95, ms)"""
+        with self.lock:
+            snapshot = {name: sorted(durations) for name, durations in self.durations.items()}
+
+        result = {}
+        for name, values in snapshot.items():
+            if not values:
+                continue
+            result[name] = {
+                'count': len(values),
+                'p50': values[int(0.50 * (len(values) - 1))],
+                'p95': values[int(0.95 * (len(values) - 1))]
+            }
+        return result
+
+def traced(name: str):
+    """메서드/함수 전체를 span으로 측정하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# 전역 추적 인스턴스
+tracer = Tracer()
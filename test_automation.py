@@ -58,7 +58,11 @@ def test_config():
     """설정 테스트"""
     print("\n=== 설정 테스트 ===")
     try:
-        from src.config import config
+        import tempfile
+        from src.config import config, configure
+        
+        # 실제 AppData 설정 대신 임시 폴더의 기본 설정으로 확인
+        configure(tempfile.mkdtemp())
         
         # 기본 설정 확인
         webceph_url = config.get('webceph', 'url', '')
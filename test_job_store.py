@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+작업 저장소 테스트 (Qt 없이 실행: python -m pytest test_job_store.py)
+"""
+
+import sys
+import time
+import sqlite3
+from pathlib import Path
+
+# 프로젝트 루트 디렉터리를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.automation.job_store import JobStore
+
+PATIENT = {'name': '홍길동', 'registration_number': '1001'}
+
+def make_store(tmp_path):
+    return JobStore(tmp_path / "jobs.db")
+
+def test_job_lifecycle_and_daily_stats(tmp_path):
+    """작업 상태 변경과 일별 집계는 처음 종료될 때 한 번만 반영"""
+    store = make_store(tmp_path)
+    store.create_job('job1', "환자 처리", PATIENT, created_at=100.0)
+    store.update_job('job1', 'running', started_at=100.0)
+    assert store.count_active() == 1
+
+    finished_at = time.time()
+    store.update_job('job1', 'completed', finished_at=finished_at, result={'pdf_path': 'a.pdf'})
+    store.update_job('job1', 'completed', finished_at=finished_at)
+
+    job = store.get_job('job1')
+    assert job['status'] == 'completed'
+    assert job['patient_name'] == '홍길동'
+    assert job['patient_data'] == PATIENT
+    assert job['result'] == {'pdf_path': 'a.pdf'}
+    assert store.count_active() == 0
+
+    stats = store.get_daily_stats()
+    assert stats['completed'] == 1
+    assert stats['failed'] == 0
+
+def test_step_records_and_latency(tmp_path):
+    """단계 실행 행은 대기 → 실행 → 완료로 하나의 행에서 마감되고 소요 시간이 집계됨"""
+    store = make_store(tmp_path)
+    store.create_job('job1', "환자 처리", PATIENT)
+    now = time.time()
+    store.record_step('job1', 'login', 'queued', timestamp=now)
+    store.record_step('job1', 'login', 'running', timestamp=now)
+    store.record_step('job1', 'login', 'completed', "로그인 완료", timestamp=now + 2)
+
+    steps = store.get_steps('job1')
+    assert len(steps) == 1
+    assert steps[0]['status'] == 'completed'
+    assert steps[0]['duration'] == 2
+
+    stats = store.get_daily_stats()
+    assert stats['step_p95']['login'] == 2.0
+
+def test_pending_without_open_step_is_ignored(tmp_path):
+    """실행한 적 없는 단계의 'pending'은 기록하지 않음"""
+    store = make_store(tmp_path)
+    store.create_job('job1', "환자 처리", PATIENT)
+    store.record_step('job1', 'login', 'pending')
+    assert store.get_steps('job1') == []
+
+def test_recover_interrupted_on_restart(tmp_path):
+    """비정상 종료로 남은 대기/실행 작업은 다시 열 때 'interrupted'로 정리"""
+    store = make_store(tmp_path)
+    store.create_job('job1', "환자 처리", PATIENT)
+    store.update_job('job1', 'running', started_at=time.time())
+    store.record_step('job1', 'login', 'running')
+    store.close()
+
+    store = make_store(tmp_path)
+    assert store.get_job('job1')['status'] == 'interrupted'
+    assert store.get_steps('job1')[0]['status'] == 'interrupted'
+    assert store.get_daily_stats()['interrupted'] == 1
+
+def test_retryable_jobs_skip_superseded_attempts(tmp_path):
+    """같은 환자의 더 최근 작업이 있으면 이전 실패 작업은 재시도 대상에서 제외"""
+    store = make_store(tmp_path)
+    store.create_job('old', "환자 처리", PATIENT, created_at=100.0)
+    store.update_job('old', 'failed', finished_at=101.0, error="업로드 실패")
+    store.create_job('other', "환자 처리", {'name': '김철수', 'registration_number': '1002'}, created_at=102.0)
+    store.update_job('other', 'cancelled', finished_at=103.0)
+    store.create_job('done', "환자 처리", {'name': '이영희', 'registration_number': '1003'}, created_at=104.0)
+    store.update_job('done', 'completed', finished_at=105.0)
+
+    assert [job['id'] for job in store.get_retryable_jobs()] == ['other', 'old']
+
+    store.create_job('retry', "환자 처리", PATIENT, created_at=106.0)
+    assert [job['id'] for job in store.get_retryable_jobs()] == ['other']
+
+def test_rebuild_daily_stats_matches_incremental(tmp_path):
+    """집계 재생성 결과가 증분 집계와 같음"""
+    store = make_store(tmp_path)
+    now = time.time()
+    for index, status in enumerate(('completed', 'failed', 'completed')):
+        job_id = f"job{index}"
+        store.create_job(job_id, "환자 처리", PATIENT, created_at=now)
+        store.update_job(job_id, 'running', started_at=now)
+        store.update_job(job_id, status, finished_at=now + 3)
+
+    before = store.get_daily_stats()
+    store.rebuild_daily_stats()
+    after = store.get_daily_stats()
+    assert (after['completed'], after['failed']) == (before['completed'], before['failed']) == (2, 1)
+    assert after['average_duration'] == before['average_duration']
+
+def test_wal_mode(tmp_path):
+    """여러 스레드가 기록하므로 WAL 모드 사용"""
+    make_store(tmp_path)
+    conn = sqlite3.connect(str(tmp_path / "jobs.db"))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    conn.close()
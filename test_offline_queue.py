@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+오프라인 큐 테스트 (Qt 없이 실행: python -m pytest test_offline_queue.py)
+"""
+
+import sys
+import json
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 디렉터리를 Python 경로에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src.automation.offline_queue import OfflineQueue
+
+def make_queue(tmp_path, legacy_json_path=None):
+    return OfflineQueue(tmp_path / "offline_queue.db", legacy_json_path)
+
+def test_fifo_peek_and_ack(tmp_path):
+    """추가 순서대로 조회되고 ack한 항목만 삭제"""
+    queue = make_queue(tmp_path)
+    first = queue.enqueue('create_patient', {'fields': {'name': 'A'}})
+    second = queue.enqueue('create_patient', {'fields': {'name': 'B'}})
+
+    items = queue.peek()
+    assert [item['id'] for item in items] == [first, second]
+    assert queue.peek(after_seq=items[0]['seq'])[0]['id'] == second
+
+    assert queue.ack(first)
+    assert queue.size() == 1
+    assert not queue.ack(first)
+
+def test_merge_key_merges_pending_fields(tmp_path):
+    """같은 merge_key의 대기 항목에는 필드 단위로 병합하고 revision을 올림"""
+    queue = make_queue(tmp_path)
+    item_id = queue.enqueue('upsert_patient', {'fields': {'session_id': 's1', 'name': 'A'}}, merge_key='s1')
+    merged_id = queue.enqueue('upsert_patient', {'fields': {'session_id': 's1', 'status': 'COMPLETED'}},
+                              merge_key='s1')
+
+    assert merged_id == item_id
+    item = queue.peek()[0]
+    assert queue.size() == 1
+    assert item['data']['fields'] == {'session_id': 's1', 'name': 'A', 'status': 'COMPLETED'}
+    assert item['revision'] == 1
+
+def test_merge_pending_only_when_queued(tmp_path):
+    """merge_pending은 대기 항목이 없으면 새로 추가하지 않음"""
+    queue = make_queue(tmp_path)
+    assert queue.merge_pending('upsert_patient', 's1', {'fields': {'status': 'COMPLETED'}}) is None
+    assert queue.size() == 0
+
+def test_ack_keeps_item_merged_during_send(tmp_path):
+    """전송 중에 병합된 항목은 이전 revision으로 ack해도 남아서 다시 전송"""
+    queue = make_queue(tmp_path)
+    queue.enqueue('upsert_patient', {'fields': {'session_id': 's1', 'name': 'A'}}, merge_key='s1')
+    sent = queue.peek()[0]
+
+    queue.merge_pending('upsert_patient', 's1', {'fields': {'status': 'COMPLETED'}})
+    assert not queue.ack(sent['id'], sent['revision'])
+
+    resend = queue.peek()[0]
+    assert resend['data']['fields']['status'] == 'COMPLETED'
+    assert queue.ack(resend['id'], resend['revision'])
+    assert queue.size() == 0
+
+def test_nack_moves_to_dead_after_max_retries(tmp_path):
+    """재시도 한도를 넘으면 'dead'로 보관하고 대기 목록에서 제외"""
+    queue = make_queue(tmp_path)
+    item_id = queue.enqueue('create_patient', {'fields': {'name': 'A'}})
+
+    assert queue.nack(item_id, "timeout", max_retries=2)
+    assert not queue.nack(item_id, "timeout", max_retries=2)
+    assert queue.size() == 0
+    assert queue.dead_count() == 1
+
+def test_compact_removes_old_dead_items(tmp_path):
+    """보관 기간이 지난 'dead' 항목만 정리"""
+    queue = make_queue(tmp_path)
+    old_id = queue.enqueue('create_patient', {'fields': {'name': 'old'}})
+    new_id = queue.enqueue('create_patient', {'fields': {'name': 'new'}})
+    for item_id in (old_id, new_id):
+        queue.nack(item_id, "error", max_retries=1)
+    old_created = (datetime.now() - timedelta(days=40)).isoformat()
+    queue.conn.execute("UPDATE queue SET created_at = ? WHERE id = ?", (old_created, old_id))
+
+    assert queue.compact(dead_retention_days=30) == 1
+    assert queue.dead_count() == 1
+
+def test_migrates_legacy_json(tmp_path):
+    """기존 JSON 큐 항목을 가져오고 파일은 다시 가져오지 않도록 이름 변경"""
+    legacy_path = tmp_path / "offline_queue.json"
+    legacy_path.write_text(json.dumps([{
+        'id': 'create_patient_1',
+        'action_type': 'create_patient',
+        'data': {'fields': {'name': 'A'}},
+        'timestamp': datetime.now().isoformat(),
+        'retry_count': 1
+    }]), encoding='utf-8')
+
+    queue = make_queue(tmp_path, legacy_path)
+    items = queue.peek()
+    assert len(items) == 1
+    assert items[0]['data'] == {'fields': {'name': 'A'}}
+    assert items[0]['retry_count'] == 1
+    assert not legacy_path.exists()
+
+def test_upgrades_schema_without_merge_columns(tmp_path):
+    """merge_key/revision 열이 없던 이전 DB에 열을 추가"""
+    db_path = tmp_path / "offline_queue.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("""
+        CREATE TABLE queue (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            action_type TEXT NOT NULL,
+            data TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            retry_count INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            status TEXT NOT NULL DEFAULT 'pending'
+        )
+    """)
+    conn.execute("INSERT INTO queue (id, action_type, data, created_at) VALUES (?, ?, ?, ?)",
+                 ('create_patient_1', 'create_patient', '{"fields": {}}', datetime.now().isoformat()))
+    conn.commit()
+    conn.close()
+
+    queue = OfflineQueue(db_path)
+    assert queue.peek()[0]['revision'] == 0
+    queue.enqueue('upsert_patient', {'fields': {'session_id': 's1'}}, merge_key='s1')
+    assert queue.size() == 2
@@ -27,6 +27,7 @@ a = Analysis(
         'PyQt5.QtWidgets',
         'requests.adapters',
         'urllib3.util.retry',
+        'psutil',
     ],
     hookspath=[],
     hooksconfig={},